@@ -0,0 +1,52 @@
+import { computed, ref } from "vue";
+import { createResource } from "frappe-ui";
+
+/**
+ * Composable for the dashboard lists served page by page from a keyset endpoint
+ * The endpoint returns { rows, next_cursor }; each page is fetched with the
+ * cursor of the previous one and appended to the rows loaded so far
+ *
+ * @param {string} url - Whitelisted method returning a page of rows
+ * @param {Object} options - Configuration options
+ * @param {Function} options.transform - Maps each row for display
+ * @param {number} options.pageLength - Rows per page (default: 20)
+ * @returns {Object} - Returns the loaded rows and paging state
+ */
+export function useKeysetList(url, options = {}) {
+	const { transform = (row) => row, pageLength = 20 } = options;
+
+	const rows = ref([]);
+	const nextCursor = ref(null);
+
+	const page = createResource({
+		url,
+		makeParams: (cursor) => ({ cursor, page_length: pageLength }),
+		onSuccess: (data) => {
+			rows.value.push(...data.rows.map(transform));
+			nextCursor.value = data.next_cursor;
+		},
+		onError: console.error,
+	});
+
+	const reload = () => {
+		rows.value = [];
+		nextCursor.value = null;
+		page.submit(null);
+	};
+
+	const loadMore = () => {
+		if (nextCursor.value && !page.loading) {
+			page.submit(nextCursor.value);
+		}
+	};
+
+	reload();
+
+	return {
+		rows,
+		page,
+		hasMore: computed(() => Boolean(nextCursor.value)),
+		loadMore,
+		reload,
+	};
+}
@@ -0,0 +1,83 @@
+import { ref, onUnmounted } from "vue";
+import { createResource } from "frappe-ui";
+
+/**
+ * Composable for the per-event waiting room used during high-demand on-sales
+ * Joins the queue, polls the (Redis-only) status endpoint until admitted and
+ * exposes the token that the booking endpoints expect
+ *
+ * @param {string} eventRoute - Route of the event being booked
+ * @param {Object} options - Configuration options
+ * @param {Function} options.onAdmitted - Callback to execute once the user is let through
+ * @param {number} options.pollInterval - How often to poll the queue status in milliseconds (default: 3000)
+ * @returns {Object} - Returns reactive queue state
+ */
+export function useWaitingRoom(eventRoute, options = {}) {
+	const { onAdmitted, pollInterval = 3000 } = options;
+
+	const queueToken = ref(null);
+	const queueStatus = ref(null);
+	const isWaiting = ref(false);
+	let pollTimer = null;
+
+	const stopPolling = () => {
+		if (pollTimer) {
+			clearTimeout(pollTimer);
+			pollTimer = null;
+		}
+	};
+
+	const handleStatus = (status) => {
+		queueStatus.value = status;
+
+		if (!status.enabled || status.admitted) {
+			isWaiting.value = false;
+			stopPolling();
+			onAdmitted?.(queueToken.value);
+			return;
+		}
+
+		if (!status.valid) {
+			// token expired, take a fresh place in the queue
+			stopPolling();
+			joinQueue.fetch();
+			return;
+		}
+
+		isWaiting.value = true;
+		pollTimer = setTimeout(() => queueStatusResource.fetch(), pollInterval);
+	};
+
+	const queueStatusResource = createResource({
+		url: "events.waiting_room.get_queue_status",
+		makeParams: () => ({
+			event: queueStatus.value?.event,
+			token: queueToken.value,
+		}),
+		onSuccess: handleStatus,
+		onError: () => {
+			pollTimer = setTimeout(() => queueStatusResource.fetch(), pollInterval);
+		},
+	});
+
+	const joinQueue = createResource({
+		url: "events.waiting_room.join_queue",
+		params: { event_route: eventRoute },
+		auto: true,
+		onSuccess: (data) => {
+			queueToken.value = data.token || null;
+			handleStatus(data);
+		},
+		// let the booking data request surface the error (e.g. event not found)
+		onError: () => onAdmitted?.(null),
+	});
+
+	onUnmounted(stopPolling);
+
+	return {
+		queueToken,
+		queueStatus,
+		isWaiting,
+		joinQueue,
+	};
+}
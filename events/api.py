@@ -1,128 +1,90 @@
 import frappe
-from frappe.utils import days_diff, format_date, format_time, today
+from frappe.query_builder import Order
+from frappe.query_builder.functions import Count
+from frappe.utils import cint, format_date, format_time, get_datetime
 
+from events.cache import EVENT_BOOKING_DATA_CACHE_KEY, clear_add_on_demand_cache
+from events.link_titles import attach_link_titles, get_link_titles
 from events.payments import get_payment_link_for_booking
-
-
-def is_ticket_transfer_allowed(event_id: str | int) -> bool:
-	"""Check if ticket transfer is allowed based on event start date and settings."""
-	try:
-		# Get event details
-		event = frappe.get_cached_doc("FE Event", event_id)
-
-		# Get event management settings
-		settings = frappe.get_single("Event Management Settings")
-
-		# Default to 7 days if no setting is found
-		transfer_cutoff_days = settings.get("allow_transfer_ticket_before_event_start_days", 7)
-
-		# Calculate days difference between today and event start date
-		event_start_date = event.start_date
-		if not event_start_date:
-			return False
-
-		# Get days remaining until event starts
-		days_until_event = days_diff(event_start_date, today())
-
-		# Transfer is allowed if there are more days remaining than the cutoff
-		return days_until_event >= transfer_cutoff_days
-
-	except Exception as e:
-		frappe.log_error(f"Error checking ticket transfer eligibility: {e!s}")
-		return False
-
-
-def is_add_on_change_allowed(event_id: str | int) -> bool:
-	"""Check if add-on changes are allowed based on event start date and settings."""
-	try:
-		# Get event details
-		event = frappe.get_cached_doc("FE Event", event_id)
-
-		# Get event management settings
-		settings = frappe.get_cached_doc("Event Management Settings")
-
-		# Default to 7 days if no setting is found
-		add_on_change_cutoff_days = settings.get("allow_add_ons_change_before_event_start_days", 7)
-
-		# Calculate days difference between today and event start date
-		event_start_date = event.start_date
-		if not event_start_date:
-			return False
-
-		# Get days remaining until event starts
-		days_until_event = days_diff(event_start_date, today())
-
-		# Add-on changes are allowed if there are more days remaining than the cutoff
-		return days_until_event >= add_on_change_cutoff_days
-
-	except Exception as e:
-		frappe.log_error(f"Error checking add-on change eligibility: {e!s}")
-		return False
+from events.policy import get_event_policy
+from events.ticketing.doctype.event_ticket_type.event_ticket_type import get_ticket_availability
+from events.ticketing.doctype.ticket_hold.ticket_hold import create_holds_for_booking
+from events.waiting_room import validate_admission
 
 
 @frappe.whitelist()
 def can_transfer_ticket(event_id: str | int) -> dict:
 	"""API endpoint to check if ticket transfer is allowed for an event."""
-	return {"can_transfer": is_ticket_transfer_allowed(event_id), "event_id": event_id}
+	return {"can_transfer": get_event_policy(event_id).can_transfer_ticket, "event_id": event_id}
 
 
 @frappe.whitelist()
 def can_change_add_ons(event_id: str | int) -> dict:
 	"""API endpoint to check if add-on changes are allowed for an event."""
-	return {"can_change_add_ons": is_add_on_change_allowed(event_id), "event_id": event_id}
-
-
-def is_cancellation_request_allowed(event_id: str | int) -> bool:
-	"""Check if cancellation request is allowed based on event start date and settings."""
-	try:
-		# Get event details
-		event = frappe.get_cached_doc("FE Event", event_id)
+	return {"can_change_add_ons": get_event_policy(event_id).can_change_add_ons, "event_id": event_id}
 
-		# Get event management settings
-		settings = frappe.get_cached_doc("Event Management Settings")
 
-		# Default to 7 days if no setting is found
-		cancellation_cutoff_days = settings.get(
-			"allow_ticket_cancellation_request_before_event_start_days", 7
-		)
-
-		# Calculate days difference between today and event start date
-		event_start_date = event.start_date
-		if not event_start_date:
-			return False
-
-		# Get days remaining until event starts
-		days_until_event = days_diff(event_start_date, today())
+@frappe.whitelist()
+def can_request_cancellation(event_id: str | int) -> dict:
+	"""API endpoint to check if cancellation request is allowed for an event."""
+	return {
+		"can_request_cancellation": get_event_policy(event_id).can_request_cancellation,
+		"event_id": event_id,
+	}
 
-		# Cancellation request is allowed if there are more days remaining than the cutoff
-		return days_until_event >= cancellation_cutoff_days
 
-	except Exception as e:
-		frappe.log_error(f"Error checking cancellation request eligibility: {e!s}")
-		return False
+# Only what the booking page renders, so the payload stays small
+EVENT_BOOKING_FIELDS = (
+	"name",
+	"title",
+	"route",
+	"banner_image",
+	"short_description",
+	"start_date",
+	"end_date",
+	"start_time",
+	"end_time",
+	"time_zone",
+	"venue",
+)
 
 
 @frappe.whitelist()
-def can_request_cancellation(event_id: str | int) -> dict:
-	"""API endpoint to check if cancellation request is allowed for an event."""
-	return {"can_request_cancellation": is_cancellation_request_allowed(event_id), "event_id": event_id}
+def get_event_booking_data(event_route: str, queue_token: str | None = None) -> dict:
+	data = frappe._dict(
+		frappe.cache.hget(
+			EVENT_BOOKING_DATA_CACHE_KEY,
+			event_route,
+			generator=lambda: get_static_event_booking_data(event_route),
+		)
+	)
+	event = data.event_details["name"]
+	validate_admission(event, queue_token)
+
+	# Live availability on top of the cached ticket types
+	availability = get_ticket_availability(event)
+	data.available_ticket_types = [
+		{**ticket_type, **availability[ticket_type["name"]]}
+		for ticket_type in data.ticket_types
+		if ticket_type["name"] in availability and availability[ticket_type["name"]].remaining_tickets != 0
+	]
+	del data["ticket_types"]
+
+	return data
 
 
-@frappe.whitelist()
-def get_event_booking_data(event_route: str) -> dict:
+def get_static_event_booking_data(event_route: str) -> dict:
+	"""The parts of the booking page payload that only change when an organiser edits something."""
 	data = frappe._dict()
 	event_doc = frappe.get_cached_doc("FE Event", {"route": event_route})
 
 	# Ticket Types
-	available_ticket_types = []
-	published_ticket_types = frappe.db.get_all(
-		"Event Ticket Type", filters={"is_published": True, "event": event_doc.name}, pluck="name"
+	data.ticket_types = frappe.db.get_all(
+		"Event Ticket Type",
+		filters={"is_published": True, "event": event_doc.name},
+		fields=["name", "title", "price", "currency", "event", "max_tickets_available"],
+		order_by="creation asc",
 	)
-	for ticket_type in published_ticket_types:
-		tt = frappe.get_cached_doc("Event Ticket Type", ticket_type)
-		if tt.are_tickets_available(1):
-			available_ticket_types.append(tt)
-	data.available_ticket_types = available_ticket_types
 
 	# Ticket Add-ons
 	add_ons = frappe.db.get_all(
@@ -144,13 +106,15 @@ def get_event_booking_data(event_route: str) -> dict:
 		"gst_percentage": event_settings.gst_percentage or 18,
 	}
 
-	data.event_details = event_doc
+	data.event_details = {field: event_doc.get(field) for field in EVENT_BOOKING_FIELDS}
 
 	return data
 
 
 @frappe.whitelist()
-def process_booking(attendees: list[dict], event: str) -> str:
+def process_booking(attendees: list[dict], event: str, queue_token: str | None = None) -> str:
+	validate_admission(event, queue_token)
+
 	booking = frappe.new_doc("Event Booking")
 	booking.event = event
 	booking.user = frappe.session.user
@@ -173,6 +137,7 @@ def process_booking(attendees: list[dict], event: str) -> str:
 		)
 
 	booking.insert(ignore_permissions=True)
+	create_holds_for_booking(booking)
 	frappe.db.commit()
 
 	return get_payment_link_for_booking(
@@ -197,7 +162,7 @@ def transfer_ticket(ticket_id: str, new_name: str, new_email: str):
 	ticket = frappe.get_doc("Event Ticket", ticket_id)
 
 	# Check if ticket transfer is allowed
-	if not is_ticket_transfer_allowed(ticket.event):
+	if not get_event_policy(ticket.event).can_transfer_ticket:
 		frappe.throw(frappe._("Ticket transfer is not allowed at this time. The transfer window has closed."))
 
 	# Store old attendee info for notification
@@ -288,7 +253,10 @@ def send_ticket_transfer_emails(ticket_id: str, old_name: str, old_email: str, n
 
 @frappe.whitelist()
 def get_booking_details(booking_id: str) -> dict:
-	"""Get detailed information about a specific booking."""
+	"""Get detailed information about a specific booking.
+
+	Reads a fixed number of queries however many tickets the booking has.
+	"""
 	details = frappe._dict()
 	booking_doc = frappe.get_cached_doc("Event Booking", booking_id)
 	details.doc = booking_doc
@@ -306,48 +274,49 @@ def get_booking_details(booking_id: str) -> dict:
 		],
 	)
 
-	add_ons = frappe.db.get_all(
-		"Ticket Add-on Value",
-		filters={"parent": ("in", (ticket.name for ticket in tickets))},
-		fields=["parent", "name", "add_on", "value", "add_on.title as add_on_title"],
-	)
-
-	# Get available options for add-ons
-	event_add_ons = frappe.db.get_all(
-		"Ticket Add-on",
-		filters={"event": booking_doc.event, "user_selects_option": True},
-		fields=["name", "title", "user_selects_option", "options"],
-	)
+	add_ons_by_ticket = {ticket.name: [] for ticket in tickets}
+	if tickets:
+		add_ons = frappe.db.get_all(
+			"Ticket Add-on Value",
+			filters={"parent": ("in", list(add_ons_by_ticket))},
+			fields=["parent", "name", "add_on", "value", "add_on.title as add_on_title"],
+		)
 
-	add_on_options_map = {}
-	for event_add_on in event_add_ons:
-		if event_add_on.user_selects_option:
-			add_on_options_map[event_add_on.name] = (
-				event_add_on.options.split("\n") if event_add_on.options else []
+		# Get available options for add-ons
+		add_on_options_map = {
+			event_add_on.name: event_add_on.options.split("\n") if event_add_on.options else []
+			for event_add_on in frappe.db.get_all(
+				"Ticket Add-on",
+				filters={"event": booking_doc.event, "user_selects_option": True},
+				fields=["name", "options"],
 			)
+		}
 
-	for ticket in tickets:
-		ticket.add_ons = []
 		for add_on in add_ons:
-			if add_on.parent == ticket.name:
-				add_on_data = {
+			add_ons_by_ticket[add_on.parent].append(
+				{
 					"id": add_on.name,
 					"name": add_on.add_on,
 					"title": add_on.add_on_title,
 					"value": add_on.value,
 					"options": add_on_options_map.get(add_on.add_on, []),
 				}
-				ticket.add_ons.append(add_on_data)
-		ticket.add_ons = sorted(ticket.add_ons, key=lambda x: x["title"])
+			)
+
+	for ticket in tickets:
+		ticket.add_ons = sorted(add_ons_by_ticket[ticket.name], key=lambda x: x["title"])
 
 	details.tickets = tickets
 	details.event = frappe.get_cached_doc("FE Event", booking_doc.event)
-	details.can_transfer_ticket = can_transfer_ticket(details.event.name)
-	details.can_change_add_ons = can_change_add_ons(details.event.name)
-	details.can_request_cancellation = can_request_cancellation(details.event.name)
+	details.policy = get_event_policy(booking_doc.event)
 
-	# Payment
-	frappe.db.get_all("Event Payment", filters={})
+	details.payment = frappe.db.get_value(
+		"Event Payment",
+		{"reference_doctype": "Event Booking", "reference_docname": booking_id},
+		["name", "payment_received", "amount", "currency"],
+		order_by="creation desc",
+		as_dict=True,
+	)
 
 	# Check for existing cancellation request
 	existing_cancellation = frappe.db.get_value(
@@ -365,10 +334,9 @@ def get_booking_details(booking_id: str) -> dict:
 			details.cancelled_tickets = [ticket.name for ticket in tickets]
 		else:
 			# If partial cancellation, get specific tickets
-			cancelled_tickets = frappe.db.get_all(
-				"Ticket Cancellation Item", filters={"parent": existing_cancellation.name}, fields=["ticket"]
+			details.cancelled_tickets = frappe.db.get_all(
+				"Ticket Cancellation Item", filters={"parent": existing_cancellation.name}, pluck="ticket"
 			)
-			details.cancelled_tickets = [item.ticket for item in cancelled_tickets]
 	else:
 		details.cancelled_tickets = []
 
@@ -389,7 +357,7 @@ def change_add_on_preference(add_on_id: str, new_value: str):
 	ticket = frappe.get_cached_doc("Event Ticket", add_on_value.parent)
 
 	# Check if add-on changes are allowed for this event
-	if not is_add_on_change_allowed(ticket.event):
+	if not get_event_policy(ticket.event).can_change_add_ons:
 		frappe.throw(
 			frappe._(
 				"Add-on changes are not allowed at this time. The change window has closed as the event is approaching."
@@ -402,6 +370,7 @@ def change_add_on_preference(add_on_id: str, new_value: str):
 		"value",
 		new_value,
 	)
+	clear_add_on_demand_cache(ticket.event)
 
 
 @frappe.whitelist()
@@ -416,11 +385,6 @@ def get_sponsorship_details(enquiry_id: str) -> dict:
 	):
 		frappe.throw(frappe._("Not permitted to view this sponsorship enquiry"))
 
-	# Get tier title if tier exists
-	tier_title = ""
-	if enquiry.tier:
-		tier_title = frappe.db.get_value("Sponsorship Tier", enquiry.tier, "title") or enquiry.tier
-
 	# Get event details
 	event_details = {}
 	if enquiry.event:
@@ -444,12 +408,14 @@ def get_sponsorship_details(enquiry_id: str) -> dict:
 		limit=1,
 	)
 
+	# Tier titles of the enquiry and its sponsor, in one lookup
+	tier_titles = get_link_titles("Sponsorship Tier", [enquiry.tier] + [sponsor.tier for sponsor in sponsors])
+	tier_title = tier_titles.get(enquiry.tier, enquiry.tier) if enquiry.tier else ""
+
 	if sponsors:
 		sponsor_details = sponsors[0]
-		# Get sponsor tier title too
 		if sponsor_details.get("tier"):
-			sponsor_tier_title = frappe.db.get_value("Sponsorship Tier", sponsor_details["tier"], "title")
-			sponsor_details["tier_title"] = sponsor_tier_title or sponsor_details["tier"]
+			sponsor_details["tier_title"] = tier_titles.get(sponsor_details["tier"], sponsor_details["tier"])
 
 	return {
 		"enquiry": {
@@ -469,6 +435,111 @@ def get_sponsorship_details(enquiry_id: str) -> dict:
 	}
 
 
+# rows per page of the dashboard's ticket and booking lists
+MY_LIST_PAGE_LENGTH = 20
+MAX_MY_LIST_PAGE_LENGTH = 100
+
+
+@frappe.whitelist()
+def get_my_tickets(cursor: dict | str | None = None, page_length: int = MY_LIST_PAGE_LENGTH) -> dict:
+	"""A page of the tickets issued to the current user, newest first.
+
+	Returns {rows, next_cursor}; pass `next_cursor` back for the next page, it is None on the last one.
+	"""
+	Ticket = frappe.qb.DocType("Event Ticket")
+	Event = frappe.qb.DocType("FE Event")
+	TicketType = frappe.qb.DocType("Event Ticket Type")
+	query = (
+		frappe.qb.from_(Ticket)
+		.left_join(Event)
+		.on(Event.name == Ticket.event)
+		.left_join(TicketType)
+		.on(TicketType.name == Ticket.ticket_type)
+		.select(
+			Ticket.name,
+			Ticket.creation,
+			Ticket.docstatus,
+			Ticket.attendee_name,
+			Ticket.event,
+			Event.title.as_("event_title"),
+			Event.start_date,
+			Ticket.ticket_type,
+			TicketType.title.as_("ticket_type_title"),
+		)
+		.where(Ticket.attendee_email == frappe.session.user)
+		.where(Ticket.docstatus != 0)
+	)
+	return _get_keyset_page(query, Ticket, cursor, page_length)
+
+
+@frappe.whitelist()
+def get_my_bookings(cursor: dict | str | None = None, page_length: int = MY_LIST_PAGE_LENGTH) -> dict:
+	"""A page of the current user's bookings, newest first, paged like `get_my_tickets`."""
+	Booking = frappe.qb.DocType("Event Booking")
+	Event = frappe.qb.DocType("FE Event")
+	query = (
+		frappe.qb.from_(Booking)
+		.left_join(Event)
+		.on(Event.name == Booking.event)
+		.select(
+			Booking.name,
+			Booking.creation,
+			Booking.docstatus,
+			Booking.event,
+			Event.title.as_("event_title"),
+			Event.start_date,
+			Event.venue,
+			Booking.total_amount,
+			Booking.currency,
+		)
+		.where(Booking.user == frappe.session.user)
+		.where(Booking.docstatus != 0)
+	)
+	page = _get_keyset_page(query, Booking, cursor, page_length)
+
+	if page["rows"]:
+		Attendee = frappe.qb.DocType("Event Booking Attendee")
+		ticket_counts = dict(
+			frappe.qb.from_(Attendee)
+			.select(Attendee.parent, Count("*"))
+			.where(Attendee.parenttype == "Event Booking")
+			.where(Attendee.parent.isin([booking.name for booking in page["rows"]]))
+			.groupby(Attendee.parent)
+			.run()
+		)
+		for booking in page["rows"]:
+			booking.ticket_count = ticket_counts.get(booking.name, 0)
+
+	return page
+
+
+def _get_keyset_page(query, table, cursor: dict | str | None, page_length: int) -> dict:
+	"""Runs `query` for the page after `cursor` in (creation, name) descending order.
+
+	Seeks past the cursor instead of offsetting, so deep pages cost as much as the first.
+	"""
+	page_length = min(cint(page_length) or MY_LIST_PAGE_LENGTH, MAX_MY_LIST_PAGE_LENGTH)
+	if cursor:
+		cursor = frappe.parse_json(cursor)
+		creation = get_datetime(cursor["creation"])
+		query = query.where(
+			(table.creation < creation) | ((table.creation == creation) & (table.name < cursor["name"]))
+		)
+
+	rows = (
+		query.orderby(table.creation, order=Order.desc)
+		.orderby(table.name, order=Order.desc)
+		.limit(page_length + 1)
+		.run(as_dict=True)
+	)
+
+	next_cursor = None
+	if len(rows) > page_length:
+		rows = rows[:page_length]
+		next_cursor = {"creation": rows[-1].creation, "name": rows[-1].name}
+	return {"rows": rows, "next_cursor": next_cursor}
+
+
 @frappe.whitelist()
 def get_user_sponsorship_inquiries() -> list:
 	"""Get all sponsorship inquiries for the current user."""
@@ -480,16 +551,8 @@ def get_user_sponsorship_inquiries() -> list:
 	)
 
 	# Get event titles and tier titles
-	for inquiry in inquiries:
-		if inquiry.event:
-			event_title = frappe.db.get_value("FE Event", inquiry.event, "title")
-			inquiry["event_title"] = event_title
-
-		if inquiry.tier:
-			tier_title = frappe.db.get_value("Sponsorship Tier", inquiry.tier, "title")
-			inquiry["tier_title"] = tier_title or inquiry.tier
-		else:
-			inquiry["tier_title"] = ""
+	attach_link_titles(inquiries, "event", "FE Event")
+	attach_link_titles(inquiries, "tier", "Sponsorship Tier", fallback_to_name=True)
 
 	# Check which inquiries have corresponding sponsors
 	inquiry_names = [inquiry.name for inquiry in inquiries]
@@ -609,15 +672,7 @@ def get_ticket_details(ticket_id: str) -> dict:
 		details.booking = None
 
 	details.ticket_type = frappe.get_cached_doc("Event Ticket Type", ticket_doc.ticket_type)
-	details.can_transfer_ticket = (
-		can_transfer_ticket(details.event.name) if details.event else {"can_transfer": False}
-	)
-	details.can_change_add_ons = (
-		can_change_add_ons(details.event.name) if details.event else {"can_change_add_ons": False}
-	)
-	details.can_request_cancellation = (
-		can_request_cancellation(details.event.name) if details.event else {"can_request_cancellation": False}
-	)
+	details.policy = get_event_policy(ticket_doc.event)
 
 	return details
 
@@ -629,7 +684,7 @@ def create_cancellation_request(booking_id: str, ticket_ids: list | None = None)
 	booking_doc = frappe.get_cached_doc("Event Booking", booking_id)
 
 	# Check if cancellation request is allowed for this event
-	if not is_cancellation_request_allowed(booking_doc.event):
+	if not get_event_policy(booking_doc.event).can_request_cancellation:
 		frappe.throw("Cancellation requests are no longer allowed for this event.")
 
 	# Check if a cancellation request already exists for this booking
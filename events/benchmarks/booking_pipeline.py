@@ -0,0 +1,324 @@
+"""Benchmark the booking pipeline, from the booking page to check-in.
+
+Usage:
+	bench --site <site> execute events.benchmarks.booking_pipeline.run --kwargs "{'num_bookings': 200}"
+
+Each run creates its own event with `num_ticket_types` ticket types and `num_add_ons`
+add-ons, then measures every entry point `num_bookings` times:
+
+	get_event_booking_data            the booking page payload
+	process_booking                   booking creation and ticket holds
+	on_payment_authorized             booking submit, including bulk ticket generation
+	get_booking_details               the dashboard's booking page
+	get_ticket_details                the dashboard's ticket page
+	check_in                          FE Event.check_in of each ticket
+
+For each it reports latency percentiles, SQL queries per call and the peak Python
+memory allocated per call. The payment gateway is not called: process_booking
+still records its Event Payment, but gets no payment URL. The ticket jobs that
+generate_tickets enqueues are held back and no ticket email is sent, so nothing
+runs against the records deleted afterwards; QR codes and emails are not measured,
+and with `cleanup=False` the bookings are left with ticket generation Queued.
+
+Results are compared with the baseline for the same scale parameters in
+`baseline_path`, by default the booking_pipeline_baseline.json committed next to
+this module. The first run at a new scale saves its results there, to be committed;
+pass `save_baseline=True` to replace them, e.g. once per release.
+Writes are committed, as process_booking commits; the event and everything created
+for it is deleted afterwards unless `cleanup=False`.
+"""
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import frappe
+from frappe.utils import add_days, today
+
+from events.ticketing.doctype.event_booking.event_booking import process_booking_tickets
+from events.ticketing.doctype.event_ticket.event_ticket import EventTicket
+
+# how much slower than the baseline an entry point may get before it is flagged
+REGRESSION_THRESHOLD = 0.2
+# memory is traced on a few calls only, tracing slows every allocation down
+MEMORY_SAMPLES = 5
+
+
+def run(
+	num_bookings: int = 100,
+	attendees_per_booking: int = 2,
+	num_ticket_types: int = 3,
+	num_add_ons: int = 2,
+	baseline_path: str | None = None,
+	save_baseline: bool = False,
+	cleanup: bool = True,
+) -> dict:
+	from events.api import get_booking_details, get_event_booking_data, get_ticket_details, process_booking
+	from events.payments import record_payment
+
+	frappe.set_user("Administrator")
+	event = make_benchmark_event(num_ticket_types, num_add_ons)
+	ticket_types = frappe.get_all("Event Ticket Type", filters={"event": event.name}, pluck="name")
+	add_ons = frappe.get_all("Ticket Add-on", filters={"event": event.name}, fields=["name", "options"])
+
+	def get_attendees(i):
+		return [
+			{
+				"full_name": f"Benchmark Attendee {i}-{j}",
+				"email": f"attendee-{i}-{j}@benchmark.invalid",
+				"ticket_type": ticket_types[(i + j) % len(ticket_types)],
+				"add_ons": [
+					{"add_on": add_on.name, "value": add_on.options.split("\n")[0]} for add_on in add_ons
+				],
+			}
+			for j in range(attendees_per_booking)
+		]
+
+	def record_payment_only(booking_id, redirect_to=None):
+		booking = frappe.get_cached_doc("Event Booking", booking_id)
+		record_payment("Event Booking", booking_id, booking.total_amount, booking.currency)
+		return ""
+
+	held_back_jobs = []
+	enqueue = frappe.enqueue
+
+	def enqueue_except_ticket_jobs(method, *args, **kwargs):
+		# the records these jobs work on are gone by the time a worker picks them up
+		if method is process_booking_tickets:
+			held_back_jobs.append(kwargs["booking"])
+			return
+		return enqueue(method, *args, **kwargs)
+
+	results = {}
+	with (
+		patch("frappe.enqueue", enqueue_except_ticket_jobs),
+		patch.object(EventTicket, "send_ticket_email", lambda self: None),
+	):
+		try:
+			results["get_event_booking_data"] = measure(
+				lambda _i: get_event_booking_data(event.route), num_bookings
+			)
+
+			with patch("events.api.get_payment_link_for_booking", record_payment_only):
+				results["process_booking"] = measure(
+					lambda i: process_booking(get_attendees(i), event.name), num_bookings
+				)
+
+			bookings = frappe.get_all(
+				"Event Booking",
+				filters={"event": event.name, "docstatus": 0},
+				pluck="name",
+				order_by="creation asc",
+			)
+
+			def authorize(i):
+				frappe.get_doc("Event Booking", bookings[i]).on_payment_authorized("Completed")
+				frappe.db.commit()
+
+			results["on_payment_authorized"] = measure(authorize, len(bookings))
+			results["get_booking_details"] = measure(
+				lambda i: get_booking_details(bookings[i]), len(bookings)
+			)
+
+			tickets = frappe.get_all(
+				"Event Ticket", filters={"event": event.name, "docstatus": 1}, pluck="name"
+			)
+			results["get_ticket_details"] = measure(lambda i: get_ticket_details(tickets[i]), len(tickets))
+			results["check_in"] = measure(
+				lambda i: frappe.get_doc("FE Event", event.name).check_in(tickets[i]), len(tickets)
+			)
+			frappe.db.commit()
+		finally:
+			if cleanup:
+				delete_benchmark_event(event.name)
+
+	print(f"{len(held_back_jobs)} ticket generation jobs held back")
+	scale = get_scale_key(num_bookings, attendees_per_booking, num_ticket_types, num_add_ons)
+	report(results, baseline_path or get_default_baseline_path(), scale, save_baseline)
+	return results
+
+
+def measure(fn, iterations: int) -> dict:
+	"""Calls fn(i) for each i below `iterations`, returning latency, query and memory stats.
+
+	The last MEMORY_SAMPLES calls are traced for memory instead of timed.
+	"""
+	if not iterations:
+		return {}
+
+	queries = 0
+	original_sql = frappe.db.sql
+
+	def counting_sql(*args, **kwargs):
+		nonlocal queries
+		queries += 1
+		return original_sql(*args, **kwargs)
+
+	num_timed = iterations - MEMORY_SAMPLES if iterations > MEMORY_SAMPLES else iterations
+	timings, peaks = [], []
+	frappe.db.sql = counting_sql
+	try:
+		for i in range(iterations):
+			# as in separate requests, nothing is served from another call's request-local cache
+			frappe.local.cache = {}
+			if i < num_timed:
+				start = time.perf_counter()
+				fn(i)
+				timings.append(time.perf_counter() - start)
+				continue
+
+			tracemalloc.start()
+			try:
+				fn(i)
+				peaks.append(tracemalloc.get_traced_memory()[1])
+			finally:
+				tracemalloc.stop()
+	finally:
+		del frappe.db.sql
+
+	timings.sort()
+	return {
+		"calls": iterations,
+		"p50_ms": round(_percentile(timings, 50) * 1000, 2),
+		"p90_ms": round(_percentile(timings, 90) * 1000, 2),
+		"p99_ms": round(_percentile(timings, 99) * 1000, 2),
+		"max_ms": round(timings[-1] * 1000, 2),
+		"queries_per_call": round(queries / iterations, 1),
+		"peak_kib_per_call": round(statistics.mean(peaks) / 1024, 1) if peaks else None,
+	}
+
+
+def report(results: dict, baseline_path: str, scale: str, save_baseline: bool = False) -> None:
+	"""Print the results, flagging regressions against the baseline saved for `scale`."""
+	baselines = {}
+	if os.path.exists(baseline_path):
+		with open(baseline_path) as f:
+			baselines = json.load(f)
+	baseline = baselines.get(scale, {}).get("results", {})
+
+	for name, result in results.items():
+		print(f"{name:<24} {result}")
+		previous = baseline.get(name)
+		if not previous:
+			continue
+
+		for metric in ("p50_ms", "p90_ms", "queries_per_call"):
+			if previous.get(metric) and result[metric] > previous[metric] * (1 + REGRESSION_THRESHOLD):
+				print(f"{'':<24} REGRESSION {metric}: {previous[metric]} -> {result[metric]}")
+
+	if save_baseline or not baseline:
+		baselines[scale] = {"saved_at": frappe.utils.now(), "results": results}
+		os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+		with open(baseline_path, "w") as f:
+			json.dump(baselines, f, indent=1, sort_keys=True)
+			f.write("\n")
+		print(f"Baseline for {scale} saved to {baseline_path}")
+
+
+def get_default_baseline_path() -> str:
+	return os.path.join(os.path.dirname(__file__), "booking_pipeline_baseline.json")
+
+
+def get_scale_key(
+	num_bookings: int, attendees_per_booking: int, num_ticket_types: int, num_add_ons: int
+) -> str:
+	"""Results are only comparable with a baseline taken at the same scale."""
+	return (
+		f"bookings={num_bookings},attendees_per_booking={attendees_per_booking},"
+		f"ticket_types={num_ticket_types},add_ons={num_add_ons}"
+	)
+
+
+def make_benchmark_event(num_ticket_types: int, num_add_ons: int):
+	route = f"benchmark-{frappe.generate_hash(length=8)}"
+	event = frappe.get_doc(
+		{
+			"doctype": "FE Event",
+			"category": frappe.db.get_value("Event Category", {}),
+			"venue": frappe.db.get_value("Event Venue", {}),
+			"host": frappe.db.get_value("Event Host", {}),
+			"title": f"Benchmark {route}",
+			"route": route,
+			"start_date": add_days(today(), 30),
+			"is_published": 1,
+		}
+	).insert()
+
+	for i in range(num_ticket_types):
+		frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": event.name,
+				"title": f"Ticket Type {i}",
+				"price": 100 * (i + 1),
+				"currency": "INR",
+				"is_published": 1,
+			}
+		).insert()
+
+	for i in range(num_add_ons):
+		frappe.get_doc(
+			{
+				"doctype": "Ticket Add-on",
+				"event": event.name,
+				"title": f"Add-on {i}",
+				"price": 50,
+				"currency": "INR",
+				"user_selects_option": 1,
+				"options": "Small\nMedium\nLarge",
+			}
+		).insert()
+
+	frappe.db.commit()
+	return event
+
+
+def delete_benchmark_event(event: str | int) -> None:
+	from events.check_in import flush_check_in_queue, get_queued_check_ins, rebuild_check_in_cache
+
+	# check-ins still queued would otherwise be written after the event is gone
+	while get_queued_check_ins(limit=1):
+		flush_check_in_queue()
+	rebuild_check_in_cache(event)
+
+	bookings = frappe.get_all("Event Booking", filters={"event": event}, pluck="name")
+	tickets = frappe.get_all("Event Ticket", filters={"event": event}, pluck="name")
+	attendee_add_ons = frappe.get_all(
+		"Event Booking Attendee",
+		filters={"parenttype": "Event Booking", "parent": ("in", bookings or [""]), "add_ons": ("is", "set")},
+		pluck="add_ons",
+	)
+
+	frappe.db.delete("Ticket Add-on Value", {"parenttype": "Event Ticket", "parent": ("in", tickets or [""])})
+	frappe.db.delete(
+		"Ticket Add-on Value",
+		{"parenttype": "Attendee Ticket Add-on", "parent": ("in", attendee_add_ons or [""])},
+	)
+	frappe.db.delete("Attendee Ticket Add-on", {"name": ("in", attendee_add_ons or [""])})
+	frappe.db.delete(
+		"Event Booking Attendee", {"parenttype": "Event Booking", "parent": ("in", bookings or [""])}
+	)
+	frappe.db.delete(
+		"Event Payment", {"reference_doctype": "Event Booking", "reference_docname": ("in", bookings or [""])}
+	)
+	for doctype in (
+		"Event Check In",
+		"Event Ticket",
+		"Event Booking",
+		"Ticket Hold",
+		"Event Sales Summary",
+		"Event Sales Rollup",
+		"Ticket Add-on",
+		"Event Ticket Type",
+	):
+		frappe.db.delete(doctype, {"event": event})
+	frappe.delete_doc("FE Event", event, force=True, ignore_permissions=True)
+	frappe.db.commit()
+
+
+def _percentile(sorted_values: list[float], percentile: int) -> float:
+	index = min(len(sorted_values) - 1, round(percentile / 100 * (len(sorted_values) - 1)))
+	return sorted_values[index]
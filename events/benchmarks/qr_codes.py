@@ -0,0 +1,50 @@
+"""Compare QR code output modes.
+
+Usage:
+	bench --site <site> execute events.benchmarks.qr_codes.run --kwargs "{'num_codes': 500}"
+"""
+
+import statistics
+import time
+
+import frappe
+
+from events.qr import QR_MODES, _render, render_qr, render_qr_bulk
+
+
+def run(num_codes: int = 200) -> dict:
+	results = {}
+	for label, mode in QR_MODES.items():
+		payloads = [f"benchmark-{frappe.generate_hash(length=10)}" for _ in range(num_codes)]
+
+		timings = []
+		sizes = []
+		for data in payloads:
+			start = time.perf_counter()
+			content = _render(data, mode)
+			timings.append(time.perf_counter() - start)
+			sizes.append(len(content))
+
+		bulk_payloads = [f"benchmark-{frappe.generate_hash(length=10)}" for _ in range(num_codes)]
+		start = time.perf_counter()
+		render_qr_bulk(bulk_payloads, mode)
+		bulk_seconds = time.perf_counter() - start
+
+		# the bulk render above filled the cache, so these are pure lookups
+		start = time.perf_counter()
+		for data in bulk_payloads:
+			render_qr(data, mode)
+		cached_seconds = (time.perf_counter() - start) / num_codes
+
+		results[label] = {
+			"render_ms_p50": round(statistics.median(timings) * 1000, 2),
+			"render_ms_max": round(max(timings) * 1000, 2),
+			"bulk_ms_per_code": round(bulk_seconds / num_codes * 1000, 2),
+			"cached_ms_per_code": round(cached_seconds * 1000, 3),
+			"avg_bytes": int(statistics.mean(sizes)),
+		}
+
+	for label, result in results.items():
+		print(f"{label:<12} {result}")
+
+	return results
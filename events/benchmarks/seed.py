@@ -0,0 +1,511 @@
+"""Seed a site with synthetic events, bookings and tickets at scale.
+
+Usage:
+	bench --site <site> seed-synthetic-data --events 2000 --bookings-per-event 250
+
+or
+
+	bench --site <site> execute events.benchmarks.seed.run --kwargs "{'num_events': 2000}"
+
+Rows are written with `frappe.db.bulk_insert`, skipping the document controllers,
+validations and hooks, and committed every `batch_size` rows. The default counts
+(1000 events of 200 bookings with one to four attendees each) make about half a
+million tickets.
+
+Every booking is submitted and has a ticket per attendee, with add-on values for
+some of them. Events that have already started get check-ins for `check_in_ratio`
+of their tickets. Bookings are booked by `num_users` synthetic website users, so
+per-user queries see a realistic spread. Ticket Type `tickets_sold` counts are set
+as the tickets are made; the Event Sales Summary and Event Sales Rollup are rebuilt
+from the seeded bookings at the end.
+
+Seeded records are not meant to be cleaned up: seed a throwaway site.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import add_days, getdate, now, now_datetime, today
+
+from events.check_in import CHECK_IN_FIELDS
+from events.qr import get_ticket_qr_code_url
+from events.ticketing.doctype.event_booking.event_booking import TICKET_ADD_ON_VALUE_FIELDS, TICKET_FIELDS
+
+DOCUMENT_FIELDS = ("name", "creation", "modified", "owner", "modified_by", "docstatus")
+CHILD_FIELDS = (*DOCUMENT_FIELDS, "parent", "parenttype", "parentfield", "idx")
+
+USER_FIELDS = (
+	*DOCUMENT_FIELDS,
+	"email",
+	"first_name",
+	"full_name",
+	"user_type",
+	"enabled",
+	"send_welcome_email",
+)
+EVENT_FIELDS = (
+	*DOCUMENT_FIELDS,
+	"title",
+	"route",
+	"category",
+	"venue",
+	"host",
+	"medium",
+	"start_date",
+	"end_date",
+	"short_description",
+	"is_published",
+)
+TICKET_TYPE_FIELDS = (
+	*DOCUMENT_FIELDS,
+	"event",
+	"title",
+	"price",
+	"currency",
+	"is_published",
+	"max_tickets_available",
+	"tickets_sold",
+)
+ADD_ON_FIELDS = (*DOCUMENT_FIELDS, "event", "title", "price", "currency", "user_selects_option", "options")
+BOOKING_FIELDS = (
+	*DOCUMENT_FIELDS,
+	"event",
+	"user",
+	"currency",
+	"total_amount",
+	"net_amount",
+	"tax_percentage",
+	"tax_amount",
+	"ticket_generation_status",
+	"tickets_processed",
+)
+ATTENDEE_FIELDS = (
+	*CHILD_FIELDS,
+	"full_name",
+	"email",
+	"ticket_type",
+	"currency",
+	"amount",
+	"add_on_total",
+	"number_of_add_ons",
+)
+# as generated for a booking, plus the on-demand QR code the background job would set
+SEEDED_TICKET_FIELDS = (*TICKET_FIELDS, "qr_code")
+SPONSORSHIP_FIELDS = (*DOCUMENT_FIELDS, "event", "company_name", "company_logo", "status")
+PROPOSAL_FIELDS = (*DOCUMENT_FIELDS, "event", "title", "submitted_by", "status", "description")
+
+SPONSORSHIP_STATUSES = ("Approval Pending", "Payment Pending", "Paid", "Withdrawn")
+PROPOSAL_STATUSES = ("Review Pending", "Shortlisted", "Approved", "Rejected")
+ADD_ON_OPTIONS = ("Small", "Medium", "Large", "XL")
+
+# events start up to a year ago or half a year ahead, and sell tickets for the 90 days before
+PAST_DAYS = 365
+FUTURE_DAYS = 180
+SALES_WINDOW_DAYS = 90
+
+# an odd multiplier is a bijection modulo 16**10, so every seeded name in a run is distinct
+NAME_SPACE = 16**10
+NAME_MULTIPLIER = 0x9E3779B97F
+
+
+def run(
+	num_events: int = 1000,
+	ticket_types_per_event: int = 3,
+	add_ons_per_event: int = 2,
+	bookings_per_event: int = 200,
+	max_attendees_per_booking: int = 4,
+	add_on_ratio: float = 0.3,
+	check_in_ratio: float = 0.7,
+	sponsorships_per_event: int = 5,
+	proposals_per_event: int = 20,
+	num_users: int = 5000,
+	batch_size: int = 10000,
+	seed: int | None = None,
+) -> dict:
+	"""Seed the site and return the number of rows written per doctype."""
+	start = time.perf_counter()
+	seeder = Seeder(random.Random(seed), batch_size)
+
+	users = seeder.make_users(num_users)
+	category_names = frappe.get_all("Event Category", pluck="name") or [
+		_insert_if_missing("Event Category", "Synthetic Category")
+	]
+	venue = _insert_if_missing("Event Venue", "Synthetic Venue", address="Synthetic")
+	host = _insert_if_missing("Event Host", "Synthetic Host")
+
+	for _i in range(num_events):
+		event = seeder.make_event(category_names, venue, host)
+		ticket_types = seeder.make_ticket_types(event, ticket_types_per_event)
+		add_ons = seeder.make_add_ons(event, add_ons_per_event)
+		tickets = seeder.make_bookings(
+			event, ticket_types, add_ons, users, bookings_per_event, max_attendees_per_booking, add_on_ratio
+		)
+		seeder.add_ticket_types(ticket_types)
+		if event.starts_at <= seeder.now:
+			seeder.make_check_ins(event, tickets, check_in_ratio)
+		seeder.make_sponsorship_enquiries(event, sponsorships_per_event)
+		seeder.make_talk_proposals(event, users, proposals_per_event)
+
+	seeder.flush()
+
+	from events.ticketing.doctype.event_sales_rollup.event_sales_rollup import backfill_sales_rollup
+	from events.ticketing.doctype.event_sales_summary.event_sales_summary import rebuild_sales_summary
+
+	rebuild_sales_summary()
+	frappe.db.commit()
+	backfill_sales_rollup(batch_size=batch_size)
+
+	return {"seconds": round(time.perf_counter() - start, 1), "rows": seeder.counts}
+
+
+class Seeder:
+	"""Buffers rows per doctype and bulk inserts them, committing every `batch_size` rows."""
+
+	def __init__(self, rng: random.Random, batch_size: int):
+		self.rng = rng
+		self.batch_size = batch_size
+		self.buffers = {}
+		self.counts = {}
+		self.num_buffered = 0
+		self.num_names = 0
+		self.name_offset = rng.randrange(NAME_SPACE)
+		self.user = frappe.session.user
+		self.now = now_datetime()
+
+	def make_users(self, num_users: int) -> list[str]:
+		prefix = self.new_name()
+		users = [f"synthetic-{prefix}-{i}@example.com" for i in range(num_users)]
+		timestamp = now()
+		for i, email in enumerate(users):
+			self.add(
+				"User",
+				USER_FIELDS,
+				(
+					email,
+					timestamp,
+					timestamp,
+					self.user,
+					self.user,
+					0,
+					email,
+					f"Attendee {i}",
+					f"Attendee {i}",
+					"Website User",
+					1,
+					0,
+				),
+			)
+		return users
+
+	def make_event(self, category_names: list[str], venue: str, host: str) -> frappe._dict:
+		start_date = add_days(today(), self.rng.randint(-PAST_DAYS, FUTURE_DAYS))
+		starts_at = datetime.combine(getdate(start_date), datetime.min.time())
+		created = min(starts_at - timedelta(days=SALES_WINDOW_DAYS), self.now)
+		event = frappe._dict(
+			name=frappe.db.get_next_sequence_val("FE Event"),
+			start_date=start_date,
+			starts_at=starts_at,
+			created=created,
+		)
+		self.add(
+			"FE Event",
+			EVENT_FIELDS,
+			(
+				event.name,
+				created,
+				created,
+				self.user,
+				self.user,
+				0,
+				f"Synthetic Event {event.name}",
+				f"synthetic-{event.name}-{self.new_name()}",
+				self.rng.choice(category_names),
+				venue,
+				host,
+				self.rng.choice(("In Person", "Online")),
+				start_date,
+				add_days(start_date, self.rng.randint(0, 2)),
+				"A synthetic event",
+				1,
+			),
+		)
+		return event
+
+	def make_ticket_types(self, event: frappe._dict, num_ticket_types: int) -> list[frappe._dict]:
+		"""Returns the ticket types, which are inserted by `add_ticket_types` once their sales are known."""
+		return [
+			frappe._dict(
+				name=frappe.db.get_next_sequence_val("Event Ticket Type"),
+				title=f"Ticket Type {i + 1}",
+				price=self.rng.choice((0, 500, 1000, 2500, 5000)),
+				currency="INR",
+				tickets_sold=0,
+				event=event.name,
+				created=event.created,
+			)
+			for i in range(num_ticket_types)
+		]
+
+	def add_ticket_types(self, ticket_types: list[frappe._dict]) -> None:
+		for ticket_type in ticket_types:
+			self.add(
+				"Event Ticket Type",
+				TICKET_TYPE_FIELDS,
+				(
+					ticket_type.name,
+					ticket_type.created,
+					ticket_type.created,
+					self.user,
+					self.user,
+					0,
+					ticket_type.event,
+					ticket_type.title,
+					ticket_type.price,
+					ticket_type.currency,
+					1,
+					0,
+					ticket_type.tickets_sold,
+				),
+			)
+
+	def make_add_ons(self, event: frappe._dict, num_add_ons: int) -> list[frappe._dict]:
+		add_ons = []
+		for i in range(num_add_ons):
+			add_on = frappe._dict(
+				name=self.new_name(),
+				price=self.rng.choice((0, 100, 250)),
+				currency="INR",
+				options=ADD_ON_OPTIONS[: self.rng.randint(0, len(ADD_ON_OPTIONS))],
+			)
+			add_ons.append(add_on)
+			self.add(
+				"Ticket Add-on",
+				ADD_ON_FIELDS,
+				(
+					add_on.name,
+					event.created,
+					event.created,
+					self.user,
+					self.user,
+					0,
+					event.name,
+					f"Add-on {i + 1}",
+					add_on.price,
+					add_on.currency,
+					1 if add_on.options else 0,
+					"\n".join(add_on.options),
+				),
+			)
+		return add_ons
+
+	def make_bookings(
+		self,
+		event: frappe._dict,
+		ticket_types: list[frappe._dict],
+		add_ons: list[frappe._dict],
+		users: list[str],
+		num_bookings: int,
+		max_attendees: int,
+		add_on_ratio: float,
+	) -> list[frappe._dict]:
+		"""Write submitted bookings with their attendees, tickets and add-on values. Returns the tickets."""
+		# sales run until the event starts, or until now for upcoming events
+		sales_seconds = max((min(self.now, event.starts_at) - event.created).total_seconds(), 1)
+		tickets = []
+		for _i in range(num_bookings):
+			booking = self.new_name()
+			user = self.rng.choice(users)
+			created = event.created + timedelta(seconds=self.rng.uniform(0, sales_seconds))
+			total = 0
+			num_attendees = self.rng.randint(1, max_attendees)
+			for idx in range(1, num_attendees + 1):
+				ticket_type = self.rng.choice(ticket_types)
+				ticket_type.tickets_sold += 1
+				attendee_name = f"Attendee {booking}-{idx}"
+				attendee_email = user if idx == 1 else f"{booking}-{idx}@example.com"
+				ticket = frappe._dict(
+					name=self.new_name(),
+					event=event.name,
+					ticket_type=ticket_type.name,
+					token_version=1,
+					created=created,
+				)
+				tickets.append(ticket)
+
+				ticket_add_ons = [add_on for add_on in add_ons if self.rng.random() < add_on_ratio]
+				add_on_total = sum(add_on.price for add_on in ticket_add_ons)
+				total += ticket_type.price + add_on_total
+
+				self.add(
+					"Event Booking Attendee",
+					ATTENDEE_FIELDS,
+					(
+						self.new_name(),
+						created,
+						created,
+						user,
+						user,
+						1,
+						booking,
+						"Event Booking",
+						"attendees",
+						idx,
+						attendee_name,
+						attendee_email,
+						ticket_type.name,
+						ticket_type.currency,
+						ticket_type.price,
+						add_on_total,
+						len(ticket_add_ons),
+					),
+				)
+				self.add(
+					"Event Ticket",
+					SEEDED_TICKET_FIELDS,
+					(
+						ticket.name,
+						created,
+						created,
+						user,
+						user,
+						1,
+						event.name,
+						booking,
+						ticket_type.name,
+						attendee_name,
+						attendee_email,
+						1,
+						None,
+						get_ticket_qr_code_url(ticket),
+					),
+				)
+				for add_on_idx, add_on in enumerate(ticket_add_ons, start=1):
+					self.add(
+						"Ticket Add-on Value",
+						TICKET_ADD_ON_VALUE_FIELDS,
+						(
+							self.new_name(),
+							created,
+							created,
+							user,
+							user,
+							1,
+							ticket.name,
+							"Event Ticket",
+							"add_ons",
+							add_on_idx,
+							add_on.name,
+							self.rng.choice(add_on.options) if add_on.options else None,
+							add_on.price,
+							add_on.currency,
+						),
+					)
+
+			self.add(
+				"Event Booking",
+				BOOKING_FIELDS,
+				(
+					booking,
+					created,
+					created,
+					user,
+					user,
+					1,
+					event.name,
+					user,
+					"INR",
+					total,
+					total,
+					0,
+					0,
+					"Completed",
+					num_attendees,
+				),
+			)
+		return tickets
+
+	def make_check_ins(self, event: frappe._dict, tickets: list[frappe._dict], check_in_ratio: float) -> None:
+		checked_in_at = event.starts_at + timedelta(hours=8)
+		for ticket in tickets:
+			if self.rng.random() >= check_in_ratio:
+				continue
+			# events that started today have only had their doors open until now
+			timestamp = min(checked_in_at + timedelta(seconds=self.rng.uniform(0, 4 * 60 * 60)), self.now)
+			self.add(
+				"Event Check In",
+				CHECK_IN_FIELDS,
+				(
+					self.new_name(),
+					timestamp,
+					timestamp,
+					self.user,
+					self.user,
+					1,
+					event.name,
+					ticket.name,
+					None,
+				),
+			)
+
+	def make_sponsorship_enquiries(self, event: frappe._dict, num_enquiries: int) -> None:
+		for i in range(num_enquiries):
+			self.add(
+				"Sponsorship Enquiry",
+				SPONSORSHIP_FIELDS,
+				(
+					self.new_name(),
+					event.created,
+					event.created,
+					self.user,
+					self.user,
+					0,
+					event.name,
+					f"Sponsor {event.name}-{i + 1}",
+					None,
+					self.rng.choice(SPONSORSHIP_STATUSES),
+				),
+			)
+
+	def make_talk_proposals(self, event: frappe._dict, users: list[str], num_proposals: int) -> None:
+		for i in range(num_proposals):
+			self.add(
+				"Talk Proposal",
+				PROPOSAL_FIELDS,
+				(
+					self.new_name(),
+					event.created,
+					event.created,
+					self.user,
+					self.user,
+					0,
+					event.name,
+					f"Talk {event.name}-{i + 1}",
+					self.rng.choice(users),
+					self.rng.choice(PROPOSAL_STATUSES),
+					"<p>A synthetic talk proposal</p>",
+				),
+			)
+
+	def new_name(self) -> str:
+		self.num_names += 1
+		return f"{(self.name_offset + self.num_names * NAME_MULTIPLIER) % NAME_SPACE:010x}"
+
+	def add(self, doctype: str, fields: tuple, row: tuple) -> None:
+		self.buffers.setdefault(doctype, (fields, []))[1].append(row)
+		self.num_buffered += 1
+		if self.num_buffered >= self.batch_size:
+			self.flush()
+
+	def flush(self) -> None:
+		for doctype, (fields, rows) in self.buffers.items():
+			frappe.db.bulk_insert(doctype, fields, rows, chunk_size=self.batch_size)
+			self.counts[doctype] = self.counts.get(doctype, 0) + len(rows)
+		self.buffers = {}
+		self.num_buffered = 0
+		frappe.db.commit()
+
+
+def _insert_if_missing(doctype: str, name: str, **fields) -> str:
+	return frappe.get_doc({"doctype": doctype, "name": name, **fields}).insert(ignore_if_duplicate=True).name
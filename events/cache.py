@@ -0,0 +1,45 @@
+import frappe
+
+EVENT_BOOKING_DATA_CACHE_KEY = "events:event_booking_data"
+# a hash per event, of add-on demand by breakdown
+ADD_ON_DEMAND_CACHE_KEY = "events:add_on_demand"
+# a key per event, of the capabilities computed by `events.policy`
+EVENT_POLICY_CACHE_KEY = "events:event_policy"
+
+
+def clear_event_booking_data_cache(event: str | int | None = None, route: str | None = None):
+	"""Drop the cached booking page payload of an event, or of every event if neither is given."""
+	if event and not route:
+		route = frappe.db.get_value("FE Event", event, "route")
+
+	if route:
+		frappe.cache.hdel(EVENT_BOOKING_DATA_CACHE_KEY, route)
+	elif not event:
+		frappe.cache.delete_value(EVENT_BOOKING_DATA_CACHE_KEY)
+
+
+def clear_add_on_demand_cache(event: str | int) -> None:
+	"""Drop the cached Add-on Demand report data of an event.
+
+	Dropped again once the transaction commits, in case a report run in the meantime
+	cached the data as it was before.
+	"""
+	key = f"{ADD_ON_DEMAND_CACHE_KEY}:{event}"
+	frappe.cache.delete_value(key)
+	frappe.db.after_commit.add(lambda: frappe.cache.delete_value(key))
+
+
+def clear_event_policy_cache(event: str | int | None = None) -> None:
+	"""Drop the cached date-window policy of an event, or of every event if none is given.
+
+	Dropped again once the transaction commits, like the Add-on Demand cache.
+	"""
+
+	def clear():
+		if event:
+			frappe.cache.delete_value(f"{EVENT_POLICY_CACHE_KEY}:{event}")
+		else:
+			frappe.cache.delete_keys(f"{EVENT_POLICY_CACHE_KEY}:")
+
+	clear()
+	frappe.db.after_commit.add(clear)
@@ -0,0 +1,435 @@
+"""Batch check-in for door scanners.
+
+Scanners send whatever they read off a QR code: a signed ticket token (see
+`events.ticket_tokens`) or, on older tickets, the bare ticket name. Tokens
+are validated without the database. Bare names are checked against a
+per-event hash of valid tickets (and their ticket types) kept in Redis,
+loaded from the database the first time an event is scanned and maintained
+as tickets are issued and cancelled.
+
+Duplicate scans are rejected by a per-event, per-track set of checked-in
+tickets, also in Redis: admitting a ticket is a single SADD that atomically
+reports whether it was already in. The Event Check In rows are written
+behind it, in batches, by `flush_check_in_queue`. Scans into a track with a
+capacity are also admitted into its room (see `events.track_occupancy`), and
+turned away when it is full. After a crash, run
+
+	bench --site <site> rebuild-check-in-cache [--event <event>] [--check-only]
+"""
+
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import now
+
+from events.check_in_stats import record_scans
+from events.report_cache import invalidate_report_cache
+from events.ticket_tokens import decode_ticket_token, is_ticket_token, is_token_revoked
+from events.track_occupancy import ENTERED, ROOM_FULL, enter_track, get_track_capacity, leave_track
+
+OK = "ok"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+WRONG_EVENT = "wrong_event"
+FULL = "room_full"
+# checked in to the track before, back into its room after a check-out
+REENTERED = "reentered"
+CHECKED_OUT = "checked_out"
+NOT_IN_ROOM = "not_in_room"
+
+CHECK_IN_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"docstatus",
+	"event",
+	"ticket",
+	"track",
+)
+
+# marks a valid ticket hash or checked-in set as loaded, so an empty one is not reloaded on every scan
+BUILT_MARKER = "__built__"
+
+CHECK_IN_QUEUE_KEY = "events:check_in_queue"
+FLUSH_BATCH_SIZE = 1000
+
+# Adds tickets to a checked-in set, returning 1 for each that was not in it yet.
+# Refuses to create the set, so a set that is not loaded is never mistaken for an empty one.
+ADD_CHECK_INS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+	return false
+end
+local added = {}
+for i, ticket in ipairs(ARGV) do
+	added[i] = redis.call('SADD', KEYS[1], ticket)
+end
+return added
+"""
+
+
+@frappe.whitelist()
+def check_in_batch(event: str | int, scans: list[str], track: str | None = None) -> list[dict]:
+	"""Check in a batch of scans, returning {scan, ticket, ticket_type, status} for each, in order."""
+	frappe.has_permission("Event Check In", "create", throw=True)
+	return record_check_ins(event, scans, track)
+
+
+def record_check_ins(
+	event: str | int,
+	scans: list[str],
+	track: str | None = None,
+	scanned_at: list | None = None,
+) -> list[dict]:
+	"""Validate scans and queue an Event Check In for each newly admitted ticket.
+
+	`scanned_at` holds the time of each scan when they were made offline. The check-in
+	is recorded at that time and, when a ticket was scanned more than once, the earliest
+	scan is the one admitted.
+	"""
+	results = resolve_scans(event, scans)
+
+	admitted = [idx for idx, result in enumerate(results) if result["status"] == OK]
+	if scanned_at:
+		admitted.sort(key=lambda idx: scanned_at[idx])
+
+	entered = {}
+	if track and get_track_capacity(track):
+		room = enter_track(event, track, [results[idx]["ticket"] for idx in admitted])
+		entered = dict(zip(admitted, room, strict=True))
+		for idx in admitted:
+			if entered[idx] == ROOM_FULL:
+				results[idx]["status"] = FULL
+		admitted = [idx for idx in admitted if entered[idx] != ROOM_FULL]
+
+	# a ticket scanned twice in one batch is added twice, the second add reports the duplicate
+	is_new = add_to_checked_in_set(event, track, [results[idx]["ticket"] for idx in admitted])
+	check_ins = []
+	timestamp = now()
+	user = frappe.session.user
+	for idx, added in zip(admitted, is_new, strict=True):
+		if not added:
+			results[idx]["status"] = REENTERED if entered.get(idx) == ENTERED else DUPLICATE
+			continue
+
+		creation = str(scanned_at[idx]) if scanned_at else timestamp
+		check_ins.append(
+			json.dumps(
+				[frappe.generate_hash(length=10), creation, user, event, results[idx]["ticket"], track]
+			)
+		)
+
+	if check_ins:
+		queue_check_ins(check_ins)
+		invalidate_report_cache(event, include_global=False)
+
+	record_scans(
+		event,
+		track,
+		len(scans),
+		[(result["ticket"], result["ticket_type"]) for result in results if result["status"] == OK],
+	)
+	return results
+
+
+@frappe.whitelist()
+def check_out_batch(event: str | int, track: str, scans: list[str]) -> list[dict]:
+	"""Check a batch of scans out of a track's room, returning {scan, ticket, ticket_type, status} for each."""
+	frappe.has_permission("Event Check In", "create", throw=True)
+	results = resolve_scans(event, scans)
+
+	leaving = [idx for idx, result in enumerate(results) if result["status"] == OK]
+	left = leave_track(event, track, [results[idx]["ticket"] for idx in leaving])
+	for idx, was_in in zip(leaving, left, strict=True):
+		results[idx]["status"] = CHECKED_OUT if was_in else NOT_IN_ROOM
+	return results
+
+
+def resolve_scans(event: str | int, scans: list[str]) -> list[dict]:
+	"""Returns {scan, ticket, ticket_type, status} for each scan, status OK for a valid ticket of `event`."""
+	results = [{"scan": scan, "ticket": None, "ticket_type": None, "status": INVALID} for scan in scans]
+	bare_tickets = {}
+	for idx, scan in enumerate(scans):
+		if not is_ticket_token(scan):
+			if scan != BUILT_MARKER:
+				bare_tickets[idx] = scan
+			continue
+
+		claims = decode_ticket_token(scan)
+		if not claims or is_token_revoked(claims):
+			continue
+		results[idx]["ticket"] = claims.ticket
+		results[idx]["ticket_type"] = claims.ticket_type
+		results[idx]["status"] = OK if claims.event == str(event) else WRONG_EVENT
+
+	_validate_bare_tickets(event, bare_tickets, results)
+	return results
+
+
+def get_scan_error(status: str) -> str:
+	return {
+		DUPLICATE: _("Ticket is already checked in"),
+		INVALID: _("Invalid ticket"),
+		WRONG_EVENT: _("This ticket is for a different event"),
+		FULL: _("This room is full"),
+	}[status]
+
+
+def add_to_checked_in_set(event: str | int, track: str | None, tickets: list[str]) -> list[int]:
+	"""Returns 1 for each ticket newly checked in, 0 for one that already was."""
+	if not tickets:
+		return []
+
+	script = frappe.cache.register_script(ADD_CHECK_INS_SCRIPT)
+	key = frappe.cache.make_key(_checked_in_key(event, track))
+	added = script(keys=[key], args=tickets)
+	if added is None:
+		load_checked_in_set(event, track)
+		added = script(keys=[key], args=tickets)
+	return added
+
+
+def get_checked_in_set(event: str | int, track: str | None = None) -> set[str]:
+	key = _checked_in_key(event, track)
+	if not frappe.cache.exists(key):
+		load_checked_in_set(event, track)
+	return _get_members(key)
+
+
+def load_checked_in_set(event: str | int, track: str | None = None) -> None:
+	"""Build a checked-in set from the database and the check-ins still waiting to be written."""
+	tickets = set(
+		frappe.get_all(
+			"Event Check In",
+			filters={"event": event, "track": track or ("is", "not set"), "docstatus": 1},
+			pluck="ticket",
+		)
+	)
+	for _name, _creation, _owner, queued_event, ticket, queued_track in get_queued_check_ins():
+		if str(queued_event) == str(event) and queued_track == track:
+			tickets.add(ticket)
+
+	key = frappe.cache.make_key(_checked_in_key(event, track))
+	loading_key = frappe.cache.make_key(f"events:loading_checked_in:{frappe.generate_hash(length=10)}")
+	pipeline = frappe.cache.pipeline()
+	pipeline.sadd(loading_key, BUILT_MARKER, *tickets)
+	# another worker may have loaded it meanwhile, and admitted tickets into it since
+	pipeline.renamenx(loading_key, key)
+	pipeline.delete(loading_key)
+	pipeline.execute()
+
+
+def add_check_in(event: str | int, track: str | None, ticket: str) -> bool:
+	"""Add a check-in recorded outside of `record_check_ins`, returns whether the ticket was not checked in yet.
+
+	A set that is not built is loaded from the database first, so call before the check-in is written.
+	"""
+	return bool(add_to_checked_in_set(event, track, [ticket])[0])
+
+
+def remove_check_in(event: str | int, track: str | None, ticket: str) -> None:
+	frappe.cache.srem(_checked_in_key(event, track), ticket)
+
+
+def queue_check_ins(check_ins: list[str]) -> None:
+	pipeline = frappe.cache.pipeline()
+	pipeline.rpush(frappe.cache.make_key(CHECK_IN_QUEUE_KEY), *check_ins)
+	pipeline.execute()
+	frappe.enqueue(
+		flush_check_in_queue,
+		queue="short",
+		job_id="events:flush_check_in_queue",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		now=frappe.in_test,
+	)
+
+
+def flush_check_in_queue() -> None:
+	"""Write queued check-ins as Event Check In rows.
+
+	Rows are taken off the queue atomically, so concurrent flushes never write the same
+	check-in twice. Any lost to a crash before the commit are still in the checked-in
+	sets, `check_check_in_cache(repair=True)` writes them.
+	"""
+	key = frappe.cache.make_key(CHECK_IN_QUEUE_KEY)
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, FLUSH_BATCH_SIZE - 1)
+	pipeline.ltrim(key, FLUSH_BATCH_SIZE, -1)
+	queued, _trimmed = pipeline.execute()
+	if not queued:
+		return
+
+	timestamp = now()
+	frappe.db.bulk_insert(
+		"Event Check In",
+		CHECK_IN_FIELDS,
+		[
+			(name, creation, timestamp, owner, owner, 1, event, ticket, track)
+			for name, creation, owner, event, ticket, track in map(json.loads, queued)
+		],
+	)
+
+	if len(queued) == FLUSH_BATCH_SIZE:
+		frappe.enqueue(flush_check_in_queue, queue="short", enqueue_after_commit=True)
+
+
+def rebuild_check_in_cache(event: str | int | None = None) -> None:
+	"""Drop the checked-in sets and counters, so they reload from the database (and the queue) when next needed."""
+	frappe.cache.delete_keys(f"events:checked_in:{event}:" if event else "events:checked_in:")
+	frappe.cache.delete_keys(f"events:check_in_counters:{event}" if event else "events:check_in_counters:")
+
+
+def check_check_in_cache(event: str | int | None = None, repair: bool = False) -> list[dict]:
+	"""Compare the checked-in sets with the database, returning one row per set that differs.
+
+	With `repair`, check-ins that were admitted at the door but never written are written now.
+	"""
+	queued = get_queued_check_ins()
+	site_prefix = frappe.safe_decode(frappe.cache.make_key(""))
+	mismatches = []
+	for key in frappe.cache.get_keys(f"events:checked_in:{event}:" if event else "events:checked_in:"):
+		key = frappe.safe_decode(key).removeprefix(site_prefix)
+		set_event, _sep, set_track = key.removeprefix("events:checked_in:").partition(":")
+		track = set_track or None
+		in_cache = _get_members(key)
+		in_db = set(
+			frappe.get_all(
+				"Event Check In",
+				filters={"event": set_event, "track": track or ("is", "not set"), "docstatus": 1},
+				pluck="ticket",
+			)
+		)
+		in_db |= {row[4] for row in queued if str(row[3]) == set_event and row[5] == track}
+
+		if in_cache == in_db:
+			continue
+
+		mismatch = {
+			"event": set_event,
+			"track": track,
+			# checked in on record but admissible again at the door, fixed by a rebuild
+			"missing_from_cache": sorted(in_db - in_cache),
+			# admitted at the door but never written
+			"missing_from_database": sorted(in_cache - in_db),
+		}
+		mismatches.append(mismatch)
+
+		if repair and mismatch["missing_from_database"]:
+			timestamp = now()
+			user = frappe.session.user
+			frappe.db.bulk_insert(
+				"Event Check In",
+				CHECK_IN_FIELDS,
+				[
+					(
+						frappe.generate_hash(length=10),
+						timestamp,
+						timestamp,
+						user,
+						user,
+						1,
+						set_event,
+						ticket,
+						track,
+					)
+					for ticket in mismatch["missing_from_database"]
+				],
+			)
+
+	return mismatches
+
+
+def get_queued_check_ins(limit: int | None = None) -> list[list]:
+	end = limit - 1 if limit else -1
+	return [json.loads(row) for row in frappe.cache.lrange(CHECK_IN_QUEUE_KEY, 0, end)]
+
+
+def _get_members(key: str) -> set[str]:
+	return {frappe.safe_decode(ticket) for ticket in frappe.cache.smembers(key)} - {BUILT_MARKER}
+
+
+def _checked_in_key(event: str | int, track: str | None = None) -> str:
+	return f"events:checked_in:{event}:{track or ''}"
+
+
+def _validate_bare_tickets(event: str | int, bare_tickets: dict[int, str], results: list[dict]) -> None:
+	if not bare_tickets:
+		return
+
+	key = _valid_tickets_key(event)
+	if not frappe.cache.exists(key):
+		load_valid_tickets(event)
+
+	ticket_types = (
+		frappe.cache.pipeline().hmget(frappe.cache.make_key(key), list(bare_tickets.values())).execute()[0]
+	)
+
+	unknown = {}
+	for (idx, ticket), ticket_type in zip(bare_tickets.items(), ticket_types, strict=True):
+		if ticket_type and ticket != BUILT_MARKER:
+			results[idx]["ticket"] = ticket
+			results[idx]["ticket_type"] = frappe.safe_decode(ticket_type)
+			results[idx]["status"] = OK
+		else:
+			unknown[idx] = ticket
+
+	if not unknown:
+		return
+
+	# rare path: tell tickets for another event apart from ones that do not exist
+	tickets = {
+		ticket.name: ticket
+		for ticket in frappe.get_all(
+			"Event Ticket",
+			filters={"name": ("in", list(unknown.values())), "docstatus": 1},
+			fields=["name", "event", "ticket_type"],
+		)
+	}
+	for idx, ticket in unknown.items():
+		if ticket not in tickets:
+			continue
+
+		results[idx]["ticket"] = ticket
+		results[idx]["ticket_type"] = str(tickets[ticket].ticket_type)
+		if str(tickets[ticket].event) == str(event):
+			# issued after the set was loaded, in a transaction that has not committed yet
+			results[idx]["status"] = OK
+		else:
+			results[idx]["status"] = WRONG_EVENT
+
+
+def load_valid_tickets(event: str | int) -> None:
+	"""(Re)build the event's hash of submitted tickets and their ticket types from the database."""
+	tickets = frappe.get_all(
+		"Event Ticket", filters={"event": event, "docstatus": 1}, fields=["name", "ticket_type"], as_list=True
+	)
+	key = frappe.cache.make_key(_valid_tickets_key(event))
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.delete(key)
+	pipeline.hset(key, mapping={BUILT_MARKER: 1, **dict(tickets)})
+	pipeline.execute()
+
+
+def add_valid_tickets(event: str | int, tickets: dict[str, str | int]) -> None:
+	"""Add newly issued tickets, {name: ticket type}, to the event's hash once their transaction commits."""
+
+	def add():
+		# an unloaded hash picks the tickets up from the database when it is first needed
+		if frappe.cache.exists(_valid_tickets_key(event)):
+			frappe.cache.pipeline().hset(
+				frappe.cache.make_key(_valid_tickets_key(event)), mapping=tickets
+			).execute()
+
+	frappe.db.after_commit.add(add)
+
+
+def remove_valid_ticket(event: str | int, ticket: str) -> None:
+	frappe.cache.pipeline().hdel(frappe.cache.make_key(_valid_tickets_key(event)), ticket).execute()
+
+
+def _valid_tickets_key(event: str | int) -> str:
+	return f"events:valid_ticket_types:{event}"
@@ -0,0 +1,185 @@
+"""Live door throughput and attendance counters.
+
+Counters live in Redis and are bumped as check-ins are recorded, so viewers of
+the Check In Dashboard page never query Event Check In. Updates are pushed over
+realtime to the FE Event's document room, at most once every
+PUBLISH_INTERVAL_SECONDS per event while scans stream in; an update held back
+by that throttle is sent by the next scan or by the minutely `flush_check_ins`.
+
+	events:check_in_counters:<event>        hash: checked_in, track:<track>, ticket_type:<ticket type>
+	events:check_in_rate:<event>:<minute>   hash: scans, admitted (expires after RATE_WINDOW_MINUTES)
+
+along with the live occupancy of each track's room (see `events.track_occupancy`).
+
+`checked_in` and the ticket type counters count entrance check-ins (those
+without a track); the track counters count check-ins to each track.
+"""
+
+import time
+
+import frappe
+from frappe.query_builder.functions import Count
+
+# marks a counter hash as loaded, a missing one is rebuilt from the database
+BUILT_MARKER = "__built__"
+RATE_WINDOW_MINUTES = 60
+REALTIME_EVENT = "event_check_in_counters"
+PUBLISH_INTERVAL_SECONDS = 2
+# events with an update held back by the throttle
+PENDING_PUBLISH_KEY = "events:check_in_counters_pending"
+
+
+def record_scans(
+	event: str | int, track: str | None, num_scans: int, admitted: list[tuple[str, str]]
+) -> None:
+	"""Count a batch of scans, `admitted` holding (ticket, ticket type) of the newly checked in.
+
+	Call once the check-ins are queued or written, so a rebuild of the counters includes them.
+	"""
+	rate_key = frappe.cache.make_key(f"events:check_in_rate:{event}:{int(time.time() // 60)}")
+	pipeline = frappe.cache.pipeline()
+	pipeline.hincrby(rate_key, "scans", num_scans)
+	pipeline.hincrby(rate_key, "admitted", len(admitted))
+	pipeline.expire(rate_key, RATE_WINDOW_MINUTES * 60)
+	pipeline.execute()
+
+	_update_counters(event, track, [ticket_type for _ticket, ticket_type in admitted], 1)
+	publish_check_in_counters(event, throttle=True)
+
+
+def record_cancelled_check_in(event: str | int, track: str | None, ticket_type: str | int) -> None:
+	_update_counters(event, track, [ticket_type], -1)
+	publish_check_in_counters(event)
+
+
+@frappe.whitelist()
+def get_check_in_counters(event: str | int) -> dict:
+	frappe.has_permission("FE Event", "read", doc=event, throw=True)
+	return _get_check_in_counters(event)
+
+
+def _get_check_in_counters(event: str | int) -> dict:
+	from events.track_occupancy import get_track_occupancy
+
+	if not frappe.cache.hexists(_counters_key(event), BUILT_MARKER):
+		rebuild_check_in_counters(event)
+
+	current_minute = int(time.time() // 60)
+	minutes = range(current_minute - RATE_WINDOW_MINUTES + 1, current_minute + 1)
+	pipeline = frappe.cache.pipeline()
+	pipeline.hgetall(frappe.cache.make_key(_counters_key(event)))
+	for minute in minutes:
+		pipeline.hmget(frappe.cache.make_key(f"events:check_in_rate:{event}:{minute}"), "scans", "admitted")
+	counters, *rates = pipeline.execute()
+
+	counters = {frappe.safe_decode(field): int(value) for field, value in counters.items()}
+	counters.pop(BUILT_MARKER, None)
+
+	return {
+		"event": event,
+		"checked_in": counters.pop("checked_in", 0),
+		"tracks": {
+			field.removeprefix("track:"): value
+			for field, value in counters.items()
+			if field.startswith("track:")
+		},
+		"ticket_types": {
+			field.removeprefix("ticket_type:"): value
+			for field, value in counters.items()
+			if field.startswith("ticket_type:")
+		},
+		"occupancy": get_track_occupancy(event),
+		"scans_per_minute": [
+			{"minute": minute * 60, "scans": int(scans or 0), "admitted": int(admitted or 0)}
+			for minute, (scans, admitted) in zip(minutes, rates, strict=True)
+		],
+	}
+
+
+def publish_check_in_counters(event: str | int, throttle: bool = False) -> None:
+	"""Push the counters to the event's document room, with `throttle` not within PUBLISH_INTERVAL_SECONDS of the last."""
+	if throttle and not frappe.cache.set(
+		frappe.cache.make_key(f"events:check_in_counters_published:{event}"),
+		1,
+		ex=PUBLISH_INTERVAL_SECONDS,
+		nx=True,
+	):
+		frappe.cache.sadd(PENDING_PUBLISH_KEY, event)
+		return
+
+	frappe.cache.srem(PENDING_PUBLISH_KEY, event)
+	# one message to the document room, however many organisers are watching
+	frappe.publish_realtime(REALTIME_EVENT, _get_check_in_counters(event), doctype="FE Event", docname=event)
+
+
+def publish_pending_check_in_counters() -> None:
+	"""Send the updates the throttle held back, for events whose scans have since stopped."""
+	for event in frappe.cache.smembers(PENDING_PUBLISH_KEY):
+		publish_check_in_counters(frappe.safe_decode(event))
+
+
+def rebuild_check_in_counters(event: str | int) -> None:
+	"""Recount from Event Check In, plus the check-ins still queued to be written."""
+	from events.check_in import get_queued_check_ins
+
+	CheckIn = frappe.qb.DocType("Event Check In")
+	Ticket = frappe.qb.DocType("Event Ticket")
+	rows = (
+		frappe.qb.from_(CheckIn)
+		.join(Ticket)
+		.on(Ticket.name == CheckIn.ticket)
+		.select(CheckIn.track, Ticket.ticket_type, Count("*"))
+		.where(CheckIn.event == event)
+		.where(CheckIn.docstatus == 1)
+		.groupby(CheckIn.track, Ticket.ticket_type)
+		.run()
+	)
+
+	counters = {}
+	for track, ticket_type, count in rows:
+		for field in _get_counter_fields(track, ticket_type):
+			counters[field] = counters.get(field, 0) + count
+
+	queued = [row for row in get_queued_check_ins() if str(row[3]) == str(event)]
+	if queued:
+		ticket_types = dict(
+			frappe.get_all(
+				"Event Ticket",
+				filters={"name": ("in", [row[4] for row in queued])},
+				fields=["name", "ticket_type"],
+				as_list=True,
+			)
+		)
+		for _name, _creation, _owner, _event, ticket, track in queued:
+			for field in _get_counter_fields(track, ticket_types.get(ticket)):
+				counters[field] = counters.get(field, 0) + 1
+
+	key = frappe.cache.make_key(_counters_key(event))
+	pipeline = frappe.cache.pipeline()
+	pipeline.delete(key)
+	pipeline.hset(key, mapping={BUILT_MARKER: 1, **counters})
+	pipeline.execute()
+
+
+def _update_counters(event: str | int, track: str | None, ticket_types: list, amount: int) -> None:
+	if not frappe.cache.hexists(_counters_key(event), BUILT_MARKER):
+		# the recount already reflects these check-ins
+		rebuild_check_in_counters(event)
+		return
+
+	key = frappe.cache.make_key(_counters_key(event))
+	pipeline = frappe.cache.pipeline()
+	for ticket_type in ticket_types:
+		for field in _get_counter_fields(track, ticket_type):
+			pipeline.hincrby(key, field, amount)
+	pipeline.execute()
+
+
+def _get_counter_fields(track: str | None, ticket_type: str | int | None) -> list[str]:
+	if track:
+		return [f"track:{track}"]
+	return ["checked_in", f"ticket_type:{ticket_type}"]
+
+
+def _counters_key(event: str | int) -> str:
+	return f"events:check_in_counters:{event}"
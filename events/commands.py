@@ -0,0 +1,91 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-check-in-cache")
+@click.option("--event", help="Only the check-in sets of this FE Event")
+@click.option("--check-only", is_flag=True, help="Report differences with the database without rebuilding")
+@click.option("--repair", is_flag=True, help="Write check-ins that are in the cache but not in the database")
+@pass_context
+def rebuild_check_in_cache(context, event=None, check_only=False, repair=False):
+	"""Reconcile the Redis checked-in sets with Event Check In, e.g. after a crash."""
+	import frappe
+
+	from events.check_in import check_check_in_cache
+	from events.check_in import rebuild_check_in_cache as rebuild
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		mismatches = check_check_in_cache(event, repair=repair)
+		for mismatch in mismatches:
+			click.echo(
+				f"Event {mismatch['event']}, track {mismatch['track'] or '-'}: "
+				f"{len(mismatch['missing_from_cache'])} missing from cache, "
+				f"{len(mismatch['missing_from_database'])} missing from database"
+			)
+		if not mismatches:
+			click.secho("Check-in cache is consistent", fg="green")
+
+		if repair:
+			frappe.db.commit()
+		if not check_only:
+			rebuild(event)
+			click.secho("Check-in cache rebuilt", fg="green")
+	finally:
+		frappe.destroy()
+
+
+@click.command("backfill-sales-rollup")
+@click.option("--event", help="Only the bookings of this FE Event")
+@click.option("--batch-size", default=500, help="Bookings read (and committed) per batch")
+@pass_context
+def backfill_sales_rollup(context, event=None, batch_size=500):
+	"""Rebuild the hourly Event Sales Rollup from existing bookings."""
+	import frappe
+
+	from events.ticketing.doctype.event_sales_rollup.event_sales_rollup import (
+		backfill_sales_rollup as backfill,
+	)
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		num_bookings = backfill(event, batch_size=batch_size)
+		click.secho(f"Sales rollup rebuilt from {num_bookings} bookings", fg="green")
+	finally:
+		frappe.destroy()
+
+
+@click.command("seed-synthetic-data")
+@click.option("--events", "num_events", default=1000, help="FE Events to create")
+@click.option("--ticket-types-per-event", default=3)
+@click.option("--add-ons-per-event", default=2)
+@click.option("--bookings-per-event", default=200)
+@click.option("--max-attendees-per-booking", default=4, help="Each booking has one to this many attendees")
+@click.option("--add-on-ratio", default=0.3, help="Chance of a ticket taking each add-on")
+@click.option("--check-in-ratio", default=0.7, help="Share of tickets checked in, for events already started")
+@click.option("--sponsorships-per-event", default=5)
+@click.option("--proposals-per-event", default=20)
+@click.option("--users", "num_users", default=5000, help="Website users the bookings are spread over")
+@click.option("--batch-size", default=10000, help="Rows inserted (and committed) per batch")
+@click.option("--seed", type=int, help="Random seed, for repeatable data")
+@pass_context
+def seed_synthetic_data(context, **kwargs):
+	"""Bulk insert synthetic events, bookings, tickets and check-ins, for scale testing. Not for production sites."""
+	import frappe
+
+	from events.benchmarks.seed import run
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		result = run(**kwargs)
+		for doctype, num_rows in result["rows"].items():
+			click.echo(f"{doctype}: {num_rows}")
+		click.secho(f"Seeded in {result['seconds']}s", fg="green")
+	finally:
+		frappe.destroy()
+
+
+commands = [rebuild_check_in_cache, backfill_sales_rollup, seed_synthetic_data]
@@ -1,9 +1,15 @@
 # Copyright (c) 2025, BWH Studios and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
+from frappe import _
 from frappe.model.document import Document
 
+from events.check_in import DUPLICATE, add_check_in, get_scan_error, remove_check_in
+from events.check_in_stats import record_cancelled_check_in, record_scans
+from events.report_cache import invalidate_report_cache
+from events.track_occupancy import ROOM_FULL, enter_track, get_track_capacity, leave_track
+
 
 class EventCheckIn(Document):
 	# begin: auto-generated types
@@ -20,4 +26,53 @@ class EventCheckIn(Document):
 		track: DF.Link | None
 	# end: auto-generated types
 
-	pass
+	def before_submit(self):
+		# check-ins made from the desk, scanners go through events.check_in
+		if not add_check_in(self.event, self.track, self.ticket):
+			frappe.throw(get_scan_error(DUPLICATE), title=_("Already Checked In"))
+		frappe.db.after_rollback.add(self.remove_from_checked_in_set)
+
+		if self.track and get_track_capacity(self.track):
+			if enter_track(self.event, self.track, [self.ticket])[0] == ROOM_FULL:
+				self.remove_from_checked_in_set()
+				frappe.throw(_("Track {0} is full").format(self.track), title=_("Room Full"))
+
+	def on_submit(self):
+		# before_submit made sure the ticket was not checked in yet
+		ticket_type = frappe.db.get_value("Event Ticket", self.ticket, "ticket_type")
+		record_scans(self.event, self.track, 1, [(self.ticket, ticket_type)])
+		invalidate_report_cache(self.event, include_global=False)
+
+	def remove_from_checked_in_set(self):
+		remove_check_in(self.event, self.track, self.ticket)
+
+	def on_cancel(self):
+		invalidate_report_cache(self.event, include_global=False)
+		if self.is_checked_in_elsewhere():
+			# the ticket stays checked in by its other row
+			return
+
+		self.remove_from_checked_in_set()
+		if self.track:
+			leave_track(self.event, self.track, [self.ticket])
+		ticket_type = frappe.db.get_value("Event Ticket", self.ticket, "ticket_type")
+		record_cancelled_check_in(self.event, self.track, ticket_type)
+
+	def is_checked_in_elsewhere(self) -> bool:
+		return bool(
+			frappe.db.exists(
+				"Event Check In",
+				{
+					"event": self.event,
+					"track": self.track or ("is", "not set"),
+					"ticket": self.ticket,
+					"docstatus": 1,
+					"name": ("!=", self.name),
+				},
+			)
+		)
+
+
+def on_doctype_update():
+	# offline scanners sync the check-ins made since their last cursor
+	frappe.db.add_index("Event Check In", ["event", "modified"])
@@ -1,9 +1,31 @@
 # Copyright (c) 2025, BWH Studios and Contributors
 # See license.txt
 
-# import frappe
+import struct
+from unittest.mock import patch
+
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from events.check_in import (
+	CHECKED_OUT,
+	DUPLICATE,
+	FULL,
+	INVALID,
+	OK,
+	REENTERED,
+	check_in_batch,
+	check_out_batch,
+)
+from events.check_in_stats import (
+	PENDING_PUBLISH_KEY,
+	get_check_in_counters,
+	publish_check_in_counters,
+	publish_pending_check_in_counters,
+)
+from events.offline_scanner import HEADER, build_manifest, upload_offline_check_ins
+from events.ticket_tokens import get_ticket_token
+
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
 # Use these module variables to add/remove to/from that list
@@ -17,4 +39,145 @@ class IntegrationTestEventCheckIn(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def make_tickets(self, event):
+		test_ticket_type = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": event, "title": "Normal", "price": 0}
+		).insert()
+		return [
+			frappe.get_doc(
+				{
+					"doctype": "Event Ticket",
+					"event": event,
+					"ticket_type": test_ticket_type.name,
+					"attendee_name": name,
+					"attendee_email": f"{name.lower()}@email.com",
+				}
+			).submit()
+			for name in ("John", "Jenny")
+		]
+
+	def test_check_in_batch(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tickets = self.make_tickets(test_event.name)
+
+		token = get_ticket_token(tickets[0])
+		results = check_in_batch(test_event.name, [token, tickets[1].name, token, "not-a-ticket"])
+		self.assertEqual([r["status"] for r in results], [OK, OK, DUPLICATE, INVALID])
+		self.assertEqual(results[0]["ticket"], tickets[0].name)
+		self.assertEqual(frappe.db.count("Event Check In", {"ticket": ("in", [t.name for t in tickets])}), 2)
+
+		results = check_in_batch(test_event.name, [tickets[1].name])
+		self.assertEqual(results[0]["status"], DUPLICATE)
+
+	def test_desk_check_in_rejects_duplicates(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tickets = self.make_tickets(test_event.name)
+
+		def check_in_from_desk():
+			return frappe.get_doc(
+				{"doctype": "Event Check In", "event": test_event.name, "ticket": tickets[0].name}
+			).submit()
+
+		check_in = check_in_from_desk()
+		with self.assertRaises(frappe.ValidationError):
+			check_in_from_desk()
+
+		results = check_in_batch(test_event.name, [tickets[0].name])
+		self.assertEqual(results[0]["status"], DUPLICATE)
+
+		check_in.cancel()
+		results = check_in_batch(test_event.name, [tickets[0].name])
+		self.assertEqual(results[0]["status"], OK)
+
+	def test_offline_manifest_and_upload(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tickets = self.make_tickets(test_event.name)
+		check_in_batch(test_event.name, [tickets[0].name])
+
+		manifest = build_manifest(test_event.name)
+		_magic, _version, name_width, count, _cursor = HEADER.unpack_from(manifest)
+		record = struct.Struct(f"<{name_width}sIIB")
+		records = {
+			name.rstrip(b"\0").decode(): flags
+			for name, _ticket_type, _version, flags in record.iter_unpack(
+				manifest[HEADER.size : HEADER.size + count * record.size]
+			)
+		}
+		self.assertEqual(records[tickets[0].name], 1)
+		self.assertEqual(records[tickets[1].name], 0)
+
+		results = upload_offline_check_ins(
+			test_event.name,
+			[
+				{"scan": tickets[1].name, "scanned_at": "2025-01-01 10:05:00"},
+				{"scan": tickets[1].name, "scanned_at": "2025-01-01 10:00:00"},
+			],
+		)
+		self.assertEqual([r["status"] for r in results], [DUPLICATE, OK])
+		creation = frappe.db.get_value("Event Check In", {"ticket": tickets[1].name}, "creation")
+		self.assertEqual(str(creation), "2025-01-01 10:00:00")
+
+	def test_check_in_counters(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tickets = self.make_tickets(test_event.name)
+		before = get_check_in_counters(test_event.name)
+
+		check_in_batch(test_event.name, [tickets[0].name, tickets[0].name, tickets[1].name])
+		counters = get_check_in_counters(test_event.name)
+		self.assertEqual(counters["checked_in"], before["checked_in"] + 2)
+		self.assertEqual(counters["ticket_types"][str(tickets[0].ticket_type)], 2)
+		self.assertEqual(
+			counters["scans_per_minute"][-1]["scans"] - before["scans_per_minute"][-1]["scans"], 3
+		)
+
+	def test_desk_check_in_counted_when_checked_in_set_evicted(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tickets = self.make_tickets(test_event.name)
+		before = get_check_in_counters(test_event.name)
+		frappe.cache.delete_value(f"events:checked_in:{test_event.name}:")
+
+		frappe.get_doc(
+			{"doctype": "Event Check In", "event": test_event.name, "ticket": tickets[0].name}
+		).submit()
+		counters = get_check_in_counters(test_event.name)
+		self.assertEqual(counters["checked_in"], before["checked_in"] + 1)
+		self.assertEqual(counters["ticket_types"][str(tickets[0].ticket_type)], 1)
+
+	def test_check_in_counters_publishing_throttled(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		frappe.cache.delete_value(f"events:check_in_counters_published:{test_event.name}")
+
+		with patch("frappe.publish_realtime") as publish_realtime:
+			publish_check_in_counters(test_event.name, throttle=True)
+			publish_check_in_counters(test_event.name, throttle=True)
+			self.assertEqual(publish_realtime.call_count, 1)
+			self.assertIn(str(test_event.name).encode(), frappe.cache.smembers(PENDING_PUBLISH_KEY))
+
+			publish_pending_check_in_counters()
+			self.assertEqual(publish_realtime.call_count, 2)
+			self.assertNotIn(str(test_event.name).encode(), frappe.cache.smembers(PENDING_PUBLISH_KEY))
+
+	def test_track_capacity(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tickets = self.make_tickets(test_event.name)
+		track = frappe.get_doc(
+			{
+				"doctype": "Event Track",
+				"__newname": frappe.generate_hash(length=10),
+				"event": test_event.name,
+				"capacity": 1,
+			}
+		).insert()
+
+		results = check_in_batch(test_event.name, [tickets[0].name, tickets[1].name], track.name)
+		self.assertEqual([r["status"] for r in results], [OK, FULL])
+
+		results = check_out_batch(test_event.name, track.name, [tickets[0].name])
+		self.assertEqual(results[0]["status"], CHECKED_OUT)
+
+		results = check_in_batch(test_event.name, [tickets[1].name, tickets[0].name], track.name)
+		self.assertEqual([r["status"] for r in results], [OK, FULL])
+
+		check_out_batch(test_event.name, track.name, [tickets[1].name])
+		results = check_in_batch(test_event.name, [tickets[0].name], track.name)
+		self.assertEqual(results[0]["status"], REENTERED)
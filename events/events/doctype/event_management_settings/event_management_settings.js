@@ -1,8 +1,43 @@
 // Copyright (c) 2025, BWH Studios and contributors
 // For license information, please see license.txt
 
-// frappe.ui.form.on("Event Management Settings", {
-// 	refresh(frm) {
-
-// 	},
-// });
+frappe.ui.form.on("Event Management Settings", {
+	refresh(frm) {
+		frm.add_custom_button(__("Report Cache Stats"), () => {
+			frappe.call("events.report_cache.get_report_cache_stats").then(({ message }) => {
+				const rows = Object.entries(message)
+					.map(
+						([report, stats]) => `
+							<tr>
+								<td>${frappe.utils.escape_html(report)}</td>
+								<td class="text-right">${stats.hits}</td>
+								<td class="text-right">${stats.misses}</td>
+								<td class="text-right">${(stats.hit_rate * 100).toFixed(1)}%</td>
+							</tr>
+						`
+					)
+					.join("");
+				const dialog = frappe.msgprint({
+					title: __("Report Cache"),
+					message: `
+						<table class="table table-bordered">
+							<thead><tr>
+								<th>${__("Report")}</th>
+								<th class="text-right">${__("Hits")}</th>
+								<th class="text-right">${__("Misses")}</th>
+								<th class="text-right">${__("Hit Rate")}</th>
+							</tr></thead>
+							<tbody>${rows || `<tr><td colspan="4" class="text-muted">${__("No reports run yet")}</td></tr>`}</tbody>
+						</table>
+					`,
+					primary_action: {
+						label: __("Reset Stats"),
+						action() {
+							frappe.call("events.report_cache.reset_report_cache_stats").then(() => dialog.hide());
+						},
+					},
+				});
+			});
+		});
+	},
+});
@@ -5,6 +5,8 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from events.cache import clear_event_booking_data_cache, clear_event_policy_cache
+
 
 class EventManagementSettings(Document):
 	# begin: auto-generated types
@@ -20,6 +22,9 @@ class EventManagementSettings(Document):
 		allow_transfer_ticket_before_event_start_days: DF.Int
 		apply_gst_on_bookings: DF.Check
 		gst_percentage: DF.Percent
+		qr_code_format: DF.Literal["Styled PNG", "PNG", "Compact PNG", "SVG"]
+		store_ticket_qr_code_files: DF.Check
+		ticket_hold_duration_minutes: DF.Int
 	# end: auto-generated types
 
 	def validate(self):
@@ -27,6 +32,17 @@ class EventManagementSettings(Document):
 		self.validate_transfer_days()
 		self.set_tax_percentage()
 
+	def on_update(self):
+		"""GST settings are part of every cached booking page payload, the cutoffs of every event's policy."""
+		clear_event_booking_data_cache()
+		clear_event_policy_cache()
+		self.purge_qr_code_files_if_disabled()
+
+	def purge_qr_code_files_if_disabled(self):
+		"""Tickets fall back to on-demand QR codes, so stored ones are no longer needed."""
+		if self.has_value_changed("store_ticket_qr_code_files") and not self.store_ticket_qr_code_files:
+			frappe.enqueue("events.qr.purge_ticket_qr_code_files", queue="long", enqueue_after_commit=True)
+
 	def set_tax_percentage(self):
 		"""Set the GST percentage if applicable."""
 		if self.apply_gst_on_bookings and not self.gst_percentage:
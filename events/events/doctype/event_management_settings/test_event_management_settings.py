@@ -1,8 +1,11 @@
 # Copyright (c) 2025, BWH Studios and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, today
+
+from events.policy import get_event_policy
 
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
@@ -17,4 +20,26 @@ class IntegrationTestEventManagementSettings(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def test_policy_follows_settings_and_event_changes(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_event.start_date = add_days(today(), 5)
+		test_event.save()
+
+		settings = frappe.get_doc("Event Management Settings")
+		settings.allow_transfer_ticket_before_event_start_days = 3
+		settings.allow_add_ons_change_before_event_start_days = 7
+		settings.allow_ticket_cancellation_request_before_event_start_days = 5
+		settings.save()
+
+		policy = get_event_policy(test_event.name)
+		self.assertTrue(policy.can_transfer_ticket)
+		self.assertFalse(policy.can_change_add_ons)
+		self.assertTrue(policy.can_request_cancellation)
+
+		settings.allow_transfer_ticket_before_event_start_days = 10
+		settings.save()
+		self.assertFalse(get_event_policy(test_event.name).can_transfer_ticket)
+
+		test_event.start_date = add_days(today(), 30)
+		test_event.save()
+		self.assertTrue(get_event_policy(test_event.name).can_change_add_ons)
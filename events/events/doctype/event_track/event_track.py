@@ -1,9 +1,10 @@
 # Copyright (c) 2025, BWH Studios and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from events.track_occupancy import clear_event_tracks_cache
+
 
 class EventTrack(Document):
 	# begin: auto-generated types
@@ -14,7 +15,15 @@ class EventTrack(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		capacity: DF.Int
 		event: DF.Link
 	# end: auto-generated types
 
-	pass
+	def on_update(self):
+		clear_event_tracks_cache(self.event)
+		previous = self.get_doc_before_save()
+		if previous and previous.event != self.event:
+			clear_event_tracks_cache(previous.event)
+
+	def on_trash(self):
+		clear_event_tracks_cache(self.event)
@@ -47,6 +47,86 @@ frappe.ui.form.on("FE Event", {
 			);
 		});
 
+		frm.add_custom_button(__("Start Check Out"), () => {
+			frappe.prompt(
+				{
+					label: "Track",
+					fieldname: "track",
+					fieldtype: "Link",
+					options: "Event Track",
+					reqd: 1,
+					get_query() {
+						return {
+							filters: {
+								event: frm.doc.name,
+							},
+						};
+					},
+				},
+				(values) => {
+					new frappe.ui.Scanner({
+						dialog: true,
+						multiple: false,
+						on_scan(data) {
+							frappe
+								.call("events.check_in.check_out_batch", {
+									event: frm.doc.name,
+									track: values.track,
+									scans: [data.decodedText],
+								})
+								.then(({ message }) => {
+									if (message[0].status === "checked_out") {
+										frappe.show_alert(__("Check Out Complete!"));
+									} else {
+										frappe.utils.play_sound("error");
+									}
+								});
+						},
+					});
+				}
+			);
+		});
+
+		if (!frm.is_new()) {
+			frm.add_custom_button(__("Check In Dashboard"), () => {
+				frappe.route_options = { event: frm.doc.name };
+				frappe.set_route("check-in-dashboard");
+			});
+
+			frm.add_custom_button(__("Export Attendees"), () => {
+				frappe.prompt(
+					{
+						label: __("File Format"),
+						fieldname: "file_format",
+						fieldtype: "Select",
+						options: ["CSV", "XLSX"],
+						default: "CSV",
+					},
+					({ file_format }) => {
+						const args = new URLSearchParams({ event: frm.doc.name, file_format });
+						window.open(`/api/method/events.attendee_export.export_attendees?${args}`);
+					}
+				);
+			});
+		}
+
+		if (frm.doc.enable_waiting_room) {
+			frm.add_custom_button(__("Waiting Room Metrics"), () => {
+				frm.call("get_waiting_room_metrics").then(({ message }) => {
+					frappe.msgprint({
+						title: __("Waiting Room"),
+						message: `
+							<p>${__("Queue Depth")}: <strong>${message.queue_depth}</strong></p>
+							<p>${__("Joined")}: ${message.joined}</p>
+							<p>${__("Admitted")}: ${message.admitted}</p>
+							<p>${__("Admission Rate")}: ${message.admission_rate} / ${__("second")}</p>
+							<p>${__("Estimated Time to Drain")}: ${message.estimated_drain_seconds}s</p>
+						`,
+					});
+				});
+			});
+		}
+
 		const button_label = frm.doc.is_published ? __("Unpublish") : __("Publish");
 		frm.add_custom_button(button_label, () => {
 			frm.set_value("is_published", !frm.doc.is_published);
@@ -2,8 +2,11 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe import _
 from frappe.model.document import Document
 
+from events.cache import clear_event_booking_data_cache, clear_event_policy_cache
+
 
 class FEEvent(Document):
 	# begin: auto-generated types
@@ -19,6 +22,7 @@ class FEEvent(Document):
 		about: DF.TextEditor | None
 		banner_image: DF.AttachImage | None
 		category: DF.Link
+		enable_waiting_room: DF.Check
 		end_date: DF.Date | None
 		end_time: DF.Time | None
 		external_registration_page: DF.Check
@@ -38,15 +42,42 @@ class FEEvent(Document):
 		time_zone: DF.Autocomplete | None
 		title: DF.Data
 		venue: DF.Link | None
+		waiting_room_admission_rate: DF.Int
 	# end: auto-generated types
 
 	def validate(self):
 		self.validate_route()
 
+	def on_update(self):
+		frappe.cache.delete_value("fe_event_name_by_route")
+		self.clear_booking_data_cache()
+		clear_event_policy_cache(self.name)
+
+	def on_trash(self):
+		self.clear_booking_data_cache()
+		clear_event_policy_cache(self.name)
+
+	def clear_booking_data_cache(self):
+		clear_event_booking_data_cache(route=self.route)
+		previous = self.get_doc_before_save()
+		if previous and previous.route and previous.route != self.route:
+			clear_event_booking_data_cache(route=previous.route)
+
 	def validate_route(self):
 		if self.is_published and not self.route:
 			self.route = frappe.website.utils.cleanup_page_name(self.title).replace("_", "-")
 
 	@frappe.whitelist()
 	def check_in(self, ticket_id: str, track: str | None = None):
-		frappe.get_doc({"doctype": "Event Check In", "ticket": ticket_id, "track": track}).insert().submit()
+		"""`ticket_id` is the scanned QR code: a signed ticket token, or a bare ticket name on older tickets."""
+		from events.check_in import OK, REENTERED, check_in_batch, get_scan_error
+
+		result = check_in_batch(self.name, [ticket_id], track)[0]
+		if result["status"] not in (OK, REENTERED):
+			frappe.throw(get_scan_error(result["status"]), title=_("Check In Failed"))
+
+	@frappe.whitelist()
+	def get_waiting_room_metrics(self) -> dict:
+		from events.waiting_room import get_queue_metrics
+
+		return get_queue_metrics(self.name)
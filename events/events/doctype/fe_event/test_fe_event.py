@@ -1,9 +1,13 @@
 # Copyright (c) 2025, BWH Studios and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from events.waiting_room import ADMISSION_TTL, _key, validate_admission
+
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
 # Use these module variables to add/remove to/from that list
@@ -17,4 +21,17 @@ class IntegrationTestFEEvent(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def test_admitted_token_skips_queue_advance(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_event.enable_waiting_room = 1
+		test_event.save()
+
+		token = frappe.generate_hash(length=20)
+		frappe.cache.set(_key(test_event.name, f"admitted:{token}"), 1, ex=ADMISSION_TTL)
+
+		with patch("events.waiting_room._advance_queue") as advance_queue:
+			validate_admission(test_event.name, token)
+		advance_queue.assert_not_called()
+
+		with self.assertRaises(frappe.PermissionError):
+			validate_admission(test_event.name, frappe.generate_hash(length=20))
@@ -0,0 +1,145 @@
+// Copyright (c) 2025, BWH Studios and contributors
+// For license information, please see license.txt
+
+frappe.pages["check-in-dashboard"].on_page_load = (wrapper) => {
+	frappe.ui.make_app_page({
+		parent: wrapper,
+		title: __("Check In Dashboard"),
+		single_column: true,
+	});
+	wrapper.dashboard = new CheckInDashboard(wrapper);
+};
+
+frappe.pages["check-in-dashboard"].on_page_show = (wrapper) => {
+	const event = frappe.route_options?.event;
+	if (event) {
+		frappe.route_options = null;
+		wrapper.dashboard.event_field.set_value(event);
+	}
+};
+
+class CheckInDashboard {
+	constructor(wrapper) {
+		this.page = wrapper.page;
+		this.$body = $(`<div class="check-in-dashboard"></div>`).appendTo(this.page.main);
+		this.event_field = this.page.add_field({
+			label: __("Event"),
+			fieldname: "event",
+			fieldtype: "Link",
+			options: "FE Event",
+			change: () => this.set_event(this.event_field.get_value()),
+		});
+
+		// counters are pushed once per update to the event's document room
+		frappe.realtime.on("event_check_in_counters", (counters) => {
+			if (String(counters.event) === String(this.event)) {
+				this.render(counters);
+			}
+		});
+	}
+
+	set_event(event) {
+		if (event === this.event) return;
+		if (this.event) {
+			frappe.realtime.doc_unsubscribe("FE Event", this.event);
+		}
+
+		this.event = event;
+		this.$body.empty();
+		if (!event) return;
+
+		frappe.realtime.doc_subscribe("FE Event", event);
+		frappe
+			.call("events.check_in_stats.get_check_in_counters", { event })
+			.then(({ message }) => this.render(message));
+	}
+
+	render(counters) {
+		const last_minute = counters.scans_per_minute.at(-1) || { scans: 0, admitted: 0 };
+		const last_15 = counters.scans_per_minute.slice(-15);
+		const admitted_15 = last_15.reduce((total, minute) => total + minute.admitted, 0);
+
+		this.$body.html(`
+			<div class="row">
+				${this.card(__("Checked In"), counters.checked_in)}
+				${this.card(__("Scans This Minute"), last_minute.scans)}
+				${this.card(__("Admitted This Minute"), last_minute.admitted)}
+				${this.card(__("Admitted / Minute (15 min avg)"), (admitted_15 / 15).toFixed(1))}
+			</div>
+			<div class="row">
+				<div class="col-md-6">${this.table(__("Ticket Type"), counters.ticket_types)}</div>
+				<div class="col-md-6">${this.table(__("Track"), counters.tracks)}</div>
+			</div>
+			${this.occupancy_table(counters.occupancy)}
+			<div class="check-in-throughput"></div>
+		`);
+
+		new frappe.Chart(this.$body.find(".check-in-throughput")[0], {
+			title: __("Scans per Minute"),
+			type: "bar",
+			height: 240,
+			data: {
+				labels: counters.scans_per_minute.map((minute) =>
+					moment.unix(minute.minute).format("HH:mm")
+				),
+				datasets: [
+					{ name: __("Scans"), values: counters.scans_per_minute.map((m) => m.scans) },
+					{ name: __("Admitted"), values: counters.scans_per_minute.map((m) => m.admitted) },
+				],
+			},
+		});
+	}
+
+	occupancy_table(occupancy) {
+		const rows = Object.entries(occupancy)
+			.map(([track, { occupancy, capacity }]) => {
+				const full = capacity && occupancy >= capacity;
+				return `
+					<tr class="${full ? "text-danger" : ""}">
+						<td>${frappe.utils.escape_html(track)}</td>
+						<td class="text-right">${occupancy ?? "-"}</td>
+						<td class="text-right">${capacity || __("No Limit")}</td>
+					</tr>
+				`;
+			})
+			.join("");
+		if (!rows) return "";
+
+		return `
+			<table class="table table-bordered">
+				<thead><tr>
+					<th>${__("Room")}</th>
+					<th class="text-right">${__("In Room")}</th>
+					<th class="text-right">${__("Capacity")}</th>
+				</tr></thead>
+				<tbody>${rows}</tbody>
+			</table>
+		`;
+	}
+
+	card(label, value) {
+		return `
+			<div class="col-md-3">
+				<div class="frappe-card p-4 mb-4">
+					<div class="text-muted">${label}</div>
+					<div class="h3">${value}</div>
+				</div>
+			</div>
+		`;
+	}
+
+	table(label, counts) {
+		const rows = Object.entries(counts)
+			.map(
+				([name, count]) =>
+					`<tr><td>${frappe.utils.escape_html(name)}</td><td class="text-right">${count}</td></tr>`
+			)
+			.join("");
+		return `
+			<table class="table table-bordered">
+				<thead><tr><th>${label}</th><th class="text-right">${__("Checked In")}</th></tr></thead>
+				<tbody>${rows || `<tr><td colspan="2" class="text-muted">${__("None yet")}</td></tr>`}</tbody>
+			</table>
+		`;
+	}
+}
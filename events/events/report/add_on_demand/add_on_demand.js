@@ -0,0 +1,20 @@
+// Copyright (c) 2026, BWH Studios and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Add-on Demand"] = {
+	filters: [
+		{
+			fieldname: "event",
+			label: __("Event"),
+			fieldtype: "Link",
+			options: "FE Event",
+			reqd: 1,
+		},
+		{
+			fieldname: "breakdown",
+			label: __("Break Down By"),
+			fieldtype: "Select",
+			options: ["", "Ticket Type", "Check In Status"],
+		},
+	],
+};
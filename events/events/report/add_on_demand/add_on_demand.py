@@ -0,0 +1,104 @@
+# Copyright (c) 2026, BWH Studios and contributors
+# For license information, please see license.txt
+
+import time
+
+import frappe
+from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Count
+
+from events.cache import ADD_ON_DEMAND_CACHE_KEY
+
+BREAKDOWNS = ("", "Ticket Type", "Check In Status")
+# check-ins change by the second at the door, so that breakdown is only cached briefly
+CHECK_IN_STATUS_CACHE_TTL = 60
+
+
+def execute(filters: dict | None = None):
+	"""Counts of each add-on option chosen on an event's tickets, e.g. meal preferences or t-shirt sizes."""
+	filters = frappe._dict(filters or {})
+	breakdown = filters.breakdown or ""
+	if breakdown not in BREAKDOWNS:
+		frappe.throw(_("Invalid breakdown {0}").format(breakdown))
+
+	return get_columns(breakdown), get_add_on_demand(filters.event, breakdown)
+
+
+def get_columns(breakdown: str) -> list[dict]:
+	columns = [
+		{
+			"label": _("Add-on"),
+			"fieldname": "add_on",
+			"fieldtype": "Link",
+			"options": "Ticket Add-on",
+			"width": 200,
+		},
+		{"label": _("Option"), "fieldname": "option", "fieldtype": "Data", "width": 200},
+	]
+	if breakdown == "Ticket Type":
+		columns.append(
+			{
+				"label": _("Ticket Type"),
+				"fieldname": "ticket_type",
+				"fieldtype": "Link",
+				"options": "Event Ticket Type",
+				"width": 160,
+			}
+		)
+	elif breakdown == "Check In Status":
+		columns.append({"label": _("Checked In"), "fieldname": "checked_in", "fieldtype": "Check"})
+
+	columns.append({"label": _("Count"), "fieldname": "count", "fieldtype": "Int"})
+	return columns
+
+
+def get_add_on_demand(event: str | int, breakdown: str = "") -> list[dict]:
+	"""Cached per event and breakdown; dropped when tickets are issued or cancelled or a preference changes."""
+	key = f"{ADD_ON_DEMAND_CACHE_KEY}:{event}"
+	cached = frappe.cache.hget(key, breakdown)
+	if cached and (breakdown != "Check In Status" or cached["at"] > time.time() - CHECK_IN_STATUS_CACHE_TTL):
+		return cached["data"]
+
+	data = _get_add_on_demand(event, breakdown)
+	frappe.cache.hset(key, breakdown, {"at": time.time(), "data": data})
+	return data
+
+
+def _get_add_on_demand(event: str | int, breakdown: str) -> list[dict]:
+	AddOnValue = frappe.qb.DocType("Ticket Add-on Value")
+	Ticket = frappe.qb.DocType("Event Ticket")
+
+	query = (
+		frappe.qb.from_(AddOnValue)
+		.join(Ticket)
+		.on(Ticket.name == AddOnValue.parent)
+		.select(AddOnValue.add_on, AddOnValue.value.as_("option"))
+		.where(AddOnValue.parenttype == "Event Ticket")
+		.where(AddOnValue.parentfield == "add_ons")
+		.where(Ticket.event == event)
+		.where(Ticket.docstatus == 1)
+		.groupby(AddOnValue.add_on, AddOnValue.value)
+		.orderby(AddOnValue.add_on)
+		.orderby(AddOnValue.value)
+	)
+
+	if breakdown == "Ticket Type":
+		query = query.select(Ticket.ticket_type).groupby(Ticket.ticket_type).orderby(Ticket.ticket_type)
+	elif breakdown == "Check In Status":
+		CheckIn = frappe.qb.DocType("Event Check In")
+		checked_in = Case().when(CheckIn.name.isnull(), 0).else_(1)
+		query = (
+			query.left_join(CheckIn)
+			.on(
+				(CheckIn.ticket == Ticket.name)
+				& (CheckIn.event == event)
+				& CheckIn.track.isnull()
+				& (CheckIn.docstatus == 1)
+			)
+			.select(checked_in.as_("checked_in"))
+			.groupby(checked_in)
+		)
+
+	# an amended check-in would otherwise count a ticket twice
+	return query.select(Count(AddOnValue.name).distinct().as_("count")).run(as_dict=True)
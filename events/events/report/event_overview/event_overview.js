@@ -9,5 +9,11 @@ frappe.query_reports["Event Overview"] = {
 			fieldtype: "Link",
 			options: "FE Event",
 		},
+		{
+			fieldname: "compute_live",
+			label: __("Compute Live"),
+			fieldtype: "Check",
+			description: __("Compute from bookings and tickets instead of the sales summary"),
+		},
 	],
 };
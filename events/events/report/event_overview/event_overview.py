@@ -4,7 +4,11 @@
 import frappe
 from frappe import _
 
+from events.report_cache import cached_report
+from events.ticketing.doctype.event_sales_summary.event_sales_summary import get_live_sales_summary
 
+
+@cached_report("Event Overview")
 def execute(filters: dict | None = None):
 	"""Return columns and data for the report.
 
@@ -13,7 +17,7 @@ def execute(filters: dict | None = None):
 	every time the report is refreshed or a filter is updated.
 	"""
 	columns = get_columns()
-	data = get_data(filters)
+	data = get_data(filters or {})
 
 	return columns, data
 
@@ -31,61 +35,53 @@ def get_columns() -> list[dict]:
 			"options": "FE Event",
 			"width": 200,
 		},
+		{"label": _("Currency"), "fieldname": "currency", "fieldtype": "Link", "options": "Currency"},
 		{
 			"label": _("Number of Tickets Sold"),
 			"fieldname": "num_tickets_sold",
 			"fieldtype": "Int",
 		},
 		{"label": _("Number of Add-ons Sold"), "fieldname": "num_add_ons_sold", "fieldtype": "Int"},
-		{"label": _("Ticket Sales"), "fieldname": "sales", "fieldtype": "Currency"},
+		{"label": _("Ticket Sales"), "fieldname": "sales", "fieldtype": "Currency", "options": "currency"},
 	]
 
 
 def get_data(filters: dict) -> list[dict]:
 	"""Return data for the report.
 
-	The report data is a list of rows, with each row being a list of cell values.
+	One row per event and currency, read from Event Sales Summary, or computed with
+	grouped queries over bookings and tickets when the "Compute Live" filter is set.
+	Events without sales get a single empty row.
 	"""
 	event = filters.get("event")
 
-	if event:
-		return [get_summary_for_event(event)]
-
+	if filters.get("compute_live"):
+		summary = get_live_sales_summary(event)
+	else:
+		summary = frappe.get_all(
+			"Event Sales Summary",
+			filters={"event": event} if event else None,
+			fields=["event", "currency", "tickets_sold", "add_ons_sold", "sales"],
+		)
+
+	rows_by_event = {}
+	for row in summary:
+		rows_by_event.setdefault(str(row.event), []).append(
+			{
+				"event": row.event,
+				"currency": row.currency,
+				"num_tickets_sold": row.tickets_sold,
+				"num_add_ons_sold": row.add_ons_sold,
+				"sales": row.sales,
+			}
+		)
+
+	events = [event] if event else frappe.get_all("FE Event", pluck="name", order_by="creation desc")
 	data = []
-	events = frappe.db.get_all("FE Event", pluck="name")
 	for event in events:
-		summary = get_summary_for_event(event)
-		summary["event"] = event
-		data.append(summary)
+		data.extend(
+			rows_by_event.get(str(event))
+			or [{"event": event, "currency": None, "num_tickets_sold": 0, "num_add_ons_sold": 0, "sales": 0}]
+		)
 
 	return data
-
-
-def get_summary_for_event(event: str) -> dict:
-	"""Return summary data for the event.
-
-	This function is used to get a summary of the event, such as total tickets sold,
-	total add-ons sold, and total sales.
-	"""
-	event_tickets = frappe.db.get_all("Event Ticket", filters={"event": event, "docstatus": 1}, pluck="name")
-	num_tickets_sold = len(event_tickets)
-	sales = frappe.db.get_all(
-		"Event Booking",
-		filters={"docstatus": 1, "event": event},
-		fields=["sum(total_amount) as sales"],
-		pluck="sales",
-	)[0]
-
-	num_add_ons_sold = frappe.db.get_all(
-		"Ticket Add-on Value",
-		filters={"parenttype": "Event Ticket", "parentfield": "add_ons", "parent": ["in", event_tickets]},
-		fields=["count(*) as num_add_ons_sold"],
-		pluck="num_add_ons_sold",
-	)[0]
-
-	return {
-		"event": event,
-		"num_tickets_sold": num_tickets_sold,
-		"num_add_ons_sold": num_add_ons_sold,
-		"sales": sales,
-	}
@@ -0,0 +1,44 @@
+// Copyright (c) 2026, BWH Studios and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Ticket Sales Over Time"] = {
+	filters: [
+		{
+			fieldname: "event",
+			label: __("Event"),
+			fieldtype: "Link",
+			options: "FE Event",
+			reqd: 1,
+		},
+		{
+			fieldname: "ticket_type",
+			label: __("Ticket Type"),
+			fieldtype: "Link",
+			options: "Event Ticket Type",
+			get_query() {
+				return {
+					filters: {
+						event: frappe.query_report.get_filter_value("event"),
+					},
+				};
+			},
+		},
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+		},
+		{
+			fieldname: "interval",
+			label: __("Interval"),
+			fieldtype: "Select",
+			options: ["Hourly", "Daily", "Weekly", "Monthly"],
+			default: "Daily",
+		},
+	],
+};
@@ -0,0 +1,96 @@
+# Copyright (c) 2026, BWH Studios and contributors
+# For license information, please see license.txt
+
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, get_datetime, getdate
+
+from events.report_cache import cached_report
+from events.ticketing.doctype.event_sales_rollup.event_sales_rollup import get_sales_by_hour
+
+
+@cached_report("Ticket Sales Over Time")
+def execute(filters: dict | None = None):
+	"""Return columns, data and a chart of ticket sales per interval and currency, read from Event Sales Rollup."""
+	filters = frappe._dict(filters or {})
+	data = get_data(filters)
+
+	return get_columns(filters), data, None, get_chart(data)
+
+
+def get_columns(filters: dict) -> list[dict]:
+	period_fieldtype = "Datetime" if filters.interval == "Hourly" else "Date"
+	return [
+		{"label": _("Period"), "fieldname": "period", "fieldtype": period_fieldtype, "width": 180},
+		{"label": _("Tickets Sold"), "fieldname": "tickets_sold", "fieldtype": "Int"},
+		{"label": _("Gross"), "fieldname": "gross", "fieldtype": "Currency", "options": "currency"},
+		{"label": _("Tax"), "fieldname": "tax", "fieldtype": "Currency", "options": "currency"},
+		{
+			"label": _("Add-on Revenue"),
+			"fieldname": "add_on_revenue",
+			"fieldtype": "Currency",
+			"options": "currency",
+		},
+		# amounts in different currencies are never added up
+		{"label": _("Currency"), "fieldname": "currency", "fieldtype": "Link", "options": "Currency"},
+	]
+
+
+def get_data(filters: dict) -> list[dict]:
+	hours = get_sales_by_hour(
+		filters.event,
+		from_datetime=get_datetime(filters.from_date) if filters.from_date else None,
+		# the whole of the last day
+		to_datetime=get_datetime(add_days(filters.to_date, 1)) - timedelta(hours=1)
+		if filters.to_date
+		else None,
+		ticket_type=filters.ticket_type,
+	)
+
+	periods = {}
+	for row in hours:
+		period = get_period(row.hour, filters.interval or "Daily")
+		totals = periods.setdefault(
+			(period, row.currency),
+			{
+				"period": period,
+				"tickets_sold": 0,
+				"gross": 0,
+				"tax": 0,
+				"add_on_revenue": 0,
+				"currency": row.currency,
+			},
+		)
+		for fieldname in ("tickets_sold", "gross", "tax", "add_on_revenue"):
+			totals[fieldname] += row[fieldname] or 0
+
+	return list(periods.values())
+
+
+def get_period(hour, interval: str):
+	if interval == "Hourly":
+		return hour
+
+	date = getdate(hour)
+	if interval == "Weekly":
+		return date - timedelta(days=date.weekday())
+	if interval == "Monthly":
+		return date.replace(day=1)
+	return date
+
+
+def get_chart(data: list[dict]) -> dict:
+	# ticket counts do not depend on currency, so the chart adds them up per period
+	tickets_sold = {}
+	for row in data:
+		tickets_sold[row["period"]] = tickets_sold.get(row["period"], 0) + row["tickets_sold"]
+
+	return {
+		"data": {
+			"labels": [str(period) for period in tickets_sold],
+			"datasets": [{"name": _("Tickets Sold"), "values": list(tickets_sold.values())}],
+		},
+		"type": "bar",
+	}
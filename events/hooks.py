@@ -85,6 +85,9 @@ after_install = "events.install.after_install"
 # 	"methods": "events.utils.jinja_methods",
 # 	"filters": "events.utils.jinja_filters"
 # }
+jinja = {
+	"methods": ["events.qr.get_ticket_qr_code_url"],
+}
 
 # Installation
 # ------------
@@ -146,7 +149,13 @@ after_install = "events.install.after_install"
 # Scheduled Tasks
 # ---------------
 
-scheduler_events = {"daily": ["events.tasks.unpublish_ticket_types_after_last_date"]}
+scheduler_events = {
+	"daily": ["events.tasks.unpublish_ticket_types_after_last_date"],
+	"cron": {
+		"* * * * *": ["events.tasks.flush_check_ins"],
+		"*/5 * * * *": ["events.tasks.release_expired_ticket_holds"],
+	},
+}
 
 # Testing
 # -------
@@ -0,0 +1,55 @@
+"""Batched title lookups for Link values in API results.
+
+Rather than a `frappe.db.get_value` per row, every name of a doctype across a
+result set is fetched with one query. Titles are memoised for the rest of the
+request, so endpoints that resolve the same links again do not query at all.
+"""
+
+import frappe
+
+# per request, {doctype: {name: title}}
+MEMO_KEY = "events:link_titles"
+
+
+def get_link_titles(doctype: str, names, title_field: str | None = None) -> dict:
+	"""Returns {name: title} for the given names of `doctype`, leaving out names that do not exist."""
+	title_field = title_field or frappe.get_meta(doctype).get_title_field()
+	memo = frappe.local.cache.setdefault(MEMO_KEY, {}).setdefault((doctype, title_field), {})
+
+	missing = {name for name in names if name and name not in memo}
+	if missing:
+		titles = dict(
+			frappe.get_all(
+				doctype,
+				filters={"name": ("in", list(missing))},
+				fields=["name", title_field],
+				as_list=True,
+			)
+		)
+		for name in missing:
+			memo[name] = titles.get(name)
+
+	return {name: memo[name] for name in names if name and memo.get(name) is not None}
+
+
+def attach_link_titles(
+	rows: list[dict],
+	link_field: str,
+	doctype: str,
+	title_key: str | None = None,
+	title_field: str | None = None,
+	fallback_to_name: bool = False,
+) -> list[dict]:
+	"""Set `title_key` (by default `<link_field>_title`) on every row to the title of its `link_field`.
+
+	Rows without a link get "". Links without a title get None, or the linked name with `fallback_to_name`.
+	"""
+	title_key = title_key or f"{link_field}_title"
+	titles = get_link_titles(doctype, {row.get(link_field) for row in rows}, title_field)
+	for row in rows:
+		name = row.get(link_field)
+		if not name:
+			row[title_key] = ""
+		else:
+			row[title_key] = titles.get(name, name if fallback_to_name else None)
+	return rows
@@ -0,0 +1,158 @@
+"""Offline door scanners.
+
+A scanner downloads a manifest of an event's valid tickets once, keeps it
+current with `get_scanner_changes` and uploads the check-ins it made while
+offline with `upload_offline_check_ins`.
+
+The manifest is a little-endian binary file:
+
+	header   4s magic "EVTM", B format version, B name width, I record count,
+	         26s sync cursor (ASCII datetime)
+	records  <name width>s ticket name (NUL padded), I ticket type, I token version,
+	         B flags (1 = checked in), sorted by name so a device can binary search it
+	trailer  I length, then a JSON object of ticket type titles by name
+"""
+
+import json
+import struct
+
+import frappe
+from frappe.utils import add_to_date, get_datetime, now_datetime
+from werkzeug.wrappers import Response
+
+from events.check_in import get_checked_in_set, record_check_ins
+
+MANIFEST_MAGIC = b"EVTM"
+MANIFEST_VERSION = 1
+HEADER = struct.Struct("<4sBBI26s")
+CHECKED_IN = 1
+
+# manifests are shared by every scanner at the door, the delta sync covers their age
+MANIFEST_CACHE_TTL = 60
+# a cursor trails the clock, so rows written by transactions still in flight are not skipped
+CURSOR_LAG_SECONDS = 30
+# past this many changes a device is better off downloading the manifest again
+MAX_DELTA_ROWS = 5000
+
+
+@frappe.whitelist()
+def get_scanner_manifest(event: str | int, track: str | None = None):
+	"""Download the binary manifest of an event's valid tickets and their check-in state."""
+	frappe.has_permission("Event Check In", "create", throw=True)
+	manifest = frappe.cache.get_value(
+		_manifest_cache_key(event, track),
+		generator=lambda: build_manifest(event, track),
+		expires_in_sec=MANIFEST_CACHE_TTL,
+	)
+	return Response(
+		manifest,
+		mimetype="application/octet-stream",
+		headers={"Content-Disposition": f'attachment; filename="event-{event}-manifest.bin"'},
+	)
+
+
+def build_manifest(event: str | int, track: str | None = None) -> bytes:
+	cursor = _get_cursor()
+	tickets = frappe.get_all(
+		"Event Ticket",
+		filters={"event": event, "docstatus": 1},
+		fields=["name", "ticket_type", "token_version"],
+	)
+	checked_in = get_checked_in_set(event, track)
+
+	names = sorted(ticket.name.encode() for ticket in tickets)
+	name_width = max((len(name) for name in names), default=0)
+	record = struct.Struct(f"<{name_width}sIIB")
+	tickets_by_name = {ticket.name.encode(): ticket for ticket in tickets}
+
+	ticket_types = dict(
+		frappe.get_all("Event Ticket Type", filters={"event": event}, fields=["name", "title"], as_list=True)
+	)
+	trailer = json.dumps({str(name): title for name, title in ticket_types.items()}).encode()
+
+	parts = [HEADER.pack(MANIFEST_MAGIC, MANIFEST_VERSION, name_width, len(names), cursor.encode())]
+	for name in names:
+		ticket = tickets_by_name[name]
+		parts.append(
+			record.pack(
+				name,
+				int(ticket.ticket_type),
+				ticket.token_version,
+				CHECKED_IN if ticket.name in checked_in else 0,
+			)
+		)
+	parts.append(struct.pack("<I", len(trailer)))
+	parts.append(trailer)
+	return b"".join(parts)
+
+
+@frappe.whitelist()
+def get_scanner_changes(event: str | int, cursor: str, track: str | None = None) -> dict:
+	"""Changes since `cursor`: new, transferred and cancelled tickets, and check-ins from other devices.
+
+	Rows may repeat across consecutive syncs, applying them is idempotent.
+	"""
+	frappe.has_permission("Event Check In", "create", throw=True)
+
+	next_cursor = _get_cursor()
+	tickets = frappe.get_all(
+		"Event Ticket",
+		filters={"event": event, "docstatus": ("!=", 0), "modified": (">=", cursor)},
+		fields=["name", "ticket_type", "token_version", "docstatus"],
+		limit=MAX_DELTA_ROWS + 1,
+	)
+	checked_in = _get_checked_in_since(event, track, cursor, limit=MAX_DELTA_ROWS + 1)
+	if len(tickets) > MAX_DELTA_ROWS or len(checked_in) > MAX_DELTA_ROWS:
+		return {"full_sync_required": True}
+
+	return {
+		"full_sync_required": False,
+		"cursor": next_cursor,
+		# columnar, to keep large deltas compact
+		"tickets": {
+			"name": [ticket.name for ticket in tickets],
+			"ticket_type": [ticket.ticket_type for ticket in tickets],
+			"token_version": [ticket.token_version for ticket in tickets],
+			"cancelled": [ticket.docstatus == 2 for ticket in tickets],
+		},
+		"check_ins": list(checked_in),
+	}
+
+
+@frappe.whitelist()
+def upload_offline_check_ins(event: str | int, check_ins: list[dict], track: str | None = None) -> list[dict]:
+	"""Record check-ins made offline, each a {scan, scanned_at}.
+
+	The check-in already on record wins over an uploaded one, and within an upload the
+	earliest scan of a ticket wins. Every other scan of the ticket is reported as a
+	duplicate, so it can be followed up at the door.
+	"""
+	frappe.has_permission("Event Check In", "create", throw=True)
+
+	now = now_datetime()
+	scanned_at = [min(get_datetime(check_in["scanned_at"]), now) for check_in in check_ins]
+	return record_check_ins(event, [check_in["scan"] for check_in in check_ins], track, scanned_at)
+
+
+def _get_checked_in_since(event: str | int, track: str | None, since: str, limit: int) -> set[str]:
+	return set(
+		frappe.get_all(
+			"Event Check In",
+			filters={
+				"event": event,
+				"track": track or ("is", "not set"),
+				"docstatus": 1,
+				"modified": (">=", since),
+			},
+			pluck="ticket",
+			limit=limit,
+		)
+	)
+
+
+def _get_cursor() -> str:
+	return add_to_date(now_datetime(), seconds=-CURSOR_LAG_SECONDS).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _manifest_cache_key(event: str | int, track: str | None = None) -> str:
+	return f"events:scanner_manifest:{event}:{track or ''}"
@@ -0,0 +1,19 @@
+import frappe
+from frappe.query_builder.functions import Count
+
+
+def execute():
+	"""Populate the stored `tickets_sold` counter from existing submitted tickets."""
+	Ticket = frappe.qb.DocType("Event Ticket")
+	sold_by_ticket_type = (
+		frappe.qb.from_(Ticket)
+		.select(Ticket.ticket_type, Count("*").as_("tickets_sold"))
+		.where(Ticket.docstatus == 1)
+		.groupby(Ticket.ticket_type)
+		.run(as_dict=True)
+	)
+
+	for row in sold_by_ticket_type:
+		frappe.db.set_value(
+			"Event Ticket Type", row.ticket_type, "tickets_sold", row.tickets_sold, update_modified=False
+		)
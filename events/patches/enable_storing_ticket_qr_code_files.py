@@ -0,0 +1,10 @@
+import frappe
+
+
+def execute():
+	"""Keep saving ticket QR codes as files on sites whose settings predate the option."""
+	is_set = frappe.db.exists(
+		"Singles", {"doctype": "Event Management Settings", "field": "store_ticket_qr_code_files"}
+	)
+	if not is_set:
+		frappe.db.set_single_value("Event Management Settings", "store_ticket_qr_code_files", 1)
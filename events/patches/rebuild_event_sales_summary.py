@@ -0,0 +1,6 @@
+from events.ticketing.doctype.event_sales_summary.event_sales_summary import rebuild_sales_summary
+
+
+def execute():
+	"""Populate Event Sales Summary from existing bookings and tickets."""
+	rebuild_sales_summary()
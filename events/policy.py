@@ -0,0 +1,54 @@
+"""Date-window policies: what an attendee may still do as an event approaches.
+
+Each window closes a number of days before the event starts, set in Event
+Management Settings. All of an event's capabilities are computed in one go and
+cached until midnight, when the windows may close, or until the event or the
+settings change.
+"""
+
+from datetime import datetime, time, timedelta
+
+import frappe
+from frappe.utils import days_diff, now_datetime, today
+
+from events.cache import EVENT_POLICY_CACHE_KEY
+
+# capability -> the Event Management Settings field with its cutoff in days
+POLICY_WINDOWS = {
+	"can_transfer_ticket": "allow_transfer_ticket_before_event_start_days",
+	"can_change_add_ons": "allow_add_ons_change_before_event_start_days",
+	"can_request_cancellation": "allow_ticket_cancellation_request_before_event_start_days",
+}
+DEFAULT_CUTOFF_DAYS = 7
+
+
+def get_event_policy(event: str | int) -> frappe._dict:
+	"""Returns every capability of POLICY_WINDOWS for the event, as booleans."""
+	key = f"{EVENT_POLICY_CACHE_KEY}:{event}"
+	policy = frappe.cache.get_value(key)
+	if not policy or policy["date"] != today():
+		policy = compute_event_policy(event)
+		frappe.cache.set_value(key, policy, expires_in_sec=_seconds_until_midnight())
+
+	return frappe._dict({capability: policy[capability] for capability in POLICY_WINDOWS})
+
+
+def compute_event_policy(event: str | int) -> dict:
+	start_date = frappe.db.get_value("FE Event", event, "start_date")
+	days_until_event = days_diff(start_date, today()) if start_date else None
+	settings = frappe.get_cached_doc("Event Management Settings")
+
+	policy = {"date": today()}
+	for capability, cutoff_field in POLICY_WINDOWS.items():
+		cutoff_days = settings.get(cutoff_field)
+		if cutoff_days is None:
+			cutoff_days = DEFAULT_CUTOFF_DAYS
+		# a window is open while more days remain until the event than its cutoff
+		policy[capability] = days_until_event is not None and days_until_event >= cutoff_days
+	return policy
+
+
+def _seconds_until_midnight() -> int:
+	current = now_datetime()
+	midnight = datetime.combine(current.date() + timedelta(days=1), time.min)
+	return max(int((midnight - current).total_seconds()), 1)
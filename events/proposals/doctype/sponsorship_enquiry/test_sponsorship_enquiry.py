@@ -1,9 +1,11 @@
 # Copyright (c) 2025, BWH Studios and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from events.api import get_user_sponsorship_inquiries
+
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
 # Use these module variables to add/remove to/from that list
@@ -17,4 +19,37 @@ class IntegrationTestSponsorshipEnquiry(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def test_inquiry_titles_resolved_in_batch(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		tiers = [
+			frappe.get_doc(
+				{"doctype": "Sponsorship Tier", "event": test_event.name, "title": f"Tier {i}", "price": 100}
+			).insert()
+			for i in range(3)
+		]
+		for i in range(12):
+			frappe.get_doc(
+				{
+					"doctype": "Sponsorship Enquiry",
+					"event": test_event.name,
+					"company_name": f"Company {i}",
+					"company_logo": "/files/logo.png",
+					"tier": tiers[i % 3].name if i % 4 else None,
+				}
+			).insert()
+
+		frappe.local.cache = {}
+		# the enquiries, the event and tier titles, and the sponsors
+		with self.assertQueryCount(4):
+			inquiries = get_user_sponsorship_inquiries()
+
+		inquiries = [inquiry for inquiry in inquiries if inquiry.event == test_event.name]
+		self.assertEqual(len(inquiries), 12)
+		for inquiry in inquiries:
+			self.assertEqual(inquiry.event_title, test_event.title)
+			if inquiry.tier:
+				self.assertEqual(
+					inquiry.tier_title, frappe.db.get_value("Sponsorship Tier", inquiry.tier, "title")
+				)
+			else:
+				self.assertEqual(inquiry.tier_title, "")
@@ -0,0 +1,205 @@
+"""QR code rendering for tickets.
+
+Every render is keyed by a hash of its input and output mode, so re-rendering the
+same ticket (email resends, print formats, dashboard views) is served from Redis.
+Bulk renders fan out over a process pool.
+
+Tickets encode a signed token (see `events.ticket_tokens`). Unless "Save Ticket
+QR Codes as Files" is enabled, they do not get a File attachment; their QR code
+is served by `get_ticket_qr_code` instead.
+"""
+
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import frappe
+from frappe import _
+from werkzeug.wrappers import Response
+
+from events.ticket_tokens import decode_ticket_token, get_ticket_token, is_token_revoked
+
+QR_MODES = {
+	# the original look: styled bars, high error correction
+	"Styled PNG": "styled",
+	"PNG": "png",
+	"Compact PNG": "compact",
+	"SVG": "svg",
+}
+DEFAULT_QR_MODE = "styled"
+
+# bump when a renderer changes its output, so stale cache entries are never served
+RENDERER_VERSION = 1
+CACHE_TTL = 7 * 24 * 60 * 60
+
+# below this many missing renders, forking workers costs more than it saves
+PROCESS_POOL_THRESHOLD = 16
+MAX_POOL_WORKERS = 4
+
+TICKET_QR_CODE_ENDPOINT = "/api/method/events.qr.get_ticket_qr_code"
+# a ticket's QR code never changes, so browsers and mail proxies may keep it for long
+HTTP_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+def get_qr_mode() -> str:
+	qr_code_format = frappe.db.get_single_value("Event Management Settings", "qr_code_format")
+	return QR_MODES.get(qr_code_format, DEFAULT_QR_MODE)
+
+
+def should_store_qr_code_files() -> bool:
+	return bool(frappe.db.get_single_value("Event Management Settings", "store_ticket_qr_code_files"))
+
+
+def get_ticket_qr_code_url(ticket) -> str:
+	"""URL of the on-demand QR code for a ticket doc or a dict with the fields its token is made of."""
+	return f"{TICKET_QR_CODE_ENDPOINT}?token={get_ticket_token(ticket)}"
+
+
+def get_file_extension(mode: str) -> str:
+	return "svg" if mode == "svg" else "png"
+
+
+def get_content_type(mode: str) -> str:
+	return "image/svg+xml" if mode == "svg" else "image/png"
+
+
+def render_qr(data: str, mode: str = DEFAULT_QR_MODE) -> bytes:
+	"""Returns the QR code image for `data`, rendering it only on a cache miss."""
+	key = _cache_key(data, mode)
+	content = frappe.cache.get(key)
+	if content is None:
+		content = _render(data, mode)
+		frappe.cache.set(key, content, ex=CACHE_TTL)
+	return content
+
+
+def render_qr_bulk(items: list[str], mode: str = DEFAULT_QR_MODE) -> dict[str, bytes]:
+	"""Returns {data: image} for every item, rendering cache misses over a process pool."""
+	items = list(dict.fromkeys(items))
+	if not items:
+		return {}
+
+	keys = [_cache_key(data, mode) for data in items]
+	images = {data: content for data, content in zip(items, frappe.cache.mget(keys), strict=True) if content}
+
+	missing = [data for data in items if data not in images]
+	if not missing:
+		return images
+
+	if len(missing) >= PROCESS_POOL_THRESHOLD:
+		with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, MAX_POOL_WORKERS)) as pool:
+			rendered = list(pool.map(_render, missing, [mode] * len(missing), chunksize=4))
+	else:
+		rendered = [_render(data, mode) for data in missing]
+
+	pipeline = frappe.cache.pipeline()
+	for data, content in zip(missing, rendered, strict=True):
+		images[data] = content
+		pipeline.set(_cache_key(data, mode), content, ex=CACHE_TTL)
+	pipeline.execute()
+
+	return images
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_ticket_qr_code(token: str):
+	"""Serve the QR code image of a signed ticket token, rendered on demand.
+
+	Guests are allowed so that mail clients and the PDF renderer can fetch it. Only
+	unrevoked tokens are served, so a transferred ticket's old link stops working.
+	"""
+	claims = decode_ticket_token(token)
+	if not claims or is_token_revoked(claims):
+		frappe.throw(_("Ticket not found"), frappe.DoesNotExistError)
+
+	mode = get_qr_mode()
+	content, etag = _get_ticket_qr_code(frappe.local.site, token, mode)
+
+	headers = {"Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}", "ETag": f'"{etag}"'}
+	if frappe.request and etag in frappe.request.if_none_match:
+		return Response(status=304, headers=headers)
+
+	return Response(content, mimetype=get_content_type(mode), headers=headers)
+
+
+@lru_cache(maxsize=512)
+def _get_ticket_qr_code(site: str, token: str, mode: str) -> tuple[bytes, str]:
+	"""In-process LRU over the Redis cache; keyed by site as workers may serve several."""
+	etag = hashlib.sha256(f"{RENDERER_VERSION}:{mode}:{token}".encode()).hexdigest()[:32]
+	return render_qr(token, mode), etag
+
+
+def purge_ticket_qr_code_files(batch_size: int = 500):
+	"""Delete the QR code Files of existing tickets and point them at the on-demand endpoint.
+
+	Runs in the background when "Save Ticket QR Codes as Files" is turned off, or with:
+
+	bench --site <site> execute events.qr.purge_ticket_qr_code_files
+	"""
+	while files := frappe.get_all(
+		"File",
+		filters={"attached_to_doctype": "Event Ticket", "attached_to_field": "qr_code"},
+		fields=["name", "attached_to_name"],
+		limit=batch_size,
+	):
+		tickets = frappe.get_all(
+			"Event Ticket",
+			filters={"name": ("in", [file.attached_to_name for file in files])},
+			fields=["name", "event", "ticket_type", "token_version"],
+		)
+		for ticket in tickets:
+			frappe.db.set_value(
+				"Event Ticket", ticket.name, "qr_code", get_ticket_qr_code_url(ticket), update_modified=False
+			)
+
+		for file in files:
+			frappe.delete_doc("File", file.name, ignore_permissions=True, delete_permanently=True)
+
+		# keep each batch small, a site can have hundreds of thousands of these
+		frappe.db.commit()
+
+
+def _cache_key(data: str, mode: str) -> str:
+	digest = hashlib.sha256(f"{RENDERER_VERSION}:{mode}:{data}".encode()).hexdigest()
+	return frappe.cache.make_key(f"events:qr:{digest}")
+
+
+def _render(data: str, mode: str) -> bytes:
+	"""Pure rendering, no frappe state, so it can run in a worker process."""
+	import qrcode
+
+	if mode not in QR_MODES.values():
+		raise ValueError(f"Unknown QR mode: {mode}")
+
+	if mode == "styled":
+		from qrcode.image.styledpil import StyledPilImage
+		from qrcode.image.styles.moduledrawers.pil import HorizontalBarsDrawer
+
+		qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H, box_size=10, border=4)
+		qr.add_data(data)
+		qr.make(fit=True)
+		img = qr.make_image(image_factory=StyledPilImage, module_drawer=HorizontalBarsDrawer())
+		return _to_png(img)
+
+	if mode == "svg":
+		from qrcode.image.svg import SvgPathImage
+
+		qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=4)
+		qr.add_data(data)
+		qr.make(fit=True)
+		return qr.make_image(image_factory=SvgPathImage).to_string()
+
+	# plain PIL images are 1-bit, which keeps the PNGs small
+	box_size, border = (10, 4) if mode == "png" else (4, 2)
+	qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=box_size, border=border)
+	qr.add_data(data)
+	qr.make(fit=True)
+	return _to_png(qr.make_image(), optimize=mode == "compact")
+
+
+def _to_png(img, optimize: bool = False) -> bytes:
+	output = io.BytesIO()
+	img.save(output, format="PNG", optimize=optimize)
+	return output.getvalue()
@@ -0,0 +1,100 @@
+"""Result cache for the app's script reports.
+
+Results are cached by report and normalised filters for REPORT_CACHE_TTL, and
+dropped early when an event's bookings, tickets or check-ins change. Rather
+than deleting keys, each event has a version number that is part of its cache
+keys: invalidating is a single INCR, and stale entries simply expire.
+Reports over all events use a global version, bumped along with an event's
+unless the change cannot affect them (check-ins are not in any all-events report).
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+import frappe
+
+REPORT_CACHE_TTL = 5 * 60
+STATS_KEY = "events:report_cache_stats"
+GLOBAL_VERSION = "*"
+
+
+def cached_report(report_name: str, ttl: int = REPORT_CACHE_TTL):
+	"""Cache a report's `execute(filters)` per event (its `event` filter) and filters."""
+
+	def decorator(execute):
+		@wraps(execute)
+		def wrapper(filters: dict | None = None):
+			key = get_report_cache_key(report_name, filters)
+			result = frappe.cache.get_value(key)
+			_record_stat(report_name, hit=result is not None)
+			if result is None:
+				result = execute(filters)
+				frappe.cache.set_value(key, result, expires_in_sec=ttl)
+			return result
+
+		return wrapper
+
+	return decorator
+
+
+def get_report_cache_key(report_name: str, filters: dict | None) -> str:
+	filters = {key: str(value) for key, value in (filters or {}).items() if value not in (None, "", [], 0)}
+	event = filters.get("event") or GLOBAL_VERSION
+	digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+	return f"events:report_cache:{report_name}:{event}:{_get_version(event)}:{digest}"
+
+
+def invalidate_report_cache(event: str | int, include_global: bool = True) -> None:
+	"""Drop cached report results of an event, and unless `include_global` is off, of reports over all events.
+
+	Bumped again once the transaction commits, in case a report run in the meantime
+	cached the data as it was before.
+	"""
+
+	def bump():
+		pipeline = frappe.cache.pipeline()
+		pipeline.incr(frappe.cache.make_key(_version_key(event)))
+		if include_global:
+			pipeline.incr(frappe.cache.make_key(_version_key(GLOBAL_VERSION)))
+		pipeline.execute()
+
+	bump()
+	frappe.db.after_commit.add(bump)
+
+
+@frappe.whitelist()
+def get_report_cache_stats() -> dict[str, dict]:
+	"""{report: {hits, misses, hit_rate}} since the stats were last reset."""
+	frappe.only_for(("System Manager", "Event Manager"))
+	counts = frappe.cache.pipeline().hgetall(frappe.cache.make_key(STATS_KEY)).execute()[0]
+
+	stats = {}
+	for field, count in counts.items():
+		report_name, _sep, kind = frappe.safe_decode(field).rpartition(":")
+		stats.setdefault(report_name, {"hits": 0, "misses": 0})[kind] = int(count)
+
+	for report_stats in stats.values():
+		total = report_stats["hits"] + report_stats["misses"]
+		report_stats["hit_rate"] = round(report_stats["hits"] / total, 3) if total else 0
+	return stats
+
+
+@frappe.whitelist(methods=["POST"])
+def reset_report_cache_stats() -> None:
+	frappe.only_for(("System Manager", "Event Manager"))
+	frappe.cache.delete_value(STATS_KEY)
+
+
+def _record_stat(report_name: str, hit: bool) -> None:
+	pipeline = frappe.cache.pipeline()
+	pipeline.hincrby(frappe.cache.make_key(STATS_KEY), f"{report_name}:{'hits' if hit else 'misses'}", 1)
+	pipeline.execute()
+
+
+def _get_version(event: str) -> int:
+	return int(frappe.cache.get(frappe.cache.make_key(_version_key(event))) or 0)
+
+
+def _version_key(event: str | int) -> str:
+	return f"events:report_cache_version:{event}"
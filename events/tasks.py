@@ -1,6 +1,11 @@
 import frappe
 from frappe.utils import today
 
+from events.cache import clear_event_booking_data_cache
+from events.check_in import flush_check_in_queue
+from events.check_in_stats import publish_pending_check_in_counters
+from events.ticketing.doctype.ticket_hold.ticket_hold import release_expired_holds
+
 
 def unpublish_ticket_types_after_last_date():
 	frappe.db.set_value(
@@ -9,4 +14,17 @@ def unpublish_ticket_types_after_last_date():
 		"is_published",
 		False,
 	)
+	clear_event_booking_data_cache()
+	frappe.db.commit()
+
+
+def release_expired_ticket_holds():
+	release_expired_holds()
+	frappe.db.commit()
+
+
+def flush_check_ins():
+	# check-ins are normally flushed right after they are queued, this picks up any stragglers
+	flush_check_in_queue()
 	frappe.db.commit()
+	publish_pending_check_in_counters()
@@ -0,0 +1,133 @@
+"""Signed ticket tokens.
+
+Ticket QR codes encode a compact token instead of the bare ticket name:
+
+	t1.<ticket>.<event>.<ticket type>.<version>.<signature>
+
+The signature is a truncated HMAC-SHA256 over the rest of the token with a
+per-site secret, so a scan can be checked for authenticity and for the right
+event without reading the ticket from the database.
+
+Transferring or cancelling a ticket bumps its `token_version`. The current
+version of every ticket that has been bumped is kept in a per-event Redis
+hash, so older tokens are rejected with a single hash lookup. Cancelled
+tickets are recorded with a version no token can reach.
+"""
+
+import base64
+import hashlib
+import hmac
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+TOKEN_PREFIX = "t1"
+SIGNATURE_BYTES = 12
+
+# recorded for cancelled tickets, above any version a token is issued with
+CANCELLED_VERSION = 2**31
+
+# marks a revocation hash as loaded, an absent hash (e.g. after a Redis flush) is rebuilt from the database
+BUILT_MARKER = "__built__"
+
+
+def get_ticket_token(ticket) -> str:
+	"""Returns the signed token for a ticket doc or a dict with its name, event, ticket_type and token_version."""
+	payload = ".".join(
+		(
+			TOKEN_PREFIX,
+			str(ticket.name),
+			str(ticket.event),
+			str(ticket.ticket_type),
+			str(cint(ticket.token_version)),
+		)
+	)
+	return f"{payload}.{_sign(payload)}"
+
+
+def is_ticket_token(data: str) -> bool:
+	return data.startswith(f"{TOKEN_PREFIX}.")
+
+
+def decode_ticket_token(token: str) -> frappe._dict | None:
+	"""Returns the claims of a correctly signed token, or None. Does not check revocation."""
+	payload, _sep, signature = token.rpartition(".")
+	parts = payload.split(".")
+	if len(parts) != 5 or parts[0] != TOKEN_PREFIX:
+		return None
+
+	if not hmac.compare_digest(signature, _sign(payload)):
+		return None
+
+	_prefix, ticket, event, ticket_type, version = parts
+	return frappe._dict(ticket=ticket, event=event, ticket_type=ticket_type, version=cint(version))
+
+
+def is_token_revoked(claims: frappe._dict) -> bool:
+	current_version = frappe.cache.hget(_revocation_key(claims.event), claims.ticket)
+	if current_version is None and not frappe.cache.hexists(_revocation_key(claims.event), BUILT_MARKER):
+		rebuild_revocation_cache(claims.event)
+		current_version = frappe.cache.hget(_revocation_key(claims.event), claims.ticket)
+
+	return current_version is not None and claims.version < current_version
+
+
+def verify_ticket_token(token: str, event: str | int) -> frappe._dict:
+	"""Returns the claims of a valid, unrevoked token for `event`, throws otherwise."""
+	claims = decode_ticket_token(token)
+	if not claims:
+		frappe.throw(_("Invalid ticket"), title=_("Invalid Ticket"))
+
+	if claims.event != str(event):
+		frappe.throw(_("This ticket is for a different event"), title=_("Wrong Event"))
+
+	if is_token_revoked(claims):
+		frappe.throw(_("This ticket has been transferred or cancelled"), title=_("Revoked Ticket"))
+
+	return claims
+
+
+def revoke_previous_tokens(ticket) -> None:
+	"""Record the ticket's current version, so tokens with an older one (or any, once cancelled) are rejected."""
+	if not frappe.cache.hexists(_revocation_key(ticket.event), BUILT_MARKER):
+		rebuild_revocation_cache(ticket.event)
+	frappe.cache.hset(_revocation_key(ticket.event), ticket.name, _get_current_version(ticket))
+
+
+def rebuild_revocation_cache(event: str | int) -> None:
+	key = _revocation_key(event)
+	frappe.cache.delete_value(key)
+
+	revoked = frappe.get_all(
+		"Event Ticket",
+		filters={"event": event},
+		or_filters={"token_version": (">", 1), "docstatus": 2},
+		fields=["name", "token_version", "docstatus"],
+	)
+	for ticket in revoked:
+		frappe.cache.hset(key, ticket.name, _get_current_version(ticket))
+	frappe.cache.hset(key, BUILT_MARKER, 1)
+
+
+def _get_current_version(ticket) -> int:
+	return CANCELLED_VERSION if ticket.docstatus == 2 else cint(ticket.token_version)
+
+
+def _revocation_key(event: str | int) -> str:
+	return f"events:ticket_token_versions:{event}"
+
+
+def _sign(payload: str) -> str:
+	digest = hmac.new(_get_secret(), payload.encode(), hashlib.sha256).digest()[:SIGNATURE_BYTES]
+	return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def _get_secret() -> bytes:
+	"""`ticket_signing_secret` from site config, or one derived from the site's encryption key."""
+	if secret := frappe.conf.get("ticket_signing_secret"):
+		return secret.encode()
+
+	from frappe.utils.password import get_encryption_key
+
+	return hashlib.sha256(f"events-ticket-token:{get_encryption_key()}".encode()).digest()
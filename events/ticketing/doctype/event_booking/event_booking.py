@@ -5,8 +5,58 @@ import json
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import now
 
+from events.cache import clear_add_on_demand_cache
+from events.check_in import add_valid_tickets
 from events.payments import mark_payment_as_received
+from events.qr import get_qr_mode, render_qr_bulk, should_store_qr_code_files
+from events.report_cache import invalidate_report_cache
+from events.ticket_tokens import get_ticket_token
+from events.ticketing.doctype.event_sales_rollup.event_sales_rollup import append_booking_to_rollup
+from events.ticketing.doctype.event_sales_summary.event_sales_summary import (
+	update_sales_summary,
+	update_sales_summary_for_tickets,
+)
+from events.ticketing.doctype.event_ticket_type.event_ticket_type import (
+	get_ticket_type_availability,
+	increment_tickets_sold,
+)
+from events.ticketing.doctype.ticket_hold.ticket_hold import release_holds_for_booking
+
+TICKET_JOB_CHUNK_SIZE = 20
+
+TICKET_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"docstatus",
+	"event",
+	"booking",
+	"ticket_type",
+	"attendee_name",
+	"attendee_email",
+	"token_version",
+	"coupon_used",
+)
+TICKET_ADD_ON_VALUE_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"docstatus",
+	"parent",
+	"parenttype",
+	"parentfield",
+	"idx",
+	"add_on",
+	"value",
+	"price",
+	"currency",
+)
 
 
 class EventBooking(Document):
@@ -29,6 +79,8 @@ class EventBooking(Document):
 		net_amount: DF.Currency
 		tax_amount: DF.Currency
 		tax_percentage: DF.Percent
+		ticket_generation_status: DF.Literal["", "Queued", "In Progress", "Completed", "Failed"]
+		tickets_processed: DF.Int
 		total_amount: DF.Currency
 		user: DF.Link
 	# end: auto-generated types
@@ -72,14 +124,16 @@ class EventBooking(Document):
 			num_tickets_by_type[attendee.ticket_type] += 1
 
 		for ticket_type, num_tickets in num_tickets_by_type.items():
-			ticket_type_doc = frappe.get_cached_doc("Event Ticket Type", ticket_type)
-			if not ticket_type_doc.is_published:
+			is_published, remaining_tickets = get_ticket_type_availability(
+				ticket_type, exclude_booking=self.name
+			)
+			if not is_published:
 				frappe.throw(frappe._(f"{ticket_type} tickets no longer available!"))
 
-			if not ticket_type_doc.are_tickets_available(num_tickets):
+			if remaining_tickets != -1 and remaining_tickets < num_tickets:
 				frappe.throw(
 					frappe._(
-						f"Only {ticket_type_doc.remaining_tickets} tickets available for {ticket_type}, you are trying to book {num_tickets}!"
+						f"Only {remaining_tickets} tickets available for {ticket_type}, you are trying to book {num_tickets}!"
 					)
 				)
 
@@ -93,23 +147,127 @@ class EventBooking(Document):
 			if not attendee.currency:
 				attendee.currency = currency
 
+	def before_submit(self):
+		self.validate_coupon_usage()
+
+	def validate_coupon_usage(self):
+		"""Check every coupon in the booking has enough tickets left for its attendees.
+
+		Tickets are bulk inserted on submit and skip Event Ticket's own check, so it is done here once per booking.
+		"""
+		num_tickets_by_coupon = {}
+		for attendee in self.attendees:
+			if attendee.coupon_used:
+				num_tickets_by_coupon.setdefault(attendee.coupon_used, 0)
+				num_tickets_by_coupon[attendee.coupon_used] += 1
+
+		for coupon_name, num_tickets in num_tickets_by_coupon.items():
+			coupon = frappe.get_cached_doc("Bulk Ticket Coupon", coupon_name)
+			if coupon.number_of_granted_tickets - coupon.number_of_claimed_tickets < num_tickets:
+				frappe.throw(frappe._("Coupon has been already used up maximum number of times!"))
+
 	def on_submit(self):
 		self.generate_tickets()
+		update_sales_summary(self.event, self.currency, sales=self.total_amount)
+		append_booking_to_rollup(self)
+		invalidate_report_cache(self.event)
+		release_holds_for_booking(self.name)
+
+	def on_cancel(self):
+		update_sales_summary(self.event, self.currency, sales=-self.total_amount)
+		append_booking_to_rollup(self, sign=-1)
+		invalidate_report_cache(self.event)
+		release_holds_for_booking(self.name)
+
+	def on_trash(self):
+		release_holds_for_booking(self.name)
 
 	def generate_tickets(self):
+		"""Create every attendee's ticket in bulk, then fan out QR codes and emails to background jobs.
+
+		Tickets are written directly rather than through the Event Ticket controller, so
+		large bookings do not keep the payment gateway callback waiting.
+		"""
+		num_tickets_by_type = {}
 		for attendee in self.attendees:
-			ticket = frappe.new_doc("Event Ticket")
-			ticket.event = self.event
-			ticket.booking = self.name
-			ticket.ticket_type = attendee.ticket_type
-			ticket.attendee_name = attendee.full_name
-			ticket.attendee_email = attendee.email
+			num_tickets_by_type.setdefault(attendee.ticket_type, 0)
+			num_tickets_by_type[attendee.ticket_type] += 1
 
-			if attendee.add_ons:
-				add_ons_list = frappe.get_cached_doc("Attendee Ticket Add-on", attendee.add_ons).add_ons
-				ticket.add_ons = add_ons_list
-			ticket.flags.ignore_permissions = 1
-			ticket.insert().submit()
+		# lock in a stable order so concurrent multi-type bookings cannot deadlock
+		for ticket_type in sorted(num_tickets_by_type, key=str):
+			increment_tickets_sold(ticket_type, num_tickets_by_type[ticket_type], exclude_booking=self.name)
+
+		timestamp = now()
+		user = frappe.session.user
+		tickets, add_on_values = [], []
+		num_sold_by_type = {
+			ticket_type: [num_tickets, 0] for ticket_type, num_tickets in num_tickets_by_type.items()
+		}
+		for attendee in self.attendees:
+			ticket_name = frappe.generate_hash(length=10)
+			tickets.append(
+				(
+					ticket_name,
+					timestamp,
+					timestamp,
+					user,
+					user,
+					1,
+					self.event,
+					self.name,
+					attendee.ticket_type,
+					attendee.full_name,
+					attendee.email,
+					1,
+					attendee.coupon_used,
+				)
+			)
+
+			if not attendee.add_ons:
+				continue
+
+			add_ons = frappe.get_cached_doc("Attendee Ticket Add-on", attendee.add_ons).add_ons
+			num_sold_by_type[attendee.ticket_type][1] += len(add_ons)
+			for idx, add_on in enumerate(add_ons, start=1):
+				add_on_values.append(
+					(
+						frappe.generate_hash(length=10),
+						timestamp,
+						timestamp,
+						user,
+						user,
+						1,
+						ticket_name,
+						"Event Ticket",
+						"add_ons",
+						idx,
+						add_on.add_on,
+						add_on.value,
+						add_on.price,
+						add_on.currency,
+					)
+				)
+
+		frappe.db.bulk_insert("Event Ticket", TICKET_FIELDS, tickets)
+		add_valid_tickets(self.event, {ticket[0]: ticket[8] for ticket in tickets})
+		update_sales_summary_for_tickets(self.event, num_sold_by_type)
+		if add_on_values:
+			clear_add_on_demand_cache(self.event)
+			frappe.db.bulk_insert("Ticket Add-on Value", TICKET_ADD_ON_VALUE_FIELDS, add_on_values)
+
+		self.db_set({"ticket_generation_status": "Queued", "tickets_processed": 0}, update_modified=False)
+
+		ticket_names = [ticket[0] for ticket in tickets]
+		for i in range(0, len(ticket_names), TICKET_JOB_CHUNK_SIZE):
+			frappe.enqueue(
+				process_booking_tickets,
+				queue="short",
+				booking=self.name,
+				tickets=ticket_names[i : i + TICKET_JOB_CHUNK_SIZE],
+				total_tickets=len(ticket_names),
+				enqueue_after_commit=True,
+				now=frappe.in_test,
+			)
 
 	def on_payment_authorized(self, payment_status: str):
 		if payment_status in ("Authorized", "Completed"):
@@ -124,3 +282,67 @@ class EventBooking(Document):
 		except Exception:
 			frappe.log_error(frappe.get_traceback(), _("Booking Failed"))
 			frappe.throw(frappe._("Booking Failed! Please contact support."))
+
+
+def on_doctype_update():
+	# the dashboard pages through a user's bookings by (creation, name)
+	frappe.db.add_index("Event Booking", ["user", "creation", "name"])
+
+
+def process_booking_tickets(booking: str, tickets: list[str], total_tickets: int):
+	"""Background job: generate QR codes and send ticket emails for a chunk of a booking's tickets."""
+	frappe.db.set_value(
+		"Event Booking",
+		{"name": booking, "ticket_generation_status": "Queued"},
+		"ticket_generation_status",
+		"In Progress",
+		update_modified=False,
+	)
+
+	qr_mode = get_qr_mode()
+	if should_store_qr_code_files():
+		# render the whole chunk up front (over a process pool), so each ticket below hits the cache
+		ticket_rows = frappe.get_all(
+			"Event Ticket",
+			filters={"name": ("in", tickets)},
+			fields=["name", "event", "ticket_type", "token_version"],
+		)
+		render_qr_bulk([get_ticket_token(row) for row in ticket_rows], qr_mode)
+
+	failed = False
+	for ticket_id in tickets:
+		try:
+			ticket = frappe.get_doc("Event Ticket", ticket_id)
+			ticket.generate_qr_code(qr_mode)
+			ticket.db_set("qr_code", ticket.qr_code, update_modified=False)
+			ticket.send_ticket_email()
+		except Exception:
+			failed = True
+			frappe.log_error(frappe.get_traceback(), _("Ticket generation failed for {0}").format(ticket_id))
+
+	update_ticket_generation_progress(booking, len(tickets), total_tickets, failed)
+
+
+def update_ticket_generation_progress(booking: str, num_processed: int, total_tickets: int, failed: bool):
+	Booking = frappe.qb.DocType("Event Booking")
+	frappe.qb.update(Booking).set(Booking.tickets_processed, Booking.tickets_processed + num_processed).where(
+		Booking.name == booking
+	).run()
+	# the dashboard reads the booking through get_cached_doc
+	frappe.clear_document_cache("Event Booking", booking)
+
+	if failed:
+		status = "Failed"
+	elif frappe.db.get_value("Event Booking", booking, "tickets_processed") >= total_tickets:
+		status = "Completed"
+	else:
+		return
+
+	# a failure in any chunk sticks, even if a later chunk finishes cleanly
+	frappe.db.set_value(
+		"Event Booking",
+		{"name": booking, "ticket_generation_status": ("!=", "Failed")},
+		"ticket_generation_status",
+		status,
+		update_modified=False,
+	)
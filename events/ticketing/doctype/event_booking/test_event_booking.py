@@ -4,6 +4,10 @@
 import frappe
 from frappe.tests import IntegrationTestCase
 
+from events.api import get_booking_details, get_my_bookings, get_my_tickets
+from events.qr import get_ticket_qr_code, get_ticket_qr_code_url
+from events.ticket_tokens import get_ticket_token
+
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
 # Use these module variables to add/remove to/from that list
@@ -208,3 +212,252 @@ class IntegrationTestEventBooking(IntegrationTestCase):
 					],
 				}
 			).insert()
+
+	def test_tickets_generated_in_bulk_on_submit(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_add_on = frappe.get_doc(
+			{
+				"doctype": "Ticket Add-on",
+				"event": test_event.name,
+				"title": "T-Shirt",
+				"price": TEST_ADD_ON_PRICE,
+			}
+		).insert()
+		test_ticket_type = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "VIP",
+				"price": TEST_VIP_TICKET_TYPE_PRICE,
+				"max_tickets_available": 5,
+			}
+		).insert()
+		test_attendee_add_on = frappe.get_doc(
+			{
+				"doctype": "Attendee Ticket Add-on",
+				"add_ons": [{"add_on": test_ticket_add_on.name, "value": "XL"}],
+			}
+		).insert()
+
+		test_booking = frappe.get_doc(
+			{
+				"doctype": "Event Booking",
+				"event": test_event.name,
+				"user": "Administrator",
+				"attendees": [
+					{
+						"ticket_type": test_ticket_type.name,
+						"full_name": "John",
+						"email": "john@email.com",
+						"add_ons": test_attendee_add_on.name,
+					},
+					{"ticket_type": test_ticket_type.name, "full_name": "Jenny", "email": "jenny@email.com"},
+				],
+			}
+		).insert()
+		test_booking.submit()
+
+		tickets = frappe.get_all(
+			"Event Ticket",
+			filters={"booking": test_booking.name, "docstatus": 1},
+			fields=["name", "attendee_name", "qr_code"],
+			order_by="attendee_name asc",
+		)
+		self.assertEqual([t.attendee_name for t in tickets], ["Jenny", "John"])
+		self.assertTrue(all(t.qr_code for t in tickets))
+
+		john_ticket = frappe.get_doc("Event Ticket", tickets[1].name)
+		self.assertEqual(len(john_ticket.add_ons), 1)
+		self.assertEqual(john_ticket.add_ons[0].value, "XL")
+
+		self.assertEqual(frappe.db.get_value("Event Ticket Type", test_ticket_type.name, "tickets_sold"), 2)
+		test_booking.reload()
+		self.assertEqual(test_booking.ticket_generation_status, "Completed")
+		self.assertEqual(test_booking.tickets_processed, 2)
+
+	def test_coupon_usage_enforced_on_booking_submit(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Sponsor Pass",
+				"price": 0,
+			}
+		).insert()
+		test_coupon = frappe.get_doc(
+			{
+				"doctype": "Bulk Ticket Coupon",
+				"event": test_event.name,
+				"ticket_type": test_ticket_type.name,
+				"number_of_granted_tickets": 2,
+			}
+		).insert()
+
+		def make_booking(*names):
+			return frappe.get_doc(
+				{
+					"doctype": "Event Booking",
+					"event": test_event.name,
+					"user": "Administrator",
+					"attendees": [
+						{
+							"ticket_type": test_ticket_type.name,
+							"full_name": name,
+							"email": f"{name.lower()}@email.com",
+							"coupon_used": test_coupon.name,
+						}
+						for name in names
+					],
+				}
+			).insert()
+
+		# more attendees than the coupon grants
+		with self.assertRaises(frappe.ValidationError):
+			make_booking("John", "Jenny", "Jacob").submit()
+
+		make_booking("John", "Jenny").submit()
+		self.assertEqual(test_coupon.number_of_claimed_tickets, 2)
+
+		with self.assertRaises(frappe.ValidationError):
+			make_booking("Jacob").submit()
+
+	def test_qr_codes_rendered_on_demand_when_not_stored(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+
+		event_settings = frappe.get_doc("Event Management Settings")
+		event_settings.store_ticket_qr_code_files = False
+		event_settings.save()
+		self.addCleanup(
+			frappe.db.set_single_value, "Event Management Settings", "store_ticket_qr_code_files", 1
+		)
+
+		test_ticket_type = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Normal",
+				"price": 0,
+			}
+		).insert()
+		test_booking = frappe.get_doc(
+			{
+				"doctype": "Event Booking",
+				"event": test_event.name,
+				"user": "Administrator",
+				"attendees": [
+					{"ticket_type": test_ticket_type.name, "full_name": "John", "email": "john@email.com"},
+				],
+			}
+		).insert()
+		test_booking.submit()
+
+		ticket = frappe.get_doc("Event Ticket", {"booking": test_booking.name})
+		self.assertEqual(ticket.qr_code, get_ticket_qr_code_url(ticket))
+		self.assertFalse(
+			frappe.db.exists("File", {"attached_to_doctype": "Event Ticket", "attached_to_name": ticket.name})
+		)
+
+		response = get_ticket_qr_code(get_ticket_token(ticket))
+		self.assertEqual(response.mimetype, "image/png")
+		self.assertIn("max-age", response.headers["Cache-Control"])
+
+	def test_booking_details_query_count_does_not_grow_with_tickets(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_add_on = frappe.get_doc(
+			{
+				"doctype": "Ticket Add-on",
+				"event": test_event.name,
+				"title": "T-Shirt",
+				"price": TEST_ADD_ON_PRICE,
+				"user_selects_option": 1,
+				"options": "M\nXL",
+			}
+		).insert()
+		test_ticket_type = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": test_event.name, "title": "Normal", "price": 0}
+		).insert()
+		test_attendee_add_on = frappe.get_doc(
+			{
+				"doctype": "Attendee Ticket Add-on",
+				"add_ons": [{"add_on": test_ticket_add_on.name, "value": "XL"}],
+			}
+		).insert()
+
+		test_booking = frappe.get_doc(
+			{
+				"doctype": "Event Booking",
+				"event": test_event.name,
+				"user": "Administrator",
+				"attendees": [
+					{
+						"ticket_type": test_ticket_type.name,
+						"full_name": f"Attendee {i}",
+						"email": f"attendee{i}@email.com",
+						"add_ons": test_attendee_add_on.name,
+					}
+					for i in range(30)
+				],
+			}
+		).insert()
+		test_booking.submit()
+
+		# warm the document caches
+		get_booking_details(test_booking.name)
+		with self.assertQueryCount(6):
+			details = get_booking_details(test_booking.name)
+
+		self.assertEqual(len(details.tickets), 30)
+		for ticket in details.tickets:
+			self.assertEqual(len(ticket.add_ons), 1)
+			self.assertEqual(ticket.add_ons[0]["value"], "XL")
+			self.assertEqual(ticket.add_ons[0]["options"], ["M", "XL"])
+		self.assertIn("can_transfer_ticket", details.policy)
+		self.assertEqual(details.cancelled_tickets, [])
+
+	def test_my_bookings_and_tickets_paged_by_cursor(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": test_event.name, "title": "Normal", "price": 0}
+		).insert()
+
+		booking_names = []
+		for i in range(5):
+			test_booking = frappe.get_doc(
+				{
+					"doctype": "Event Booking",
+					"event": test_event.name,
+					"user": frappe.session.user,
+					"attendees": [
+						{
+							"ticket_type": test_ticket_type.name,
+							"full_name": f"Attendee {i}-{j}",
+							"email": frappe.session.user,
+						}
+						for j in range(2)
+					],
+				}
+			).insert()
+			test_booking.submit()
+			booking_names.append(test_booking.name)
+
+		def get_all_pages(get_page):
+			rows, cursor = [], None
+			while True:
+				page = get_page(cursor=cursor, page_length=3)
+				self.assertLessEqual(len(page["rows"]), 3)
+				rows.extend(page["rows"])
+				if not page["next_cursor"]:
+					return rows
+				# the cursor makes a round trip through JSON
+				cursor = frappe.as_json(page["next_cursor"])
+
+		bookings = [row for row in get_all_pages(get_my_bookings) if row.name in booking_names]
+		self.assertEqual([row.name for row in bookings], list(reversed(booking_names)))
+		self.assertTrue(all(row.ticket_count == 2 for row in bookings))
+		self.assertEqual(bookings[0].event_title, test_event.title)
+
+		tickets = [row for row in get_all_pages(get_my_tickets) if row.event == test_event.name]
+		self.assertEqual(len({row.name for row in tickets}), len(tickets))
+		self.assertGreaterEqual(len(tickets), 10)
+		self.assertTrue(all(row.ticket_type_title for row in tickets))
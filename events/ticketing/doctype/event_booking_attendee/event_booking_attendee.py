@@ -17,6 +17,7 @@ class EventBookingAttendee(Document):
 		add_on_total: DF.Currency
 		add_ons: DF.Link | None
 		amount: DF.Currency
+		coupon_used: DF.Link | None
 		currency: DF.Link
 		email: DF.Data
 		full_name: DF.Data
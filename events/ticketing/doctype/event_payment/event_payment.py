@@ -1,7 +1,7 @@
 # Copyright (c) 2025, BWH Studios and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
@@ -27,3 +27,8 @@ class EventPayment(Document):
 	# end: auto-generated types
 
 	pass
+
+
+def on_doctype_update():
+	# a booking's or enquiry's payment is looked up by its reference
+	frappe.db.add_index("Event Payment", ["reference_doctype", "reference_docname"])
@@ -0,0 +1,192 @@
+# Copyright (c) 2026, BWH Studios and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, get_datetime, now
+
+ROLLUP_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"hour",
+	"event",
+	"ticket_type",
+	"currency",
+	"tickets_sold",
+	"gross",
+	"tax",
+	"add_on_revenue",
+)
+
+
+class EventSalesRollup(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		add_on_revenue: DF.Currency
+		currency: DF.Link | None
+		event: DF.Link
+		gross: DF.Currency
+		hour: DF.Datetime
+		tax: DF.Currency
+		ticket_type: DF.Link | None
+		tickets_sold: DF.Int
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	# the sales reports read a range of hours for one event
+	frappe.db.add_index("Event Sales Rollup", ["event", "hour"])
+
+
+def append_booking_to_rollup(booking, at=None, sign: int = 1) -> None:
+	"""Append the booking's sales (or with `sign=-1`, their reversal) to the hour of `at`, by ticket type.
+
+	Rows are only ever inserted, so concurrent bookings never contend on a row.
+	"""
+	rows = get_rollup_rows(booking, booking.attendees, at or now(), sign)
+	_insert_rollup_rows(rows)
+
+
+def get_rollup_rows(booking, attendees: list, at, sign: int = 1) -> list[tuple]:
+	"""Rows of ROLLUP_FIELDS for a booking's attendees, tax apportioned by amount."""
+	hour = get_datetime(at).replace(minute=0, second=0, microsecond=0)
+	tax_rate = flt(booking.tax_percentage) / 100 if flt(booking.tax_amount) else 0
+
+	totals_by_type = {}
+	for attendee in attendees:
+		totals = totals_by_type.setdefault(attendee.ticket_type, [0, 0.0, 0.0])
+		add_on_total = flt(attendee.add_on_total) if attendee.add_ons else 0
+		totals[0] += 1
+		totals[1] += flt(attendee.amount) + add_on_total
+		totals[2] += add_on_total
+
+	timestamp = now()
+	user = frappe.session.user
+	rows = []
+	for ticket_type, (num_tickets, net, add_on_revenue) in totals_by_type.items():
+		tax = net * tax_rate
+		rows.append(
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				hour,
+				booking.event,
+				ticket_type,
+				booking.currency,
+				sign * num_tickets,
+				sign * (net + tax),
+				sign * tax,
+				sign * add_on_revenue,
+			)
+		)
+	return rows
+
+
+def backfill_sales_rollup(event: str | int | None = None, batch_size: int = 500) -> int:
+	"""Rebuild the rollup from submitted and cancelled bookings, returning the number of bookings read.
+
+	A booking's sale is placed in the hour it was created, a cancellation in the hour
+	the booking was last modified. Commits after every batch.
+	"""
+	frappe.db.delete("Event Sales Rollup", {"event": event} if event else None)
+	frappe.db.commit()
+
+	filters = {"docstatus": ("!=", 0)}
+	if event:
+		filters["event"] = event
+
+	num_bookings = 0
+	last_name = None
+	while True:
+		batch_filters = dict(filters)
+		if last_name:
+			batch_filters["name"] = (">", last_name)
+		bookings = frappe.get_all(
+			"Event Booking",
+			filters=batch_filters,
+			fields=[
+				"name",
+				"creation",
+				"modified",
+				"docstatus",
+				"event",
+				"currency",
+				"tax_percentage",
+				"tax_amount",
+			],
+			order_by="name asc",
+			limit=batch_size,
+		)
+		if not bookings:
+			break
+
+		attendees_by_booking = {}
+		for attendee in frappe.get_all(
+			"Event Booking Attendee",
+			filters={"parenttype": "Event Booking", "parent": ("in", [booking.name for booking in bookings])},
+			fields=["parent", "ticket_type", "amount", "add_ons", "add_on_total"],
+		):
+			attendees_by_booking.setdefault(attendee.parent, []).append(attendee)
+
+		rows = []
+		for booking in bookings:
+			attendees = attendees_by_booking.get(booking.name, [])
+			rows.extend(get_rollup_rows(booking, attendees, booking.creation))
+			if booking.docstatus == 2:
+				rows.extend(get_rollup_rows(booking, attendees, booking.modified, sign=-1))
+
+		_insert_rollup_rows(rows)
+		frappe.db.commit()
+
+		num_bookings += len(bookings)
+		last_name = bookings[-1].name
+
+	return num_bookings
+
+
+def get_sales_by_hour(event: str | int, from_datetime=None, to_datetime=None, ticket_type=None) -> list[dict]:
+	"""Net sales per hour and currency, summed over the appended rows."""
+	Rollup = frappe.qb.DocType("Event Sales Rollup")
+	query = (
+		frappe.qb.from_(Rollup)
+		.select(
+			Rollup.hour,
+			Rollup.currency,
+			Sum(Rollup.tickets_sold).as_("tickets_sold"),
+			Sum(Rollup.gross).as_("gross"),
+			Sum(Rollup.tax).as_("tax"),
+			Sum(Rollup.add_on_revenue).as_("add_on_revenue"),
+		)
+		.where(Rollup.event == event)
+		.groupby(Rollup.hour, Rollup.currency)
+		.orderby(Rollup.hour)
+		.orderby(Rollup.currency)
+	)
+	if from_datetime:
+		query = query.where(Rollup.hour >= from_datetime)
+	if to_datetime:
+		query = query.where(Rollup.hour <= to_datetime)
+	if ticket_type:
+		query = query.where(Rollup.ticket_type == ticket_type)
+
+	return query.run(as_dict=True)
+
+
+def _insert_rollup_rows(rows: list[tuple]) -> None:
+	if rows:
+		frappe.db.bulk_insert("Event Sales Rollup", ROLLUP_FIELDS, rows)
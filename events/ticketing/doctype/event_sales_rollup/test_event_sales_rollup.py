@@ -0,0 +1,81 @@
+# Copyright (c) 2026, BWH Studios and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from events.events.report.ticket_sales_over_time.ticket_sales_over_time import execute
+from events.ticketing.doctype.event_sales_rollup.event_sales_rollup import (
+	backfill_sales_rollup,
+	get_sales_by_hour,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class IntegrationTestEventSalesRollup(IntegrationTestCase):
+	"""
+	Integration tests for EventSalesRollup.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_booking_appends_hourly_rollup(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": test_event.name, "title": "Paid", "price": 100}
+		).insert()
+		frappe.db.delete("Event Sales Rollup", {"event": test_event.name})
+
+		booking = frappe.get_doc(
+			{
+				"doctype": "Event Booking",
+				"event": test_event.name,
+				"user": "Administrator",
+				"attendees": [
+					{"ticket_type": test_ticket_type.name, "full_name": "John", "email": "john@email.com"},
+					{"ticket_type": test_ticket_type.name, "full_name": "Jenny", "email": "jenny@email.com"},
+				],
+			}
+		).submit()
+
+		hours = get_sales_by_hour(test_event.name, ticket_type=test_ticket_type.name)
+		self.assertEqual(len(hours), 1)
+		self.assertEqual(hours[0].tickets_sold, 2)
+		self.assertAlmostEqual(float(hours[0].gross), booking.total_amount)
+
+		backfill_sales_rollup(test_event.name)
+		self.assertEqual(get_sales_by_hour(test_event.name, ticket_type=test_ticket_type.name), hours)
+
+	def test_sales_over_time_kept_apart_by_currency(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		frappe.db.delete("Event Sales Rollup", {"event": test_event.name})
+
+		for currency, price in (("INR", 100), ("USD", 10)):
+			ticket_type = frappe.get_doc(
+				{
+					"doctype": "Event Ticket Type",
+					"event": test_event.name,
+					"title": f"Paid {currency}",
+					"price": price,
+					"currency": currency,
+				}
+			).insert()
+			frappe.get_doc(
+				{
+					"doctype": "Event Booking",
+					"event": test_event.name,
+					"user": "Administrator",
+					"attendees": [
+						{"ticket_type": ticket_type.name, "full_name": "John", "email": "john@email.com"}
+					],
+				}
+			).submit()
+
+		_columns, data, _message, chart = execute({"event": test_event.name, "interval": "Daily"})
+		self.assertEqual(sorted(row["currency"] for row in data), ["INR", "USD"])
+		self.assertTrue(all(row["tickets_sold"] == 1 for row in data))
+		self.assertEqual(chart["data"]["datasets"][0]["values"], [2])
@@ -0,0 +1,139 @@
+# Copyright (c) 2026, BWH Studios and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Count, Sum
+
+
+class EventSalesSummary(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		add_ons_sold: DF.Int
+		currency: DF.Link | None
+		event: DF.Link
+		sales: DF.Currency
+		tickets_sold: DF.Int
+	# end: auto-generated types
+
+	pass
+
+
+def update_sales_summary(
+	event: str | int,
+	currency: str | None,
+	tickets_sold: int = 0,
+	add_ons_sold: int = 0,
+	sales: float = 0,
+) -> None:
+	"""Add to (or, with negative amounts, subtract from) the event's totals in `currency`.
+
+	A single UPDATE with relative increments, so concurrent bookings never lose a count.
+	"""
+	name = _get_summary_name(event, currency)
+	if not frappe.db.exists("Event Sales Summary", name):
+		frappe.db.savepoint("event_sales_summary")
+		try:
+			frappe.get_doc(
+				{"doctype": "Event Sales Summary", "name": name, "event": event, "currency": currency}
+			).db_insert()
+		except frappe.DuplicateEntryError:
+			# created by a concurrent transaction in the meantime
+			frappe.db.rollback(save_point="event_sales_summary")
+
+	Summary = frappe.qb.DocType("Event Sales Summary")
+	(
+		frappe.qb.update(Summary)
+		.set(Summary.tickets_sold, Summary.tickets_sold + tickets_sold)
+		.set(Summary.add_ons_sold, Summary.add_ons_sold + add_ons_sold)
+		.set(Summary.sales, Summary.sales + sales)
+		.where(Summary.name == name)
+	).run()
+
+
+def update_sales_summary_for_tickets(event: str | int, num_tickets_and_add_ons: dict, sign: int = 1) -> None:
+	"""`num_tickets_and_add_ons` maps ticket type to [tickets, add-ons]; counted in the ticket type's currency."""
+	by_currency = {}
+	for ticket_type, (num_tickets, num_add_ons) in num_tickets_and_add_ons.items():
+		currency = frappe.get_cached_value("Event Ticket Type", ticket_type, "currency")
+		totals = by_currency.setdefault(currency, [0, 0])
+		totals[0] += num_tickets
+		totals[1] += num_add_ons
+
+	for currency, (num_tickets, num_add_ons) in by_currency.items():
+		update_sales_summary(
+			event, currency, tickets_sold=sign * num_tickets, add_ons_sold=sign * num_add_ons
+		)
+
+
+def get_live_sales_summary(event: str | int | None = None) -> list[dict]:
+	"""Compute the summary rows from bookings and tickets, with one grouped query per measure."""
+	Ticket = frappe.qb.DocType("Event Ticket")
+	TicketType = frappe.qb.DocType("Event Ticket Type")
+	AddOnValue = frappe.qb.DocType("Ticket Add-on Value")
+	Booking = frappe.qb.DocType("Event Booking")
+
+	tickets = (
+		frappe.qb.from_(Ticket)
+		.join(TicketType)
+		.on(TicketType.name == Ticket.ticket_type)
+		.select(Ticket.event, TicketType.currency, Count("*"))
+		.where(Ticket.docstatus == 1)
+		.groupby(Ticket.event, TicketType.currency)
+	)
+	add_ons = (
+		frappe.qb.from_(AddOnValue)
+		.join(Ticket)
+		.on(Ticket.name == AddOnValue.parent)
+		.join(TicketType)
+		.on(TicketType.name == Ticket.ticket_type)
+		.select(Ticket.event, TicketType.currency, Count("*"))
+		.where(AddOnValue.parenttype == "Event Ticket")
+		.where(AddOnValue.parentfield == "add_ons")
+		.where(Ticket.docstatus == 1)
+		.groupby(Ticket.event, TicketType.currency)
+	)
+	sales = (
+		frappe.qb.from_(Booking)
+		.select(Booking.event, Booking.currency, Sum(Booking.total_amount))
+		.where(Booking.docstatus == 1)
+		.groupby(Booking.event, Booking.currency)
+	)
+	if event:
+		tickets = tickets.where(Ticket.event == event)
+		add_ons = add_ons.where(Ticket.event == event)
+		sales = sales.where(Booking.event == event)
+
+	summary = {}
+	for fieldname, query in (("tickets_sold", tickets), ("add_ons_sold", add_ons), ("sales", sales)):
+		for row_event, currency, value in query.run():
+			row = summary.setdefault(
+				(row_event, currency),
+				frappe._dict(event=row_event, currency=currency, tickets_sold=0, add_ons_sold=0, sales=0),
+			)
+			row[fieldname] = value or 0
+
+	return list(summary.values())
+
+
+def rebuild_sales_summary(event: str | int | None = None) -> None:
+	"""Recompute the stored summary from bookings and tickets.
+
+	bench --site <site> execute events.ticketing.doctype.event_sales_summary.event_sales_summary.rebuild_sales_summary
+	"""
+	frappe.db.delete("Event Sales Summary", {"event": event} if event else None)
+	rows = get_live_sales_summary(event)
+	for row in rows:
+		frappe.get_doc(
+			{"doctype": "Event Sales Summary", "name": _get_summary_name(row.event, row.currency), **row}
+		).db_insert()
+
+
+def _get_summary_name(event: str | int, currency: str | None) -> str:
+	return f"{event}-{currency or ''}"
@@ -0,0 +1,69 @@
+# Copyright (c) 2026, BWH Studios and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from events.events.report.event_overview.event_overview import execute
+from events.report_cache import get_report_cache_key, invalidate_report_cache
+from events.ticketing.doctype.event_sales_summary.event_sales_summary import rebuild_sales_summary
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class IntegrationTestEventSalesSummary(IntegrationTestCase):
+	"""
+	Integration tests for EventSalesSummary.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_summary_matches_live_totals(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		rebuild_sales_summary(test_event.name)
+		test_ticket_type = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": test_event.name, "title": "Paid", "price": 100}
+		).insert()
+
+		booking = frappe.get_doc(
+			{
+				"doctype": "Event Booking",
+				"event": test_event.name,
+				"user": "Administrator",
+				"attendees": [
+					{"ticket_type": test_ticket_type.name, "full_name": "John", "email": "john@email.com"},
+					{"ticket_type": test_ticket_type.name, "full_name": "Jenny", "email": "jenny@email.com"},
+				],
+			}
+		).submit()
+		frappe.get_doc("Event Ticket", {"booking": booking.name, "attendee_name": "John"}).cancel()
+
+		_columns, data = execute({"event": test_event.name})
+		_columns, live_data = execute({"event": test_event.name, "compute_live": 1})
+		self.assertEqual(data, live_data)
+
+		row = next(row for row in data if row["currency"] == test_ticket_type.currency)
+		self.assertEqual(row["num_tickets_sold"], 1)
+		self.assertEqual(row["sales"], booking.total_amount)
+
+	def test_report_cache_invalidated_by_bookings(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		key = get_report_cache_key("Event Overview", {"event": test_event.name})
+
+		execute({"event": test_event.name})
+		self.assertIsNotNone(frappe.cache.get_value(key))
+
+		invalidate_report_cache(test_event.name)
+		self.assertNotEqual(get_report_cache_key("Event Overview", {"event": test_event.name}), key)
+
+	def test_check_ins_keep_all_events_report_cache(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		global_key = get_report_cache_key("Event Overview", {})
+		event_key = get_report_cache_key("Event Overview", {"event": test_event.name})
+
+		invalidate_report_cache(test_event.name, include_global=False)
+		self.assertEqual(get_report_cache_key("Event Overview", {}), global_key)
+		self.assertNotEqual(get_report_cache_key("Event Overview", {"event": test_event.name}), event_key)
@@ -4,7 +4,26 @@
 import frappe
 from frappe.model.document import Document
 
-from events.ticketing.doctype.event_ticket_type.event_ticket_type import EventTicketType
+from events.cache import clear_add_on_demand_cache
+from events.check_in import add_valid_tickets, remove_valid_ticket
+from events.qr import (
+	DEFAULT_QR_MODE,
+	get_file_extension,
+	get_qr_mode,
+	get_ticket_qr_code_url,
+	render_qr,
+	should_store_qr_code_files,
+)
+from events.report_cache import invalidate_report_cache
+from events.ticket_tokens import get_ticket_token, revoke_previous_tokens
+from events.ticketing.doctype.event_sales_summary.event_sales_summary import (
+	update_sales_summary_for_tickets,
+)
+from events.ticketing.doctype.event_ticket_type.event_ticket_type import (
+	EventTicketType,
+	decrement_tickets_sold,
+	increment_tickets_sold,
+)
 
 
 class EventTicket(Document):
@@ -27,18 +46,45 @@ class EventTicket(Document):
 		event: DF.Link | None
 		qr_code: DF.AttachImage | None
 		ticket_type: DF.Link
+		token_version: DF.Int
 	# end: auto-generated types
 
 	def before_submit(self):
 		self.validate_coupon_usage()
+		increment_tickets_sold(self.ticket_type, exclude_booking=self.booking)
 		self.generate_qr_code()
 
 	def on_submit(self):
+		add_valid_tickets(self.event, {self.name: self.ticket_type})
+		if self.event:
+			update_sales_summary_for_tickets(self.event, {self.ticket_type: [1, len(self.add_ons)]})
+			clear_add_on_demand_cache(self.event)
+			invalidate_report_cache(self.event)
 		try:
 			self.send_ticket_email()
 		except Exception as e:
 			frappe.log_error("Error sending ticket email: " + str(e))
 
+	def before_update_after_submit(self):
+		if self.has_value_changed("attendee_name") or self.has_value_changed("attendee_email"):
+			# transferred: the previous holder's QR code must stop working
+			self.token_version += 1
+			self.generate_qr_code()
+
+	def on_update_after_submit(self):
+		if self.has_value_changed("token_version"):
+			revoke_previous_tokens(self)
+
+	def on_cancel(self):
+		decrement_tickets_sold(self.ticket_type)
+		self.db_set("token_version", self.token_version + 1, update_modified=False)
+		revoke_previous_tokens(self)
+		remove_valid_ticket(self.event, self.name)
+		if self.event:
+			update_sales_summary_for_tickets(self.event, {self.ticket_type: [1, len(self.add_ons)]}, sign=-1)
+			clear_add_on_demand_cache(self.event)
+			invalidate_report_cache(self.event)
+
 	def send_ticket_email(self):
 		event_title, ticket_template, ticket_print_format, venue = frappe.get_cached_value(
 			"FE Event", self.event, ["title", "ticket_email_template", "ticket_print_format", "venue"]
@@ -79,8 +125,26 @@ class EventTicket(Document):
 		if coupon.is_used_up():
 			frappe.throw(frappe._("Coupon has been already used up maximum number of times!"))
 
-	def generate_qr_code(self):
-		qr_data = make_qr_image_with_data(f"{self.name}")
+	def generate_qr_code(self, qr_mode: str | None = None):
+		if not should_store_qr_code_files():
+			# rendered when first requested, no File doc per ticket
+			self.qr_code = get_ticket_qr_code_url(self)
+			return
+
+		qr_mode = qr_mode or get_qr_mode()
+		qr_data = render_qr(get_ticket_token(self), qr_mode)
+		# a re-issued QR code replaces the previous one
+		for file in frappe.get_all(
+			"File",
+			filters={
+				"attached_to_doctype": "Event Ticket",
+				"attached_to_name": self.name,
+				"attached_to_field": "qr_code",
+			},
+			pluck="name",
+		):
+			frappe.delete_doc("File", file, ignore_permissions=True)
+
 		qr_code_file = frappe.get_doc(
 			{
 				"doctype": "File",
@@ -88,29 +152,20 @@ class EventTicket(Document):
 				"attached_to_doctype": "Event Ticket",
 				"attached_to_name": self.name,
 				"attached_to_field": "qr_code",
-				"file_name": f"ticket-qr-code-{self.name}.png",
+				"file_name": f"ticket-qr-code-{self.name}.{get_file_extension(qr_mode)}",
 			}
 		).save(ignore_permissions=True)
 		self.qr_code = qr_code_file.file_url
 
 
+def on_doctype_update():
+	# offline scanners sync the tickets changed since their last cursor
+	frappe.db.add_index("Event Ticket", ["event", "modified"])
+	# attendee exports walk an event's tickets in name order
+	frappe.db.add_index("Event Ticket", ["event", "name"])
+	# the dashboard pages through a user's tickets by (creation, name)
+	frappe.db.add_index("Event Ticket", ["attendee_email", "creation", "name"])
+
+
 def make_qr_image_with_data(data: str) -> bytes:
-	import io
-
-	import qrcode
-	from qrcode.image.styledpil import StyledPilImage
-	from qrcode.image.styles.moduledrawers.pil import HorizontalBarsDrawer
-
-	qr = qrcode.QRCode(
-		version=1,
-		error_correction=qrcode.constants.ERROR_CORRECT_H,
-		box_size=10,
-		border=4,
-	)
-	qr.add_data(data)
-	qr.make(fit=True)
-
-	img = qr.make_image(image_factory=StyledPilImage, module_drawer=HorizontalBarsDrawer())
-	output = io.BytesIO()
-	img.save(output, format="PNG")
-	return output.getvalue()
+	return render_qr(data, DEFAULT_QR_MODE)
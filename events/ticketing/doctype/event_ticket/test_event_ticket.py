@@ -1,9 +1,17 @@
 # Copyright (c) 2025, BWH Studios and Contributors
 # See license.txt
 
+import csv
+import io
+
 import frappe
 from frappe.tests import IntegrationTestCase
 
+from events.api import change_add_on_preference
+from events.attendee_export import iter_csv, iter_ticket_chunks
+from events.events.report.add_on_demand.add_on_demand import get_add_on_demand
+from events.ticket_tokens import decode_ticket_token, get_ticket_token, is_token_revoked, verify_ticket_token
+
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
 # Use these module variables to add/remove to/from that list
@@ -17,4 +25,96 @@ class IntegrationTestEventTicket(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def make_ticket(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": test_event.name, "title": "Normal", "price": 0}
+		).insert()
+		return frappe.get_doc(
+			{
+				"doctype": "Event Ticket",
+				"event": test_event.name,
+				"ticket_type": test_ticket_type.name,
+				"attendee_name": "John",
+				"attendee_email": "john@email.com",
+			}
+		).submit()
+
+	def test_signed_token(self):
+		ticket = self.make_ticket()
+		token = get_ticket_token(ticket)
+
+		claims = verify_ticket_token(token, ticket.event)
+		self.assertEqual(claims.ticket, ticket.name)
+		self.assertEqual(claims.ticket_type, str(ticket.ticket_type))
+
+		tampered = token.replace(f".{ticket.ticket_type}.", f".{ticket.ticket_type}0.")
+		self.assertIsNone(decode_ticket_token(tampered))
+		self.assertRaises(frappe.ValidationError, verify_ticket_token, token, "0")
+
+	def test_transfer_revokes_previous_token(self):
+		ticket = self.make_ticket()
+		old_token = get_ticket_token(ticket)
+
+		ticket.attendee_name = "Jenny"
+		ticket.attendee_email = "jenny@email.com"
+		ticket.save()
+
+		self.assertTrue(is_token_revoked(decode_ticket_token(old_token)))
+		self.assertFalse(is_token_revoked(decode_ticket_token(get_ticket_token(ticket))))
+
+		ticket.cancel()
+		self.assertRaises(frappe.ValidationError, verify_ticket_token, get_ticket_token(ticket), ticket.event)
+
+	def test_attendee_export(self):
+		ticket = self.make_ticket()
+		frappe.get_doc(
+			{
+				"doctype": "Event Ticket",
+				"event": ticket.event,
+				"ticket_type": ticket.ticket_type,
+				"attendee_name": "Jenny",
+				"attendee_email": "jenny@email.com",
+			}
+		).submit()
+
+		chunks = list(iter_ticket_chunks(ticket.event, chunk_size=1))
+		self.assertTrue(all(len(chunk) == 1 for chunk in chunks))
+		names = [chunk[0].name for chunk in chunks]
+		self.assertEqual(names, sorted(names))
+
+		rows = list(csv.reader(io.StringIO(b"".join(iter_csv(ticket.event)).decode())))
+		self.assertEqual(len(rows), len(names) + 1)
+		self.assertIn(ticket.name, [row[0] for row in rows])
+
+	def test_add_on_demand(self):
+		ticket = self.make_ticket()
+		add_on = frappe.get_doc(
+			{
+				"doctype": "Ticket Add-on",
+				"event": ticket.event,
+				"title": "Meal",
+				"options": "Veg\nNon-Veg",
+				"user_selects_option": 1,
+			}
+		).insert()
+		other = frappe.get_doc(
+			{
+				"doctype": "Event Ticket",
+				"event": ticket.event,
+				"ticket_type": ticket.ticket_type,
+				"attendee_name": "Jenny",
+				"attendee_email": "jenny@email.com",
+				"add_ons": [{"add_on": add_on.name, "value": "Veg"}],
+			}
+		).submit()
+
+		def count(option):
+			rows = get_add_on_demand(ticket.event)
+			return sum(row.count for row in rows if row.add_on == add_on.name and row.option == option)
+
+		self.assertEqual(count("Veg"), 1)
+
+		change_add_on_preference(other.add_ons[0].name, "Non-Veg")
+		self.assertEqual(count("Veg"), 0)
+		self.assertEqual(count("Non-Veg"), 1)
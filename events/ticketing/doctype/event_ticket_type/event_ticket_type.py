@@ -3,6 +3,11 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.query_builder.functions import Coalesce, Sum
+from frappe.utils import now_datetime
+
+from events.cache import clear_event_booking_data_cache
+from events.ticketing.doctype.ticket_hold.ticket_hold import get_held_tickets
 
 
 class EventTicketType(Document):
@@ -21,22 +26,141 @@ class EventTicketType(Document):
 		max_tickets_available: DF.Int
 		name: DF.Int | None
 		price: DF.Currency
+		tickets_sold: DF.Int
 		title: DF.Data
 	# end: auto-generated types
 
+	def before_save(self):
+		self.sync_tickets_sold()
+
+	def on_update(self):
+		clear_event_booking_data_cache(event=self.event)
+
+	def on_trash(self):
+		clear_event_booking_data_cache(event=self.event)
+
+	def sync_tickets_sold(self):
+		"""Never let a form save overwrite the counter maintained by ticket submit/cancel."""
+		if self.is_new():
+			self.tickets_sold = 0
+			return
+		self.tickets_sold = frappe.db.get_value("Event Ticket Type", self.name, "tickets_sold") or 0
+
 	def are_tickets_available(self, num_tickets: int) -> bool:
 		if self.remaining_tickets != -1 and self.remaining_tickets < num_tickets:
 			return False
 		return True
 
-	@property
-	def tickets_sold(self) -> int:
-		"""Returns the number of tickets sold for this ticket type."""
-		return frappe.db.count("Event Ticket", {"ticket_type": self.name, "docstatus": 1})
-
 	@property
 	def remaining_tickets(self) -> int:
-		"""Returns -1 if no limit, otherwise the number of remaining tickets."""
+		"""Returns -1 if no limit, otherwise the number of tickets neither sold nor held."""
 		if not self.max_tickets_available:
 			return -1
-		return self.max_tickets_available - self.tickets_sold
+		return max(self.max_tickets_available - self.tickets_sold - get_held_tickets(self.name), 0)
+
+
+def get_ticket_type_availability(
+	ticket_type: str | int, exclude_booking: str | None = None
+) -> tuple[bool, int]:
+	"""Returns (is_published, remaining_tickets) from the stored counter and active holds.
+
+	`remaining_tickets` is -1 if no limit is set. Holds placed by `exclude_booking`
+	are not subtracted, so a booking does not compete with its own reservation.
+	"""
+	is_published, max_tickets_available, tickets_sold = frappe.db.get_value(
+		"Event Ticket Type", ticket_type, ["is_published", "max_tickets_available", "tickets_sold"]
+	)
+	if not max_tickets_available:
+		return bool(is_published), -1
+
+	held_tickets = get_held_tickets(ticket_type, exclude_booking=exclude_booking)
+	return bool(is_published), max(max_tickets_available - tickets_sold - held_tickets, 0)
+
+
+def get_ticket_availability(event: str) -> dict[str | int, frappe._dict]:
+	"""Returns sold and remaining counts of an event's published ticket types, in a single query.
+
+	Active holds are summed by a correlated subquery on the (ticket_type, expires_at)
+	index. `remaining_tickets` is -1 for ticket types without a limit.
+	"""
+	TicketType = frappe.qb.DocType("Event Ticket Type")
+	Hold = frappe.qb.DocType("Ticket Hold")
+
+	held_tickets = (
+		frappe.qb.from_(Hold)
+		.select(Coalesce(Sum(Hold.quantity), 0))
+		.where(Hold.ticket_type == TicketType.name)
+		.where(Hold.expires_at > now_datetime())
+	)
+	rows = (
+		frappe.qb.from_(TicketType)
+		.select(
+			TicketType.name,
+			TicketType.max_tickets_available,
+			TicketType.tickets_sold,
+			held_tickets.as_("held_tickets"),
+		)
+		.where(TicketType.event == event)
+		.where(TicketType.is_published == 1)
+		.run(as_dict=True)
+	)
+
+	availability = {}
+	for row in rows:
+		remaining_tickets = -1
+		if row.max_tickets_available:
+			remaining_tickets = max(row.max_tickets_available - row.tickets_sold - int(row.held_tickets), 0)
+		availability[row.name] = frappe._dict(
+			tickets_sold=row.tickets_sold, remaining_tickets=remaining_tickets
+		)
+
+	return availability
+
+
+def lock_and_check_availability(
+	ticket_type: str | int, num_tickets: int, exclude_booking: str | None = None
+) -> int:
+	"""Lock the ticket type row and make sure `num_tickets` can still be taken.
+
+	The lock is held until the current transaction ends, so two concurrent
+	bookings can never both take the last remaining seat. Returns the current
+	sold count.
+	"""
+	title, max_tickets_available, tickets_sold = frappe.db.get_value(
+		"Event Ticket Type",
+		ticket_type,
+		["title", "max_tickets_available", "tickets_sold"],
+		for_update=True,
+	)
+
+	if max_tickets_available:
+		held_tickets = get_held_tickets(ticket_type, exclude_booking=exclude_booking)
+		remaining_tickets = max(max_tickets_available - tickets_sold - held_tickets, 0)
+		if remaining_tickets < num_tickets:
+			frappe.throw(
+				frappe._("Only {0} tickets available for {1}, you are trying to book {2}!").format(
+					remaining_tickets, title, num_tickets
+				)
+			)
+
+	return tickets_sold
+
+
+def increment_tickets_sold(ticket_type: str | int, num_tickets: int = 1, exclude_booking: str | None = None):
+	"""Add `num_tickets` to the stored sold counter, failing if it would exceed the limit."""
+	tickets_sold = lock_and_check_availability(ticket_type, num_tickets, exclude_booking=exclude_booking)
+	frappe.db.set_value(
+		"Event Ticket Type", ticket_type, "tickets_sold", tickets_sold + num_tickets, update_modified=False
+	)
+
+
+def decrement_tickets_sold(ticket_type: str | int, num_tickets: int = 1):
+	"""Release `num_tickets` from the stored sold counter, e.g. when a ticket is cancelled."""
+	tickets_sold = frappe.db.get_value("Event Ticket Type", ticket_type, "tickets_sold", for_update=True)
+	frappe.db.set_value(
+		"Event Ticket Type",
+		ticket_type,
+		"tickets_sold",
+		max((tickets_sold or 0) - num_tickets, 0),
+		update_modified=False,
+	)
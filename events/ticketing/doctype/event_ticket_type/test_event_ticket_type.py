@@ -1,9 +1,11 @@
 # Copyright (c) 2025, BWH Studios and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from events.ticketing.doctype.event_ticket_type.event_ticket_type import get_ticket_availability
+
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
 # Use these module variables to add/remove to/from that list
@@ -17,4 +19,84 @@ class IntegrationTestEventTicketType(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def test_tickets_sold_counter_tracks_submit_and_cancel(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Limited",
+				"is_published": True,
+				"max_tickets_available": 1,
+			}
+		).insert()
+
+		ticket = frappe.get_doc(
+			{
+				"doctype": "Event Ticket",
+				"ticket_type": test_ticket_type.name,
+				"attendee_name": "John Doe",
+				"attendee_email": "john@email.com",
+			}
+		).insert()
+		ticket.submit()
+		self.assertEqual(frappe.db.get_value("Event Ticket Type", test_ticket_type.name, "tickets_sold"), 1)
+
+		# saving the form must not reset the stored counter
+		test_ticket_type.reload()
+		test_ticket_type.tickets_sold = 0
+		test_ticket_type.save()
+		self.assertEqual(test_ticket_type.tickets_sold, 1)
+		self.assertEqual(test_ticket_type.remaining_tickets, 0)
+
+		# sold out
+		with self.assertRaises(frappe.ValidationError):
+			frappe.get_doc(
+				{
+					"doctype": "Event Ticket",
+					"ticket_type": test_ticket_type.name,
+					"attendee_name": "Jenny Doe",
+					"attendee_email": "jenny@email.com",
+				}
+			).insert().submit()
+
+		ticket.cancel()
+		self.assertEqual(frappe.db.get_value("Event Ticket Type", test_ticket_type.name, "tickets_sold"), 0)
+
+	def test_ticket_availability(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		limited = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Limited",
+				"is_published": True,
+				"max_tickets_available": 3,
+			}
+		).insert()
+		unlimited = frappe.get_doc(
+			{"doctype": "Event Ticket Type", "event": test_event.name, "title": "Open", "is_published": True}
+		).insert()
+		unpublished = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Hidden",
+				"is_published": False,
+			}
+		).insert()
+
+		frappe.get_doc(
+			{
+				"doctype": "Event Ticket",
+				"ticket_type": limited.name,
+				"attendee_name": "John Doe",
+				"attendee_email": "john@email.com",
+			}
+		).insert().submit()
+
+		ticket_types = get_ticket_availability(test_event.name)
+		self.assertNotIn(unpublished.name, ticket_types)
+		self.assertEqual(ticket_types[limited.name].tickets_sold, 1)
+		self.assertEqual(ticket_types[limited.name].remaining_tickets, 2)
+		self.assertEqual(ticket_types[unlimited.name].remaining_tickets, -1)
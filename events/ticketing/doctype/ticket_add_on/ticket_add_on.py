@@ -4,6 +4,14 @@
 # import frappe
 from frappe.model.document import Document
 
+from events.cache import clear_add_on_demand_cache, clear_event_booking_data_cache
+
 
 class TicketAddon(Document):
-	pass
+	def on_update(self):
+		clear_event_booking_data_cache(event=self.event)
+		clear_add_on_demand_cache(self.event)
+
+	def on_trash(self):
+		clear_event_booking_data_cache(event=self.event)
+		clear_add_on_demand_cache(self.event)
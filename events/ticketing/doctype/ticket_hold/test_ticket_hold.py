@@ -0,0 +1,89 @@
+# Copyright (c) 2026, BWH Studios and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from events.ticketing.doctype.ticket_hold.ticket_hold import create_holds_for_booking, release_expired_holds
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class IntegrationTestTicketHold(IntegrationTestCase):
+	"""
+	Integration tests for TicketHold.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_holds_reserve_tickets_until_expiry(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Limited",
+				"is_published": True,
+				"max_tickets_available": 2,
+			}
+		).insert()
+
+		def make_booking(num_attendees):
+			return frappe.get_doc(
+				{
+					"doctype": "Event Booking",
+					"event": test_event.name,
+					"user": "Administrator",
+					"attendees": [
+						{"ticket_type": test_ticket_type.name, "full_name": "John", "email": "john@email.com"}
+					]
+					* num_attendees,
+				}
+			).insert()
+
+		held_booking = make_booking(2)
+		create_holds_for_booking(held_booking)
+		self.assertEqual(test_ticket_type.remaining_tickets, 0)
+
+		# both seats are held by someone else
+		with self.assertRaises(frappe.ValidationError):
+			make_booking(1)
+
+		# the holder can still complete their own booking
+		held_booking.submit()
+		self.assertFalse(frappe.db.exists("Ticket Hold", {"booking": held_booking.name}))
+		self.assertEqual(frappe.db.get_value("Event Ticket Type", test_ticket_type.name, "tickets_sold"), 2)
+
+	def test_expired_holds_are_released(self):
+		test_event = frappe.get_doc("FE Event", {"route": "test-route"})
+		test_ticket_type = frappe.get_doc(
+			{
+				"doctype": "Event Ticket Type",
+				"event": test_event.name,
+				"title": "Limited",
+				"is_published": True,
+				"max_tickets_available": 1,
+			}
+		).insert()
+		booking = frappe.get_doc(
+			{
+				"doctype": "Event Booking",
+				"event": test_event.name,
+				"user": "Administrator",
+				"attendees": [
+					{"ticket_type": test_ticket_type.name, "full_name": "John", "email": "john@email.com"}
+				],
+			}
+		).insert()
+		create_holds_for_booking(booking)
+		frappe.db.set_value(
+			"Ticket Hold", {"booking": booking.name}, "expires_at", add_to_date(now_datetime(), minutes=-1)
+		)
+
+		self.assertEqual(test_ticket_type.remaining_tickets, 1)
+		release_expired_holds()
+		self.assertFalse(frappe.db.exists("Ticket Hold", {"booking": booking.name}))
@@ -0,0 +1,86 @@
+# Copyright (c) 2026, BWH Studios and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Coalesce, Sum
+from frappe.utils import add_to_date, now_datetime
+
+DEFAULT_HOLD_DURATION_MINUTES = 15
+
+
+class TicketHold(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		booking: DF.Link
+		event: DF.Link | None
+		expires_at: DF.Datetime
+		quantity: DF.Int
+		ticket_type: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	# availability lookups filter on ticket type and a range over expiry
+	frappe.db.add_index("Ticket Hold", ["ticket_type", "expires_at"])
+
+
+def get_held_tickets(ticket_type: str | int, exclude_booking: str | None = None) -> int:
+	"""Returns the number of tickets of this type held by unexpired holds."""
+	Hold = frappe.qb.DocType("Ticket Hold")
+	query = (
+		frappe.qb.from_(Hold)
+		.select(Coalesce(Sum(Hold.quantity), 0))
+		.where(Hold.ticket_type == ticket_type)
+		.where(Hold.expires_at > now_datetime())
+	)
+	if exclude_booking:
+		query = query.where(Hold.booking != exclude_booking)
+
+	return int(query.run()[0][0])
+
+
+def create_holds_for_booking(booking) -> None:
+	"""Reserve the booking's tickets for the configured hold duration, one row per ticket type."""
+	from events.ticketing.doctype.event_ticket_type.event_ticket_type import lock_and_check_availability
+
+	num_tickets_by_type = {}
+	for attendee in booking.attendees:
+		num_tickets_by_type.setdefault(attendee.ticket_type, 0)
+		num_tickets_by_type[attendee.ticket_type] += 1
+
+	hold_duration = (
+		frappe.db.get_single_value("Event Management Settings", "ticket_hold_duration_minutes")
+		or DEFAULT_HOLD_DURATION_MINUTES
+	)
+	expires_at = add_to_date(now_datetime(), minutes=hold_duration)
+
+	# lock in a stable order so concurrent multi-type bookings cannot deadlock
+	for ticket_type in sorted(num_tickets_by_type, key=str):
+		num_tickets = num_tickets_by_type[ticket_type]
+		lock_and_check_availability(ticket_type, num_tickets, exclude_booking=booking.name)
+		frappe.get_doc(
+			{
+				"doctype": "Ticket Hold",
+				"ticket_type": ticket_type,
+				"booking": booking.name,
+				"quantity": num_tickets,
+				"expires_at": expires_at,
+			}
+		).insert(ignore_permissions=True)
+
+
+def release_holds_for_booking(booking: str) -> None:
+	frappe.db.delete("Ticket Hold", {"booking": booking})
+
+
+def release_expired_holds() -> None:
+	frappe.db.delete("Ticket Hold", {"expires_at": ("<=", now_datetime())})
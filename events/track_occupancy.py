@@ -0,0 +1,137 @@
+"""Live room occupancy for event tracks.
+
+Each track's occupancy is a Redis set of the tickets currently in its room:
+a check-in adds the ticket, a check-out removes it. Admitting into a room with
+a capacity is a single script that checks the count and adds the ticket
+atomically, so concurrent scanners at several doors can never overfill it.
+
+Check-outs are not recorded in the database. If a set is lost it is seeded
+from the track's check-ins, erring toward full until attendees are checked
+out or the room is cleared with `clear_track_occupancy`.
+"""
+
+import frappe
+from frappe.utils import cint
+
+from events.check_in_stats import publish_check_in_counters
+
+ENTERED = 1
+ALREADY_IN = 0
+ROOM_FULL = -1
+
+# marks an occupancy set as loaded, so an empty room is not reseeded on every scan
+BUILT_MARKER = "__built__"
+# a hash of each event's tracks and their capacity
+EVENT_TRACKS_CACHE_KEY = "events:event_tracks"
+
+# Adds tickets to a room while it has space, returning ENTERED, ALREADY_IN or ROOM_FULL for each.
+# ARGV[1] is the capacity, 0 for none. Refuses to create the set, like ADD_CHECK_INS_SCRIPT.
+ENTER_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+	return false
+end
+local capacity = tonumber(ARGV[1])
+local occupancy = redis.call('SCARD', KEYS[1]) - 1
+local results = {}
+for i = 2, #ARGV do
+	if redis.call('SISMEMBER', KEYS[1], ARGV[i]) == 1 then
+		results[i - 1] = 0
+	elseif capacity > 0 and occupancy >= capacity then
+		results[i - 1] = -1
+	else
+		redis.call('SADD', KEYS[1], ARGV[i])
+		occupancy = occupancy + 1
+		results[i - 1] = 1
+	end
+end
+return results
+"""
+
+
+def get_track_capacity(track: str) -> int:
+	return cint(frappe.get_cached_value("Event Track", track, "capacity"))
+
+
+def enter_track(event: str | int, track: str, tickets: list[str]) -> list[int]:
+	"""Admit tickets into the track's room in order, returning ENTERED, ALREADY_IN or ROOM_FULL for each."""
+	if not tickets:
+		return []
+
+	script = frappe.cache.register_script(ENTER_SCRIPT)
+	key = frappe.cache.make_key(_occupancy_key(event, track))
+	args = [get_track_capacity(track), *tickets]
+	results = script(keys=[key], args=args)
+	if results is None:
+		_load_occupancy(event, track)
+		results = script(keys=[key], args=args)
+	return results
+
+
+def leave_track(event: str | int, track: str, tickets: list[str]) -> list[bool]:
+	"""Take tickets out of the track's room, returning whether each was in it."""
+	key = frappe.cache.make_key(_occupancy_key(event, track))
+	pipeline = frappe.cache.pipeline()
+	for ticket in tickets:
+		pipeline.srem(key, ticket)
+	left = [bool(removed) for removed in pipeline.execute()]
+
+	if any(left):
+		publish_check_in_counters(event, throttle=True)
+	return left
+
+
+def get_track_occupancy(event: str | int) -> dict[str, dict]:
+	"""{track: {occupancy, capacity}} for every track of the event, occupancy None if not tracked yet."""
+	tracks = get_event_tracks(event)
+	pipeline = frappe.cache.pipeline()
+	for track in tracks:
+		pipeline.scard(frappe.cache.make_key(_occupancy_key(event, track.name)))
+	counts = pipeline.execute()
+
+	return {
+		track.name: {"occupancy": count - 1 if count else None, "capacity": track.capacity}
+		for track, count in zip(tracks, counts, strict=True)
+	}
+
+
+def get_event_tracks(event: str | int) -> list[frappe._dict]:
+	"""The event's tracks with their capacity, cached until a track of the event changes."""
+	return frappe.cache.hget(
+		EVENT_TRACKS_CACHE_KEY,
+		str(event),
+		generator=lambda: frappe.get_all(
+			"Event Track", filters={"event": event}, fields=["name", "capacity"]
+		),
+	)
+
+
+def clear_event_tracks_cache(event: str | int) -> None:
+	frappe.cache.hdel(EVENT_TRACKS_CACHE_KEY, str(event))
+
+
+@frappe.whitelist()
+def clear_track_occupancy(event: str | int, track: str) -> None:
+	"""Empty a track's room, e.g. between sessions, without scanning everyone out."""
+	frappe.has_permission("Event Track", "write", doc=track, throw=True)
+	key = frappe.cache.make_key(_occupancy_key(event, track))
+	pipeline = frappe.cache.pipeline()
+	pipeline.delete(key)
+	pipeline.sadd(key, BUILT_MARKER)
+	pipeline.execute()
+	publish_check_in_counters(event)
+
+
+def _load_occupancy(event: str | int, track: str) -> None:
+	from events.check_in import get_checked_in_set
+
+	key = frappe.cache.make_key(_occupancy_key(event, track))
+	loading_key = frappe.cache.make_key(f"events:loading_occupancy:{frappe.generate_hash(length=10)}")
+	pipeline = frappe.cache.pipeline()
+	pipeline.sadd(loading_key, BUILT_MARKER, *get_checked_in_set(event, track))
+	pipeline.renamenx(loading_key, key)
+	pipeline.delete(loading_key)
+	pipeline.execute()
+
+
+def _occupancy_key(event: str | int, track: str) -> str:
+	return f"events:track_occupancy:{event}:{track}"
@@ -0,0 +1,166 @@
+"""Virtual waiting room for high-demand on-sales.
+
+When enabled on an FE Event, every visitor to the booking page takes a
+position in a per-event queue and only `waiting_room_admission_rate` people
+per second are let through to the booking endpoints. All queue state lives
+in Redis, so polling the queue status never touches the database.
+"""
+
+import time
+
+import frappe
+from frappe import _
+
+# queue state for an event is dropped once nobody has touched it for this long
+QUEUE_TTL = 24 * 60 * 60
+# an admitted token stays valid for this long, enough to fill in the booking form
+ADMISSION_TTL = 30 * 60
+
+# Lazily advances the admitted "head" of the queue by `rate` positions per
+# second. Capacity that goes unused while the queue is empty is not banked,
+# so a burst of arrivals after a quiet period is still let in at `rate`.
+ADVANCE_QUEUE_SCRIPT = """
+local head = tonumber(redis.call('GET', KEYS[1]) or '0')
+local tail = tonumber(redis.call('GET', KEYS[2]) or '0')
+local now = tonumber(ARGV[2])
+local last = tonumber(redis.call('GET', KEYS[3]) or ARGV[2])
+local rate = tonumber(ARGV[1])
+
+if head >= tail then
+	last = now
+else
+	local advanced = math.floor((now - last) * rate)
+	if advanced > 0 then
+		if head + advanced >= tail then
+			head = tail
+			last = now
+		else
+			head = head + advanced
+			last = last + advanced / rate
+		end
+	end
+end
+
+redis.call('SET', KEYS[1], head, 'EX', ARGV[3])
+redis.call('SET', KEYS[3], tostring(last), 'EX', ARGV[3])
+return {head, tail}
+"""
+
+
+def _key(event: str, name: str) -> str:
+	return frappe.cache.make_key(_unprefixed_key(event, name))
+
+
+def _unprefixed_key(event: str, name: str) -> str:
+	"""For the `frappe.cache` methods that apply `make_key` themselves."""
+	return f"events:waiting_room:{event}:{name}"
+
+
+def _advance_queue(event: str, rate: int) -> tuple[int, int]:
+	"""Returns (head, tail): positions up to `head` are admitted, `tail` is the last position handed out."""
+	script = frappe.cache.register_script(ADVANCE_QUEUE_SCRIPT)
+	head, tail = script(
+		keys=[_key(event, "head"), _key(event, "tail"), _key(event, "last_advanced_at")],
+		args=[rate, time.time(), QUEUE_TTL],
+	)
+	return int(head), int(tail)
+
+
+def _get_rate(event: str) -> int:
+	return int(frappe.cache.get(_key(event, "rate")) or 1)
+
+
+def get_event_for_route(event_route: str) -> str:
+	return frappe.cache.hget(
+		"fe_event_name_by_route",
+		event_route,
+		generator=lambda: frappe.db.get_value("FE Event", {"route": event_route}, "name"),
+	)
+
+
+def is_waiting_room_enabled(event: str) -> bool:
+	return bool(frappe.get_cached_value("FE Event", event, "enable_waiting_room"))
+
+
+@frappe.whitelist()
+def join_queue(event_route: str) -> dict:
+	"""Take a position in the event's waiting room, if it has one."""
+	event = get_event_for_route(event_route)
+	if not event:
+		frappe.throw(_("Event not found"), frappe.DoesNotExistError)
+
+	enable_waiting_room, rate = frappe.get_cached_value(
+		"FE Event", event, ["enable_waiting_room", "waiting_room_admission_rate"]
+	)
+	if not enable_waiting_room:
+		return {"enabled": False, "event": event}
+
+	rate = max(rate or 1, 1)
+	frappe.cache.set(_key(event, "rate"), rate, ex=QUEUE_TTL)
+
+	position = frappe.cache.incr(_key(event, "tail"))
+	frappe.cache.expire(_key(event, "tail"), QUEUE_TTL)
+
+	token = frappe.generate_hash(length=20)
+	frappe.cache.set(_key(event, f"token:{token}"), position, ex=QUEUE_TTL)
+
+	status = get_queue_status(event, token)
+	status["token"] = token
+	return status
+
+
+@frappe.whitelist()
+def get_queue_status(event: str, token: str) -> dict:
+	"""Where `token` stands in the event's queue. Reads Redis only."""
+	position = frappe.cache.get(_key(event, f"token:{token}"))
+	if position is None:
+		return {"enabled": True, "event": event, "valid": False, "admitted": False}
+
+	position = int(position)
+	rate = _get_rate(event)
+	head, _tail = _advance_queue(event, rate)
+	admitted = position <= head
+
+	if admitted and frappe.cache.set(_key(event, f"admitted:{token}"), 1, ex=ADMISSION_TTL, nx=True):
+		# give the visitor a fixed window to book from the moment they get in
+		frappe.cache.expire(_key(event, f"token:{token}"), ADMISSION_TTL)
+
+	ahead = max(position - head - 1, 0)
+	return {
+		"enabled": True,
+		"event": event,
+		"valid": True,
+		"admitted": admitted,
+		"position": position,
+		"ahead": ahead,
+		"estimated_wait_seconds": 0 if admitted else (ahead + 1) // rate,
+	}
+
+
+def validate_admission(event: str, token: str | None):
+	"""Throw unless `token` has been admitted through the event's waiting room (if it has one)."""
+	if not is_waiting_room_enabled(event):
+		return
+
+	if token and (
+		frappe.cache.exists(_unprefixed_key(event, f"admitted:{token}"))
+		or get_queue_status(event, token)["admitted"]
+	):
+		return
+
+	frappe.throw(
+		_("You are in the waiting room for this event, please wait for your turn."),
+		frappe.PermissionError,
+	)
+
+
+def get_queue_metrics(event: str) -> dict:
+	rate = _get_rate(event)
+	head, tail = _advance_queue(event, rate)
+	return {
+		"admission_rate": rate,
+		"joined": tail,
+		"admitted": head,
+		"queue_depth": max(tail - head, 0),
+		"estimated_drain_seconds": max(tail - head, 0) // rate,
+	}